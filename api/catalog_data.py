@@ -0,0 +1,310 @@
+"""
+Scraped catalog loading shared by the content stores
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+from api.catalog_snapshot import CatalogSnapshot, SNAPSHOT_FILENAME, CONTENT_LISTS, ALL_LISTS, write_snapshot
+from api.record_store import RecordStore, StoreCatalog, RECORD_STORE_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+JSON_FILENAME = "scraped_content.json"
+
+
+def _data_dirs() -> List[str]:
+    return [
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"),
+        os.path.join(os.path.dirname(__file__), "..", "data"),
+        "/var/task/data",
+        "data",
+    ]
+
+
+def find_data_file(filename: str) -> Optional[str]:
+    """Return the first existing path for a file in the data directory"""
+    for data_dir in _data_dirs():
+        path = os.path.join(data_dir, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class JsonCatalog:
+    """Same interface as CatalogSnapshot over an already-parsed JSON document"""
+
+    def __init__(self, data: Dict[str, Any], path: Optional[str] = None, version: Optional[str] = None):
+        self.path = path
+        self.version = version
+        self.last_updated = data.get("last_updated")
+        self._data = data
+        self._index: Dict[str, Dict[str, Any]] = {}
+        for name in CONTENT_LISTS:
+            for item in data.get(name) or []:
+                if item.get("imdb_id"):
+                    self._index.setdefault(item["imdb_id"], item)
+                self._index[item["id"]] = item
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._index.get(key)
+
+    def count(self, name: str) -> int:
+        return len(self._data.get(name) or [])
+
+    def iter_list(self, name: str) -> Iterator[Dict[str, Any]]:
+        return iter(self._data.get(name) or [])
+
+    def close(self):
+        pass
+
+
+def write_store_snapshot(store: RecordStore, path: str) -> str:
+    """Write a snapshot of the record store, streaming records from their stored lines"""
+    catalog = store.open_catalog()
+    try:
+        data: Dict[str, Any] = {name: catalog.iter_list(name) for name in ALL_LISTS}
+        data["last_updated"] = catalog.last_updated
+        return write_snapshot(data, path, store_seq=catalog.seq)
+    finally:
+        catalog.close()
+
+
+def derive_snapshot(store: RecordStore) -> Optional[str]:
+    """Snapshot of the record store built under the temp directory, for local development
+
+    Deployments ship the snapshot the scraper writes next to the store; this
+    covers a checkout where it is missing or behind the store. Each store
+    version gets one file, shared by all workers, and older ones are removed.
+    """
+    directory = os.path.join(tempfile.gettempdir(), "tamilstream")
+    key = hashlib.sha1(repr(store.file_key()).encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(directory, f"catalog-{key}.snap")
+    if os.path.exists(path):
+        return path
+    try:
+        os.makedirs(directory, exist_ok=True)
+        write_store_snapshot(store, path)
+    except OSError as e:
+        logger.warning(f"Could not derive a catalog snapshot in {directory}: {e}")
+        return None
+    for name in os.listdir(directory):
+        if name.startswith("catalog-") and name.endswith(".snap") and name != os.path.basename(path):
+            # Workers still mapping an old version keep it until they reload
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+    return path
+
+
+def _open_snapshot(path: str, store: Optional[RecordStore]) -> Optional[CatalogSnapshot]:
+    """Map a snapshot, or None if it fails to open or lags behind the record store"""
+    try:
+        catalog = CatalogSnapshot(path)
+    except Exception as e:
+        logger.warning(f"Failed to map snapshot {path}: {e}")
+        return None
+    if store is not None and catalog.store_seq != store.current_seq():
+        logger.warning(f"Snapshot {path} is at store change {catalog.store_seq}, the store at "
+                       f"{store.current_seq()}; rebuild it with python -m api.catalog_snapshot")
+        catalog.close()
+        return None
+    logger.info(f"Mapped catalog snapshot {catalog.version} from {path}")
+    return catalog
+
+
+def load_catalog():
+    """Open the scraped catalog: memory-mapped snapshot, then the record store, then legacy JSON"""
+    store_dir = find_data_file(RECORD_STORE_DIRNAME)
+    store = RecordStore(store_dir) if store_dir else None
+    snapshot_path = find_data_file(SNAPSHOT_FILENAME)
+    catalog = _open_snapshot(snapshot_path, store) if snapshot_path else None
+    if catalog is None and store is not None:
+        derived_path = derive_snapshot(store)
+        catalog = _open_snapshot(derived_path, store) if derived_path else None
+    if catalog is not None:
+        return catalog
+
+    if store_dir:
+        try:
+            catalog = store.open_catalog()
+            logger.info(f"Indexed record store {catalog.version} from {store_dir}")
+            return catalog
+        except Exception as e:
+            logger.warning(f"Failed to load record store {store_dir}: {e}")
+
+    json_path = find_data_file(JSON_FILENAME)
+    if json_path:
+        try:
+            with open(json_path, "rb") as f:
+                raw = f.read()
+            version = hashlib.sha1(raw).hexdigest()[:12]
+            catalog = JsonCatalog(json.loads(raw.decode("utf-8")), json_path, version)
+            logger.info(f"Loaded scraped content from {json_path}")
+            return catalog
+        except Exception as e:
+            logger.debug(f"Failed to load {json_path}: {e}")
+    return None
+
+
+class CatalogState:
+    """A fully loaded catalog plus the file identity it was loaded from"""
+
+    def __init__(self, catalog, file_key: Tuple, load_duration: float):
+        self.catalog = catalog
+        self.file_key = file_key
+        self.load_duration = load_duration
+        self.loaded_at = time.time()
+
+
+_state: Optional[CatalogState] = None
+# Replaced catalog, closed on the next swap once in-flight readers are long done
+_retired: Optional[CatalogState] = None
+_load_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_reload_count = 0
+_watcher: Optional[threading.Thread] = None
+_watcher_stop = threading.Event()
+
+
+def _source_file_key() -> Tuple:
+    """Identity (inode, mtime, size) of the snapshot, record store and JSON files, if present"""
+    key = []
+    for filename in (SNAPSHOT_FILENAME, JSON_FILENAME):
+        path = find_data_file(filename)
+        if path:
+            st = os.stat(path)
+            key.append((filename, st.st_ino, st.st_mtime_ns, st.st_size))
+    store_dir = find_data_file(RECORD_STORE_DIRNAME)
+    if store_dir:
+        key.append((RECORD_STORE_DIRNAME, RecordStore(store_dir).file_key()))
+    return tuple(key)
+
+
+def _load_state() -> CatalogState:
+    file_key = _source_file_key()
+    started = time.perf_counter()
+    catalog = load_catalog()
+    return CatalogState(catalog, file_key, time.perf_counter() - started)
+
+
+def get_catalog():
+    """Active scraped catalog, loaded on first use"""
+    global _state
+    state = _state
+    if state is None:
+        with _load_lock:
+            if _state is None:
+                _state = _load_state()
+            state = _state
+    return state.catalog
+
+
+def check_for_update() -> bool:
+    """Reload the catalog if its source files changed; returns True when swapped"""
+    global _state, _retired, _reload_count
+    state = _state
+    if state is None:
+        get_catalog()
+        return False
+
+    try:
+        if _source_file_key() == state.file_key:
+            return False
+    except OSError as e:
+        logger.debug(f"Catalog stat failed: {e}")
+        return False
+
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    try:
+        new_state = _load_state()
+        if new_state.catalog is None:
+            logger.warning("Catalog reload produced no data, keeping current dataset")
+            return False
+        _state = new_state
+        _reload_count += 1
+        if _retired is not None and _retired.catalog is not None:
+            _close_catalog(_retired.catalog)
+        _retired = state
+        logger.info(
+            f"Reloaded catalog {getattr(new_state.catalog, 'version', None)} "
+            f"in {new_state.load_duration * 1000:.1f}ms"
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Catalog reload failed: {e}")
+        return False
+    finally:
+        _reload_lock.release()
+
+
+def _close_catalog(catalog):
+    try:
+        catalog.close()
+    except Exception as e:
+        logger.warning(f"Failed to close retired catalog {getattr(catalog, 'path', None)}: {e}")
+
+
+def _watch(interval: float):
+    while not _watcher_stop.wait(interval):
+        check_for_update()
+
+
+def start_catalog_watcher(interval: float) -> bool:
+    """Poll the catalog files in a background thread and hot-swap on change"""
+    global _watcher
+    if interval <= 0 or (_watcher and _watcher.is_alive()):
+        return False
+    get_catalog()
+    _watcher_stop.clear()
+    _watcher = threading.Thread(target=_watch, args=(interval,), name="catalog-watcher", daemon=True)
+    _watcher.start()
+    return True
+
+
+def stop_catalog_watcher():
+    global _watcher
+    _watcher_stop.set()
+    if _watcher:
+        _watcher.join(timeout=5)
+    _watcher = None
+
+
+def get_catalog_status() -> Dict[str, Any]:
+    """Active dataset version and load timings"""
+    state = _state
+    if state is None or state.catalog is None:
+        return {"loaded": False, "reloads": _reload_count}
+    catalog = state.catalog
+    return {
+        "loaded": True,
+        "version": catalog.version,
+        "format": "snapshot" if isinstance(catalog, CatalogSnapshot) else
+                  "record_store" if isinstance(catalog, StoreCatalog) else "json",
+        "path": catalog.path,
+        "last_updated": catalog.last_updated,
+        "loaded_at": state.loaded_at,
+        "load_duration_ms": round(state.load_duration * 1000, 2),
+        "reloads": _reload_count
+    }
+
+
+def has_content(catalog) -> bool:
+    """Whether a loaded catalog holds any movies or series"""
+    return bool(catalog and any(catalog.count(name) for name in CONTENT_LISTS))
+
+
+def iter_content(catalog, content_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Iterate catalog movies and series, optionally filtered by type"""
+    for name in CONTENT_LISTS:
+        for item in catalog.iter_list(name):
+            if not content_type or item.get("type") == content_type:
+                yield item
@@ -0,0 +1,193 @@
+"""
+Compact read-only catalog snapshot, memory-mapped and shared across workers
+
+Layout (little endian):
+    magic (8 bytes) | header length (uint32) | header JSON, space padded
+    records section: compact UTF-8 JSON records, back to back
+    index section:   sorted (key hash uint64, offset uint64, length uint32) entries
+    list sections:   (offset uint64, length uint32) entries, one section per list
+
+Content records are indexed by both `id` and `imdb_id`, so a lookup is a
+binary search over the mapped index plus a single record decode.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import logging
+from typing import Optional, List, Dict, Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TSNAP001"
+SNAPSHOT_FILENAME = "scraped_content.snap"
+CONTENT_LISTS = ("movies", "series")
+ALL_LISTS = ("movies", "series", "episodes")
+
+_HEADER_LEN = struct.Struct("<I")
+_INDEX_ENTRY = struct.Struct("<QQI")
+_LIST_ENTRY = struct.Struct("<QI")
+# Header JSON is padded to this size so it can be written after the records
+_HEADER_RESERVE = 1024
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def write_snapshot(data: Dict[str, Any], path: str, store_seq: Optional[int] = None) -> str:
+    """Write scraped catalog data as a snapshot file, atomically replacing `path`
+
+    store_seq records the record store change the data was read at, so a
+    snapshot shipped next to the store can be checked against it.
+
+    Records are encoded straight into the file; only their offsets are kept
+    in memory. The header goes into a reserved, space-padded slot ahead of
+    the records once the sections and version are known.
+    """
+    lists: Dict[str, List[tuple]] = {}
+    index: List[tuple] = []
+    digest = hashlib.sha1()
+    records_len = 0
+
+    # Unique per process: workers may derive the same snapshot at once
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(_HEADER_RESERVE))
+            f.write(b" " * _HEADER_RESERVE)
+
+            for name in ALL_LISTS:
+                entries = []
+                for item in data.get(name) or []:
+                    encoded = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                    entry = (records_len, len(encoded))
+                    f.write(encoded)
+                    digest.update(encoded)
+                    records_len += len(encoded)
+                    entries.append(entry)
+
+                    if name in CONTENT_LISTS:
+                        keys = {item.get("id"), item.get("imdb_id")}
+                        for key in keys:
+                            if key:
+                                index.append((_key_hash(key),) + entry)
+                lists[name] = entries
+
+            index.sort()
+            version = digest.hexdigest()[:12]
+
+            sections = {"records": [0, records_len], "index": [records_len, len(index)], "lists": {}}
+            f.write(b"".join(_INDEX_ENTRY.pack(*entry) for entry in index))
+            offset = records_len + len(index) * _INDEX_ENTRY.size
+            for name, entries in lists.items():
+                sections["lists"][name] = [offset, len(entries)]
+                f.write(b"".join(_LIST_ENTRY.pack(*entry) for entry in entries))
+                offset += len(entries) * _LIST_ENTRY.size
+
+            header = json.dumps({
+                "version": version,
+                "last_updated": data.get("last_updated"),
+                "store_seq": store_seq,
+                "sections": sections
+            }, separators=(",", ":")).encode("utf-8")
+            if len(header) > _HEADER_RESERVE:
+                raise ValueError(f"Snapshot header is {len(header)} bytes, over the {_HEADER_RESERVE} reserved")
+            f.seek(len(MAGIC) + _HEADER_LEN.size)
+            f.write(header)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"Wrote catalog snapshot {version} to {path}")
+    return version
+
+
+class CatalogSnapshot:
+    """Read-only view over a memory-mapped snapshot file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a catalog snapshot: {path}")
+
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(self._mm[header_start:header_start + header_len])
+
+        self._base = header_start + header_len
+        self.version = header.get("version")
+        self.last_updated = header.get("last_updated")
+        self.store_seq = header.get("store_seq")
+        self._index_offset, self._index_count = header["sections"]["index"]
+        self._lists = header["sections"]["lists"]
+
+    def _read_record(self, offset: int, length: int) -> Dict[str, Any]:
+        start = self._base + offset
+        return json.loads(self._mm[start:start + length])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a content record by id or imdb_id"""
+        target = _key_hash(key)
+        lo, hi = 0, self._index_count
+        index_start = self._base + self._index_offset
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _INDEX_ENTRY.unpack_from(self._mm, index_start + mid * _INDEX_ENTRY.size)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        while lo < self._index_count:
+            key_hash, offset, length = _INDEX_ENTRY.unpack_from(self._mm, index_start + lo * _INDEX_ENTRY.size)
+            if key_hash != target:
+                break
+            record = self._read_record(offset, length)
+            if record.get("id") == key or record.get("imdb_id") == key:
+                return record
+            lo += 1
+        return None
+
+    def count(self, name: str) -> int:
+        section = self._lists.get(name)
+        return section[1] if section else 0
+
+    def iter_list(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Decode the records of one list (movies, series or episodes) in order"""
+        section = self._lists.get(name)
+        if not section:
+            return
+        start, count = section
+        for i in range(count):
+            offset, length = _LIST_ENTRY.unpack_from(self._mm, self._base + start + i * _LIST_ENTRY.size)
+            yield self._read_record(offset, length)
+
+    def close(self):
+        self._mm.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    from api.catalog_data import write_store_snapshot
+    from api.record_store import RecordStore, RECORD_STORE_DIRNAME
+
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", RECORD_STORE_DIRNAME)
+    if os.path.isdir(source):
+        target = os.path.join(os.path.dirname(os.path.abspath(source)), SNAPSHOT_FILENAME)
+        write_store_snapshot(RecordStore(source), target)
+    else:
+        target = os.path.join(os.path.dirname(source), SNAPSHOT_FILENAME)
+        with open(source, "r", encoding="utf-8") as f:
+            write_snapshot(json.load(f), target)
@@ -16,9 +16,52 @@ class Settings(BaseSettings):
     secret_key: str = os.getenv("SESSION_SECRET", "tamilstream-secret-key")
     
     scraper_interval_hours: int = 6
+    torrent_sources: str = ""
+    ingest_batch_size: int = 100
+    ingest_queue_size: int = 500
+    title_index_path: str = ""
+    
+    crawl_concurrency: int = 8
+    crawl_per_host_concurrency: int = 4
+    crawl_retries: int = 3
+    crawl_backoff: float = 0.5
+    crawl_timeout: float = 15.0
+    crawl_incremental_pages: int = 5
+    crawl_backfill_pages: int = 0
+    html_parser: str = "auto"
+    parse_workers: int = 0
+    
+    http_cache_dir: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http")
+    swr_cache_dir: str = ""
     
     cache_ttl: int = 3600
     
+    catalog_reload_interval: float = 60.0
+    record_store_compact_every: int = 20
+    
+    storage_backend: str = "auto"
+    sqlite_catalog_path: str = ""
+    
+    db_pool_size: int = 5
+    db_warm_connections: int = 2
+    db_init_retry: float = 30.0
+    
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    http_warmup_timeout: float = 3.0
+    
+    upstream_rate: float = 20.0
+    upstream_burst: int = 10
+    upstream_rate_limits: str = ""
+    upstream_failure_threshold: int = 5
+    upstream_reset_timeout: float = 30.0
+    upstream_max_wait: float = 2.0
+    
+    prefetch_per_user: int = 2
+    prefetch_ttl: float = 300.0
+    prefetch_resolve_links: bool = False
+    stream_skeleton_ttl: float = 600.0
+    
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -0,0 +1,77 @@
+"""
+Per-listing crawl checkpoints for incremental and backfill scrapes
+
+Incremental runs remember the newest posts of every listing and stop paging
+as soon as they reach one of them again. Backfill runs walk a listing's
+pages oldest-ward and record the next page to fetch, so an interrupted or
+page-limited backfill resumes where the previous run stopped.
+"""
+
+import json
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = "crawl_checkpoints.json"
+RECENT_URLS_KEPT = 30
+
+
+class CrawlCheckpoints:
+    def __init__(self, path: Optional[str] = None, listings: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.listings: Dict[str, Dict[str, Any]] = listings or {}
+
+    @classmethod
+    def load(cls, path: str) -> "CrawlCheckpoints":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                listings = json.load(f).get("listings", {})
+            # Older files carried a per-run timestamp that made every save a change
+            for state in listings.values():
+                state.pop("updated_at", None)
+            return cls(path, listings)
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable crawl checkpoints {path}: {e}")
+            return cls(path)
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"listings": self.listings}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def get(self, listing: str) -> Dict[str, Any]:
+        return self.listings.setdefault(listing, {})
+
+    def known_urls(self, listing: str) -> set:
+        return set(self.listings.get(listing, {}).get("recent_urls", []))
+
+    def record_newest(self, listing: str, urls: List[str], last_seen_date: Optional[str] = None):
+        """Remember the newest posts of a listing after reading its first page"""
+        if not urls:
+            return
+        state = self.get(listing)
+        previous = [u for u in state.get("recent_urls", []) if u not in urls]
+        state["recent_urls"] = (urls + previous)[:RECENT_URLS_KEPT]
+        state["last_seen_url"] = urls[0]
+        if last_seen_date:
+            state["last_seen_date"] = last_seen_date
+
+    def backfill_page(self, listing: str) -> Optional[int]:
+        """Next page a backfill should fetch, or None once the listing is exhausted"""
+        state = self.get(listing)
+        if state.get("backfill_complete"):
+            return None
+        return state.get("backfill_next_page", 1)
+
+    def record_backfill(self, listing: str, page: int, has_next: bool):
+        state = self.get(listing)
+        state["backfill_next_page"] = page + 1
+        state["backfill_complete"] = not has_next
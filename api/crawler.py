@@ -0,0 +1,183 @@
+"""
+Concurrent async crawler with a pooled HTTP client, per-host limits and retries
+"""
+
+import asyncio
+import random
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from api.config import settings
+from api.http_cache import HttpCache
+from api.upstream_guard import upstream_guard, UpstreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CrawlTask:
+    """A URL in the crawl frontier and the coroutine that handles its HTML"""
+
+    def __init__(self, url: str, handler: Callable[["CrawlTask", str], Awaitable[Optional[List["CrawlTask"]]]],
+                 data: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.handler = handler
+        self.data = data or {}
+        self.changed = True
+
+
+class CrawlStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.pages_fetched = 0
+        self.pages_unchanged = 0
+        self.bytes_fetched = 0
+        self.retries = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pages_fetched": self.pages_fetched,
+            "pages_unchanged": self.pages_unchanged,
+            "bytes_fetched": self.bytes_fetched,
+            "retries": self.retries,
+            "errors": self.errors,
+            "duration_s": round(time.perf_counter() - self.started, 3)
+        }
+
+
+class Crawler:
+    """Fetch pages concurrently under a global and a per-host concurrency limit"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None,
+                 concurrency: Optional[int] = None, per_host: Optional[int] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None,
+                 timeout: Optional[float] = None, cache: Optional[HttpCache] = None):
+        self.headers = headers or {}
+        self.cache = cache
+        self.concurrency = concurrency or settings.crawl_concurrency
+        self.per_host = per_host or settings.crawl_per_host_concurrency
+        self.retries = settings.crawl_retries if retries is None else retries
+        self.backoff = settings.crawl_backoff if backoff is None else backoff
+        self.timeout = timeout or settings.crawl_timeout
+        self.stats = CrawlStats()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_limit = asyncio.Semaphore(self.concurrency)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "Crawler":
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._client:
+            await self._client.aclose()
+        self._client = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """Fetch a page and return its HTML"""
+        result = await self.fetch_conditional(url)
+        return result[0] if result else None
+
+    async def fetch_conditional(self, url: str) -> Optional[Tuple[str, bool]]:
+        """Fetch a page as (html, changed), retrying transient failures with jittered backoff"""
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                # Crawls queue for the host's rate limit instead of giving up
+                async with upstream_guard(url).attempt(max_wait=float("inf")) as guarded:
+                    async with self._global_limit, self._host_limit(url):
+                        response = await self._client.get(url, headers=headers)
+                    if response.status_code in RETRY_STATUS_CODES:
+                        guarded.fail(f"HTTP {response.status_code}")
+                if response.status_code == 304 and self.cache:
+                    html = self.cache.load_body(url)
+                    if html is not None:
+                        self.stats.pages_fetched += 1
+                        self.stats.pages_unchanged += 1
+                        return html, False
+                    headers = {}
+                    continue
+                if response.status_code == 200:
+                    self.stats.pages_fetched += 1
+                    self.stats.bytes_fetched += len(response.content)
+                    changed = self.cache.store(url, response.headers, response.content) if self.cache else True
+                    if not changed:
+                        self.stats.pages_unchanged += 1
+                    return response.text, changed
+                if response.status_code not in RETRY_STATUS_CODES:
+                    logger.warning(f"Failed to fetch {url}: {response.status_code}")
+                    break
+                retry_after = response.headers.get("retry-after")
+                logger.debug(f"Retryable status {response.status_code} for {url}")
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                logger.debug(f"Transient error fetching {url}: {e}")
+            except UpstreamUnavailable as e:
+                self.stats.errors += 1
+                logger.warning(f"Skipping {url}: {e}")
+                return None
+
+            if attempt < self.retries:
+                self.stats.retries += 1
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+        self.stats.errors += 1
+        logger.error(f"Failed to fetch {url} after {self.retries + 1} attempts")
+        return None
+
+    async def crawl(self, seeds: Iterable[CrawlTask]) -> CrawlStats:
+        """Drain a frontier of tasks; handlers may return follow-up tasks to enqueue"""
+        frontier: asyncio.Queue = asyncio.Queue()
+        seen = set()
+
+        def enqueue(tasks: Optional[Iterable[CrawlTask]]):
+            for task in tasks or []:
+                if task.url not in seen:
+                    seen.add(task.url)
+                    frontier.put_nowait(task)
+
+        async def worker():
+            while True:
+                task = await frontier.get()
+                try:
+                    result = await self.fetch_conditional(task.url)
+                    if result is not None:
+                        html, task.changed = result
+                        enqueue(await task.handler(task, html))
+                except Exception as e:
+                    self.stats.errors += 1
+                    logger.error(f"Crawl handler failed for {task.url}: {e}")
+                finally:
+                    frontier.task_done()
+
+        enqueue(seeds)
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await frontier.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.stats
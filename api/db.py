@@ -3,6 +3,7 @@ Database models and connection for TamilStream addon
 """
 
 import os
+import time
 from datetime import datetime
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
@@ -14,9 +15,12 @@ Content = None
 Torrent = None
 Episode = None
 _sqlalchemy_available = False
+_init_result = None
+_init_failures = 0
+_init_retry_at = 0.0
 
 try:
-    from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text, JSON
+    from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text, JSON, Index
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import sessionmaker
     
@@ -25,6 +29,9 @@ try:
     
     class _Content(Base):
         __tablename__ = "content"
+        __table_args__ = (
+            Index("ix_content_type_updated_at", "type", "updated_at"),
+        )
         
         id = Column(String, primary_key=True)
         imdb_id = Column(String, index=True, nullable=True)
@@ -45,6 +52,9 @@ try:
 
     class _Torrent(Base):
         __tablename__ = "torrents"
+        __table_args__ = (
+            Index("ix_torrents_content_id_quality", "content_id", "quality"),
+        )
         
         id = Column(String, primary_key=True)
         content_id = Column(String, index=True, nullable=False)
@@ -57,10 +67,14 @@ try:
         leechers = Column(Integer, default=0)
         source = Column(String, nullable=True)
         magnet = Column(Text, nullable=True)
+        files = Column(JSON, nullable=True)
         created_at = Column(DateTime, default=datetime.utcnow)
 
     class _Episode(Base):
         __tablename__ = "episodes"
+        __table_args__ = (
+            Index("ix_episodes_content_id_episode_date", "content_id", "episode_date"),
+        )
         
         id = Column(String, primary_key=True)
         content_id = Column(String, index=True, nullable=False)
@@ -81,26 +95,82 @@ except ImportError:
     _sqlalchemy_available = False
 
 
+def database_configured() -> bool:
+    """Whether a database can be used at all (SQLAlchemy installed and DATABASE_URL set)"""
+    return bool(_sqlalchemy_available and DATABASE_URL)
+
+
 def init_db():
-    """Initialize database connection and create tables"""
-    global engine, SessionLocal
+    """Initialize database connection and create tables (runs once per process)
+
+    A failed attempt is retried on a later call once a backoff has passed,
+    starting at settings.db_init_retry seconds and doubling up to 10 minutes,
+    so a database that was down at startup is picked up when it returns.
+    """
+    global engine, SessionLocal, _init_result, _init_failures, _init_retry_at
+    
+    if _init_result or (_init_result is False and time.monotonic() < _init_retry_at):
+        return _init_result
     
     if not _sqlalchemy_available or not DATABASE_URL:
+        _init_result = False
+        _init_retry_at = float("inf")
         return False
     
+    from api.config import settings
     try:
         from sqlalchemy import create_engine
         from sqlalchemy.orm import sessionmaker
         
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(
+            DATABASE_URL,
+            pool_size=settings.db_pool_size,
+            pool_pre_ping=True
+        )
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         Base.metadata.create_all(bind=engine)
+        
+        from api.migrations import run_migrations
+        applied = run_migrations(engine)
+        if applied:
+            print(f"Applied {applied} database migrations")
+        _init_result = True
+        _init_failures = 0
         return True
     except Exception as e:
-        print(f"Database initialization error: {e}")
+        if engine is not None:
+            engine.dispose()
+        engine = None
+        SessionLocal = None
+        _init_result = False
+        delay = min(settings.db_init_retry * 2 ** _init_failures, 600.0)
+        _init_failures += 1
+        _init_retry_at = time.monotonic() + delay
+        print(f"Database initialization error: {e} (retrying in {delay:.0f}s)")
         return False
 
 
+def warm_pool(connections: int) -> int:
+    """Open pooled connections ahead of time so the first requests skip the connect"""
+    if engine is None:
+        return 0
+    
+    from sqlalchemy import text
+    
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    except Exception as e:
+        print(f"Database pool warmup error: {e}")
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
 def get_db():
     """Get database session"""
     if not _sqlalchemy_available:
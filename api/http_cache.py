@@ -0,0 +1,133 @@
+"""
+Disk-backed conditional-GET cache for scraped pages
+
+Each URL keeps its ETag / Last-Modified validators, a hash of the body, the
+zlib-compressed body itself and any records already parsed from it. A 304,
+or a 200 whose body hashes the same as before, counts as unchanged, and
+callers can reuse the stored parse result instead of parsing again.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.enabled = True
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"HTTP cache disabled, cannot create {directory}: {e}")
+            self.enabled = False
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.body.z"
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_meta(self, url: str, meta: Dict[str, Any]):
+        meta_path, _ = self._paths(url)
+        self._write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached URL"""
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8", errors="ignore")
+        except (OSError, zlib.error):
+            return None
+
+    def store(self, url: str, headers, body: bytes) -> bool:
+        """Record a 200 response; returns False when the body is unchanged"""
+        if not self.enabled:
+            return True
+        body_hash = hashlib.sha256(body).hexdigest()
+        meta = self._load_meta(url) or {}
+        changed = meta.get("hash") != body_hash
+
+        try:
+            if changed:
+                _, body_path = self._paths(url)
+                self._write(body_path, zlib.compress(body, 6))
+                meta["parsed"] = {}
+            meta.update({
+                "url": url,
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+                "hash": body_hash,
+                "stored_at": time.time()
+            })
+            self._save_meta(url, meta)
+        except OSError as e:
+            logger.debug(f"HTTP cache write failed for {url}: {e}")
+        return changed
+
+    def get_parsed(self, url: str, kind: str) -> Optional[Any]:
+        meta = self._load_meta(url)
+        return (meta or {}).get("parsed", {}).get(kind)
+
+    def put_parsed(self, url: str, kind: str, value: Any):
+        if not self.enabled:
+            return
+        meta = self._load_meta(url)
+        if not meta:
+            return
+        meta.setdefault("parsed", {})[kind] = value
+        try:
+            self._save_meta(url, meta)
+        except OSError as e:
+            logger.debug(f"HTTP cache write failed for {url}: {e}")
+
+
+_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide scraper HTTP cache, or None when disabled"""
+    global _cache
+    if not settings.http_cache_dir:
+        return None
+    if _cache is None:
+        _cache = HttpCache(settings.http_cache_dir)
+    return _cache if _cache.enabled else None
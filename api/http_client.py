@@ -0,0 +1,57 @@
+"""
+Shared outbound HTTP client for TamilStream addon
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+            ),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def warmup_http_client(urls: Optional[list] = None) -> int:
+    """Open keep-alive connections to upstream hosts ahead of the first request"""
+    client = get_http_client()
+    urls = urls if urls is not None else [settings.torbox_api_url]
+
+    async def _touch(url: str) -> bool:
+        try:
+            await client.head(url, timeout=settings.http_warmup_timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"HTTP warmup failed for {url}: {e}")
+            return False
+
+    results = await asyncio.gather(*[_touch(url) for url in urls])
+    warmed = sum(1 for ok in results if ok)
+    logger.info(f"Warmed {warmed}/{len(urls)} upstream connections")
+    return warmed
+
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,131 @@
+"""
+In-process background jobs with progress reporting
+
+Long-running work such as a full catalog scrape runs as an asyncio task
+instead of inside the request handler. Jobs are keyed by kind: submitting a
+kind that is already queued or running returns the existing job, so
+concurrent triggers are deduplicated. Finished jobs are kept for a while so
+clients can poll their final state.
+"""
+
+import asyncio
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict[str, Any] = {}
+        self.progress_source: Optional[Callable[[], Dict[str, Any]]] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return round((self.finished_at or time.time()) - self.started_at, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        progress = dict(self.progress)
+        if self.progress_source:
+            progress.update(self.progress_source())
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": self.duration,
+            "progress": progress,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobManager:
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+
+    def submit(self, kind: str, func: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]) -> Tuple[Job, bool]:
+        """Start func(job) in the background; returns (job, created)"""
+        existing = self._active.get(kind)
+        if existing and existing.active:
+            return existing, False
+
+        job = Job(kind)
+        self._jobs[job.id] = job
+        self._active[kind] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, func))
+        self._prune()
+        return job, True
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = await func(job)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job.kind} {job.id} failed")
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            if job.progress_source:
+                job.progress.update(job.progress_source())
+                job.progress_source = None
+            job.finished_at = time.time()
+            if self._active.get(job.kind) is job:
+                del self._active[job.kind]
+            logger.info(f"Job {job.kind} {job.id} {job.status} in {job.duration}s")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self):
+        return list(self._jobs.values())
+
+    async def shutdown(self):
+        """Cancel jobs still running when the app stops"""
+        tasks = [job.task for job in self._active.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+jobs = JobManager()
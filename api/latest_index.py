@@ -0,0 +1,170 @@
+"""
+Date-ordered index of TV shows by their latest episode
+
+Backs the "Latest Tamil TV Episodes" catalog. Shows are kept in lists sorted
+newest-episode first: one list for all channels and one per channel. A
+catalog page is then a slice, and needs no scan or sort per request.
+
+The index follows the data incrementally. Writes through the content
+store (add_episode, upsert_batch, ...) re-place only the touched shows. A
+new catalog version (a scrape landing and being hot-swapped in) rescans
+the series once, but only moves the shows whose latest episode changed.
+
+Pages are addressed by cursor, "<date>|<show id>" of the last show served,
+so a show moving to the top between two requests neither repeats nor
+skips the ones after the cursor. Stremio catalogs page by skip offset,
+which is served from the same lists.
+"""
+
+import bisect
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.content_store import (
+    get_all_content, get_content_by_id, get_episodes_for_content, data_version, touched_since
+)
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+SortKey = Tuple[int, str]
+
+
+def latest_episode(content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Newest episode of a show; episode lists are ordered oldest first"""
+    episodes = content.get("episodes")
+    if episodes is None and not content.get("latest_episode_date"):
+        episodes = get_episodes_for_content(content["id"])
+    if episodes:
+        return max(episodes, key=lambda e: e.get("episode_date") or "")
+    if content.get("latest_episode_date"):
+        return {"episode_date": content["latest_episode_date"]}
+    return None
+
+
+def _sort_key(episode_date: str, show_id: str) -> Optional[SortKey]:
+    try:
+        return -date.fromisoformat(episode_date).toordinal(), show_id
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[SortKey]:
+    if not cursor:
+        return None
+    episode_date, _, show_id = cursor.partition("|")
+    return _sort_key(episode_date, show_id)
+
+
+def _build_meta(content: Dict[str, Any], episode: Dict[str, Any]) -> Dict[str, Any]:
+    poster = content.get("poster")
+    meta = {
+        "id": content.get("imdb_id") or content.get("id"),
+        "type": "series",
+        "name": content.get("title"),
+        "poster": poster,
+        "background": content.get("background") or poster,
+        "description": content.get("description", ""),
+        "releaseInfo": episode["episode_date"],
+        "genres": content.get("genres", [])
+    }
+    if episode.get("title"):
+        meta["description"] = f"Latest: {episode['title']}\n{meta['description']}".strip()
+    return meta
+
+
+class LatestIndex:
+    def __init__(self):
+        self.version: Any = _UNSET
+        self.touch_count = 0
+        self._keys: Dict[str, Tuple[SortKey, Optional[str]]] = {}
+        self._lists: Dict[Optional[str], List[SortKey]] = {None: []}
+        self._metas: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"rescans": 0, "updates": 0, "moves": 0}
+
+    def _remove(self, show_id: str):
+        entry = self._keys.pop(show_id, None)
+        self._metas.pop(show_id, None)
+        if entry is None:
+            return
+        key, channel = entry
+        for name in (None, channel) if channel else (None,):
+            keys = self._lists[name]
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+            if name is not None and not keys:
+                del self._lists[name]
+
+    def observe(self, content: Optional[Dict[str, Any]], show_id: Optional[str] = None):
+        """Place a show by its latest episode, or drop it if it has none"""
+        show_id = content["id"] if content else show_id
+        if not content or content.get("type") != "series":
+            self._remove(show_id)
+            return
+        episode = latest_episode(content)
+        key = _sort_key(episode["episode_date"], show_id) if episode else None
+        if key is None:
+            self._remove(show_id)
+            return
+
+        channel = content.get("channel")
+        if self._keys.get(show_id) != (key, channel):
+            self._remove(show_id)
+            self._keys[show_id] = (key, channel)
+            for name in (None, channel) if channel else (None,):
+                bisect.insort(self._lists.setdefault(name, []), key)
+            self.stats["moves"] += 1
+        self._metas[show_id] = _build_meta(content, episode)
+
+    def sync(self):
+        """Bring the index up to date with the content store"""
+        version = data_version()
+        touch_count, touched = touched_since(self.touch_count)
+        if version != self.version or touched is None:
+            seen = set()
+            for content in get_all_content("series"):
+                seen.add(content["id"])
+                self.observe(content)
+            for show_id in [s for s in self._keys if s not in seen]:
+                self._remove(show_id)
+            self.version = version
+            self.stats["rescans"] += 1
+        elif touched:
+            for show_id in set(touched):
+                self.observe(get_content_by_id(show_id), show_id)
+            self.stats["updates"] += 1
+        self.touch_count = touch_count
+
+    def channels(self) -> List[str]:
+        self.sync()
+        return sorted(name for name in self._lists if name is not None)
+
+    def page(self, channel: Optional[str] = None, skip: int = 0, cursor: Optional[str] = None,
+             limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """(metas, next cursor) for shows after cursor, or from offset skip"""
+        self.sync()
+        keys = self._lists.get(channel or None, [])
+        start = skip
+        after = parse_cursor(cursor)
+        if after is not None:
+            start = bisect.bisect_right(keys, after)
+        window = keys[start:start + limit]
+        metas = [self._metas[show_id] for _, show_id in window]
+        next_cursor = None
+        if window and start + limit < len(keys):
+            last = window[-1]
+            next_cursor = f"{date.fromordinal(-last[0]).isoformat()}|{last[1]}"
+        return metas, next_cursor
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "shows": len(self._keys),
+            "channels": {name: len(keys) for name, keys in self._lists.items() if name is not None},
+            **self.stats
+        }
+
+
+latest_index = LatestIndex()
@@ -1,9 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 import os
 import base64
 import json
+import logging
+from typing import Optional
 
 try:
     from fastapi.templating import Jinja2Templates
@@ -18,31 +22,86 @@ try:
 except Exception as e:
     stremio_router = None
     _stremio_routes_available = False
-    import logging
     logging.error(f"Failed to import stremio_routes: {e}")
 
 try:
     from api.tamildhool_scraper import (
-        scrape_latest_episodes, scrape_show_list, scrape_all_shows,
-        convert_to_stremio_format, CHANNELS
+        scrape_latest_episodes, scrape_show_list, scrape_all_shows_async,
+        convert_to_stremio_format, CHANNELS, HEADERS
     )
-    from api.content_store import add_content
+    from api.crawler import Crawler
+    from api.http_cache import get_http_cache
+    from api.content_store import add_content, add_episode
     _scraper_available = True
 except Exception:
     _scraper_available = False
     CHANNELS = {}
     scrape_latest_episodes = lambda x: []
     scrape_show_list = lambda x, y: []
-    scrape_all_shows = lambda: []
     convert_to_stremio_format = lambda x: []
     add_content = lambda x: False
+    add_episode = lambda x: False
+    
+    async def scrape_all_shows_async(crawler=None):
+        return []
+
+from api.content_store import warmup as warmup_content_store
+from api.storage_backends import get_backend
+
+from api.http_client import warmup_http_client, close_http_client
+from api.catalog_data import start_catalog_watcher, stop_catalog_watcher, get_catalog_status
+from api.jobs import jobs, Job
+from api.upstream_guard import upstream_status
+from api.single_flight import single_flight_status
+from api.swr_cache import cache_status, close_caches
+from api.prefetch import prefetcher
+from api.latest_index import latest_index
+
+logger = logging.getLogger(__name__)
+
+
+def start_ingest_scheduler():
+    """Start periodic torrent ingestion when APScheduler is installed and the backend accepts writes"""
+    if settings.scraper_interval_hours <= 0 or not get_backend().writable:
+        return None
+    try:
+        from api.scraper import setup_scheduler
+        scheduler = setup_scheduler()
+    except ImportError as e:
+        logger.info(f"Torrent ingestion scheduler disabled: {e}")
+        return None
+    scheduler.start()
+    logger.info(f"Torrent ingestion scheduled every {settings.scraper_interval_hours}h")
+    return scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run one-time initialization before serving the first request"""
+    try:
+        await run_in_threadpool(warmup_content_store)
+    except Exception as e:
+        logger.error(f"Content store warmup failed: {e}")
+    await warmup_http_client()
+    start_catalog_watcher(settings.catalog_reload_interval)
+    scheduler = start_ingest_scheduler()
+    yield
+    if scheduler:
+        scheduler.shutdown(wait=False)
+    await jobs.shutdown()
+    await prefetcher.shutdown()
+    await close_caches()
+    stop_catalog_watcher()
+    await close_http_client()
+
 
 app = FastAPI(
     title=settings.app_name,
     description=settings.app_description,
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -135,10 +194,49 @@ async def health_check():
     return {"status": "healthy", "version": settings.app_version}
 
 
+@app.get("/api/catalog/status")
+async def catalog_status():
+    """Active storage backend, scraped dataset version and load timings"""
+    status = get_catalog_status()
+    status["backend"] = get_backend().name
+    return status
+
+
+@app.get("/api/upstreams")
+async def upstreams():
+    """Rate limit and circuit breaker state of each upstream host"""
+    return upstream_status()
+
+
+@app.get("/api/coalescing")
+async def coalescing():
+    """Request, join and error counts of the coalesced /meta and /stream handlers"""
+    return single_flight_status()
+
+
+@app.get("/api/caches")
+async def caches():
+    """Entry counts and hit, stale-hit and refresh counters of the upstream caches"""
+    return cache_status()
+
+
+@app.get("/api/latest")
+async def latest(channel: Optional[str] = None, cursor: Optional[str] = None, limit: int = 50):
+    """Shows ordered by their newest episode; pass next_cursor back as cursor for the next page"""
+    metas, next_cursor = latest_index.page(channel=channel, cursor=cursor, limit=max(1, min(limit, 200)))
+    return {"metas": metas, "next_cursor": next_cursor}
+
+
+@app.get("/api/prefetch")
+async def prefetch():
+    """Scheduled, used and cancelled counts of next-episode prefetches"""
+    return prefetcher.as_dict()
+
+
 @app.get("/api/scrape/latest")
 async def scrape_latest():
     """Scrape latest episodes from TamilDhool"""
-    episodes = scrape_latest_episodes(20)
+    episodes = await run_in_threadpool(scrape_latest_episodes, 20)
     return {"count": len(episodes), "episodes": episodes}
 
 
@@ -148,8 +246,8 @@ async def scrape_channel(channel: str):
     if channel not in CHANNELS:
         return {"error": f"Unknown channel. Available: {list(CHANNELS.keys())}"}
     
-    serials = scrape_show_list(channel, "serials")
-    shows = scrape_show_list(channel, "shows")
+    serials = await run_in_threadpool(scrape_show_list, channel, "serials")
+    shows = await run_in_threadpool(scrape_show_list, channel, "shows")
     
     return {
         "channel": CHANNELS[channel]["name"],
@@ -160,24 +258,114 @@ async def scrape_channel(channel: str):
     }
 
 
-@app.post("/api/scrape/update")
-async def scrape_and_update():
-    """Scrape all shows and update the content catalog"""
-    all_shows = scrape_all_shows()
+SCRAPE_UPSERT_BATCH = 20
+
+
+def _crawl_progress(crawler) -> dict:
+    stats = crawler.stats.as_dict()
+    stats["crawl_duration_s"] = stats.pop("duration_s")
+    return stats
+
+
+def _upsert_series_batch(batch):
+    added = episodes = errors = 0
+    for content in batch:
+        if not add_content(content):
+            errors += 1
+            continue
+        added += 1
+        for episode in content.get("episodes", []):
+            if add_episode(episode):
+                episodes += 1
+            else:
+                errors += 1
+    return added, episodes, errors
+
+
+async def _scrape_update_job(job: Job):
+    """Crawl every channel, then upsert the aggregated series in batches off the event loop"""
+    job.progress.update({"stage": "crawling", "items_upserted": 0, "episodes_upserted": 0, "upsert_errors": 0})
+    async with Crawler(headers=HEADERS, cache=get_http_cache()) as crawler:
+        job.progress_source = lambda: _crawl_progress(crawler)
+        all_shows = await scrape_all_shows_async(crawler=crawler)
+        job.progress.update(_crawl_progress(crawler))
+        job.progress_source = None
+    
     stremio_content = convert_to_stremio_format(all_shows)
+    job.progress.update({"stage": "upserting", "items_total": len(stremio_content)})
     
-    added_count = 0
-    for content in stremio_content:
-        if add_content(content):
-            added_count += 1
+    for start in range(0, len(stremio_content), SCRAPE_UPSERT_BATCH):
+        batch = stremio_content[start:start + SCRAPE_UPSERT_BATCH]
+        added, episodes, errors = await run_in_threadpool(_upsert_series_batch, batch)
+        job.progress["items_upserted"] += added
+        job.progress["episodes_upserted"] += episodes
+        job.progress["upsert_errors"] += errors
     
+    job.progress["stage"] = "done"
     return {
         "scraped": len(all_shows),
-        "added": added_count,
+        "added": job.progress["items_upserted"],
+        "episodes": job.progress["episodes_upserted"],
         "message": "Content catalog updated with TamilDhool shows"
     }
 
 
+@app.post("/api/scrape/update", status_code=202)
+async def scrape_and_update():
+    """Start a background scrape that updates the content catalog; returns its job"""
+    if not _scraper_available:
+        return JSONResponse({"error": "Scraper not available"}, status_code=503)
+    
+    job, created = jobs.submit("scrape_update", _scrape_update_job)
+    response = job.as_dict()
+    response["deduplicated"] = not created
+    response["status_url"] = f"/api/scrape/jobs/{job.id}"
+    return response
+
+
+@app.get("/api/scrape/jobs")
+async def list_scrape_jobs():
+    """Recent scrape jobs, newest first"""
+    return {"jobs": [job.as_dict() for job in reversed(jobs.list())]}
+
+
+@app.get("/api/scrape/jobs/{job_id}")
+async def get_scrape_job(job_id: str):
+    """Progress of a scrape job: pages fetched, items upserted, errors and duration"""
+    job = jobs.get(job_id)
+    if not job:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return job.as_dict()
+
+
+@app.post("/api/ingest/run", status_code=202)
+async def run_ingest():
+    """Start a torrent ingestion run now; returns its job"""
+    try:
+        from api.scraper import ingest_job
+    except ImportError as e:
+        return JSONResponse({"error": f"Ingestion not available: {e}"}, status_code=503)
+    backend = get_backend()
+    if not backend.writable:
+        return JSONResponse({"error": f"Storage backend {backend.name} is read-only"}, status_code=503)
+    
+    job, created = jobs.submit("torrent_ingest", ingest_job)
+    response = job.as_dict()
+    response["deduplicated"] = not created
+    response["status_url"] = f"/api/scrape/jobs/{job.id}"
+    return response
+
+
+@app.get("/api/ingest/status")
+async def ingest_status():
+    """Stats of the last completed torrent ingestion run"""
+    try:
+        from api import scraper
+    except ImportError:
+        return {"last_run": None}
+    return {"last_run": scraper.last_run_stats}
+
+
 @app.get("/api/channels")
 async def list_channels():
     """List available channels"""
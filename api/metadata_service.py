@@ -1,10 +1,11 @@
-import urllib.request
-import urllib.error
-import json
 import os
 from typing import Optional, Dict, Any
 import logging
 
+from api.http_client import get_http_client
+from api.swr_cache import SwrCache
+from api.upstream_guard import upstream_guard, UpstreamUnavailable
+
 logger = logging.getLogger(__name__)
 
 TMDB_API_KEY = os.environ.get("TMDB_API_KEY", "")
@@ -14,100 +15,129 @@ TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 OMDB_API_KEY = os.environ.get("OMDB_API_KEY", "")
 OMDB_BASE_URL = "http://www.omdbapi.com/"
 
+USER_AGENT = {'User-Agent': 'TamilStream/1.0'}
+
+# OMDb errors that mean the title has no record, as opposed to a key or quota problem
+OMDB_NOT_FOUND = ("Movie not found!", "Incorrect IMDb ID.")
+
+# Titles rarely change; misses (no poster anywhere) are retried hourly.
+# Upstream errors raise out of the loader, so they are never cached.
+metadata_cache = SwrCache("metadata", ttl=86400, stale_ttl=7 * 86400, max_entries=5000,
+                          negative_ttl=3600, persist=True)
+
+
+async def _get_json(url: str) -> Optional[Dict[str, Any]]:
+    """GET a JSON API through the host's upstream guard
+
+    None on 404; other HTTP errors raise like transport errors do, so a
+    failed lookup is not mistaken for a missing title.
+    """
+    async with upstream_guard(url).attempt() as attempt:
+        response = await get_http_client().get(url, headers=USER_AGENT, timeout=5.0)
+        if response.status_code >= 500 or response.status_code == 429:
+            attempt.fail(f"HTTP {response.status_code}")
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
 
 async def fetch_metadata_for_imdb(imdb_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch metadata including poster from external APIs based on IMDB ID"""
-    
-    metadata = await fetch_from_omdb(imdb_id)
+    """Metadata including poster for an IMDB ID, served from the metadata cache"""
+    try:
+        return await metadata_cache.get(imdb_id, lambda: _fetch_metadata(imdb_id))
+    except Exception as e:
+        logger.debug(f"Metadata lookup failed for {imdb_id}: {e}")
+        return None
+
+
+async def get_poster_for_imdb(imdb_id: str) -> Optional[str]:
+    metadata = await fetch_metadata_for_imdb(imdb_id)
+    return metadata.get("poster") if metadata else None
+
+
+async def _fetch_metadata(imdb_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch metadata including poster from external APIs based on IMDB ID
+
+    Returns None only when every source answered without the title; if a
+    source failed and none had it, the error is raised instead.
+    """
+    error = None
+    metadata = None
+    try:
+        metadata = await fetch_from_omdb(imdb_id)
+    except Exception as e:
+        error = e
     if metadata and metadata.get("poster"):
         return metadata
     
     if TMDB_API_KEY:
-        tmdb_metadata = await fetch_from_tmdb(imdb_id)
-        if tmdb_metadata:
-            return tmdb_metadata
+        try:
+            tmdb_metadata = await fetch_from_tmdb(imdb_id)
+        except Exception as e:
+            error = e
+        else:
+            if tmdb_metadata:
+                return tmdb_metadata
     
+    if metadata is None and error is not None:
+        raise error
     return metadata
 
 
 async def fetch_from_omdb(imdb_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch metadata from OMDb API (free, supports IMDB IDs directly)"""
-    try:
-        api_key = OMDB_API_KEY or "trilogy"
-        url = f"{OMDB_BASE_URL}?i={imdb_id}&apikey={api_key}"
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'TamilStream/1.0'})
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-        
-        if data.get("Response") == "True":
-            poster = data.get("Poster", "")
-            if poster and poster != "N/A":
-                return {
-                    "poster": poster,
-                    "title": data.get("Title"),
-                    "year": data.get("Year"),
-                    "description": data.get("Plot"),
-                    "rating": data.get("imdbRating"),
-                    "genres": data.get("Genre", "").split(", ") if data.get("Genre") else [],
-                    "runtime": data.get("Runtime")
-                }
-    except Exception as e:
-        logger.debug(f"OMDb fetch failed for {imdb_id}: {e}")
+    """Fetch metadata from OMDb API (free, supports IMDB IDs directly)
+
+    None when OMDb has no poster for the title; raises on upstream errors.
+    """
+    api_key = OMDB_API_KEY or "trilogy"
+    url = f"{OMDB_BASE_URL}?i={imdb_id}&apikey={api_key}"
+    
+    data = await _get_json(url)
+    
+    if data and data.get("Response") == "True":
+        poster = data.get("Poster", "")
+        if poster and poster != "N/A":
+            return {
+                "poster": poster,
+                "title": data.get("Title"),
+                "year": data.get("Year"),
+                "description": data.get("Plot"),
+                "rating": data.get("imdbRating"),
+                "genres": data.get("Genre", "").split(", ") if data.get("Genre") else [],
+                "runtime": data.get("Runtime")
+            }
+    elif data and data.get("Error") not in OMDB_NOT_FOUND:
+        # Quota and key errors come back as HTTP 200 with Response "False"
+        raise UpstreamUnavailable(f"OMDb: {data.get('Error')}")
     
     return None
 
 
 async def fetch_from_tmdb(imdb_id: str) -> Optional[Dict[str, Any]]:
-    """Fetch metadata from TMDB API"""
+    """Fetch metadata from TMDB API; None when it has no poster, raises on upstream errors"""
     if not TMDB_API_KEY:
         return None
     
-    try:
-        url = f"{TMDB_BASE_URL}/find/{imdb_id}?api_key={TMDB_API_KEY}&external_source=imdb_id"
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'TamilStream/1.0'})
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-        
-        result = None
-        if data.get("movie_results"):
-            result = data["movie_results"][0]
-        elif data.get("tv_results"):
-            result = data["tv_results"][0]
-        
-        if result and result.get("poster_path"):
-            return {
-                "poster": f"{TMDB_IMAGE_BASE}{result['poster_path']}",
-                "background": f"{TMDB_IMAGE_BASE}{result.get('backdrop_path', result['poster_path'])}",
-                "title": result.get("title") or result.get("name"),
-                "description": result.get("overview"),
-                "rating": result.get("vote_average")
-            }
-    except Exception as e:
-        logger.debug(f"TMDB fetch failed for {imdb_id}: {e}")
+    url = f"{TMDB_BASE_URL}/find/{imdb_id}?api_key={TMDB_API_KEY}&external_source=imdb_id"
     
-    return None
-
-
-def get_poster_for_imdb_sync(imdb_id: str) -> Optional[str]:
-    """Synchronous version to get poster URL"""
-    try:
-        api_key = OMDB_API_KEY or "trilogy"
-        url = f"{OMDB_BASE_URL}?i={imdb_id}&apikey={api_key}"
-        
-        req = urllib.request.Request(url, headers={'User-Agent': 'TamilStream/1.0'})
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-        
-        if data.get("Response") == "True":
-            poster = data.get("Poster", "")
-            if poster and poster != "N/A":
-                return poster
-    except Exception as e:
-        logger.debug(f"Poster fetch failed for {imdb_id}: {e}")
+    data = await _get_json(url)
+    
+    result = None
+    if not data:
+        return None
+    if data.get("movie_results"):
+        result = data["movie_results"][0]
+    elif data.get("tv_results"):
+        result = data["tv_results"][0]
+    
+    if result and result.get("poster_path"):
+        return {
+            "poster": f"{TMDB_IMAGE_BASE}{result['poster_path']}",
+            "background": f"{TMDB_IMAGE_BASE}{result.get('backdrop_path', result['poster_path'])}",
+            "title": result.get("title") or result.get("name"),
+            "description": result.get("overview"),
+            "rating": result.get("vote_average")
+        }
     
     return None
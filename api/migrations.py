@@ -0,0 +1,110 @@
+"""
+Versioned schema migrations for the TamilStream database
+
+`create_all` only creates missing tables, so indexes and columns added to
+existing tables are shipped here. Each migration runs once, in order, and
+is recorded in the schema_migrations table.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_ID = 7_246_113
+
+
+def _create_index(name: str, table: str, columns: str) -> Callable:
+    def migrate(conn, dialect: str):
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+    return migrate
+
+
+def _add_column(table: str, column: str, column_type: str) -> Callable:
+    def migrate(conn, dialect: str):
+        from sqlalchemy import inspect
+        if column not in {c["name"] for c in inspect(conn).get_columns(table)}:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    return migrate
+
+
+def _title_search_index(conn, dialect: str):
+    """Trigram index on lower(title) on Postgres, plain expression index elsewhere"""
+    if dialect == "postgresql":
+        try:
+            with conn.begin_nested():
+                conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                conn.exec_driver_sql(
+                    "CREATE INDEX IF NOT EXISTS ix_content_title_lower "
+                    "ON content USING gin (lower(title) gin_trgm_ops)"
+                )
+            return
+        except Exception as e:
+            logger.warning(f"pg_trgm unavailable, falling back to btree title index: {e}")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_content_title_lower ON content (lower(title))")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "episodes (content_id, episode_date)",
+     _create_index("ix_episodes_content_id_episode_date", "episodes", "content_id, episode_date")),
+    (2, "content (type, updated_at)",
+     _create_index("ix_content_type_updated_at", "content", "type, updated_at")),
+    (3, "content lower(title) search index", _title_search_index),
+    (4, "torrents (content_id, quality)",
+     _create_index("ix_torrents_content_id_quality", "torrents", "content_id, quality")),
+    (5, "torrents.files file list", _add_column("torrents", "files", "JSON")),
+]
+
+
+def _ensure_migrations_table(conn):
+    conn.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    )
+
+
+def get_schema_version(engine) -> int:
+    with engine.begin() as conn:
+        _ensure_migrations_table(conn)
+        return conn.exec_driver_sql("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").scalar() or 0
+
+
+def run_migrations(engine) -> int:
+    """Apply pending migrations; returns how many were applied"""
+    dialect = engine.dialect.name
+    applied = 0
+
+    with engine.begin() as conn:
+        if dialect == "postgresql":
+            conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({MIGRATION_LOCK_ID})")
+        _ensure_migrations_table(conn)
+        current = conn.exec_driver_sql("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").scalar() or 0
+
+        for version, description, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            migrate(conn, dialect)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description, "applied_at": datetime.utcnow()}
+            )
+            applied += 1
+
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from api import db
+
+    if db.init_db():
+        logger.info(f"Schema version: {get_schema_version(db.engine)}")
+    else:
+        logger.error("Database not available (set DATABASE_URL)")
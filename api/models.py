@@ -13,6 +13,7 @@ class StreamQuality(str, Enum):
     CAM = "CAM"
     HDCAM = "HDCAM"
     HDTS = "HDTS"
+    SD = "SD"
     HD = "HD"
     FULL_HD = "1080p"
     UHD_4K = "4K"
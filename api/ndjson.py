@@ -0,0 +1,68 @@
+"""
+Newline-delimited JSON helpers
+
+Records are written one compact JSON object per line as they are produced
+and read back one line at a time, so neither side ever holds a whole
+catalog in memory.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+
+def dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+class NdjsonWriter:
+    """Append records to `path`, atomically replacing it on close"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.size = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]):
+        self.write_line(dumps(record))
+
+    def write_line(self, line: str):
+        """Write an already-encoded record line"""
+        self._file.write(line)
+        self.count += 1
+        self.size += len(line)
+
+    def write_all(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the records of an NDJSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,82 @@
+"""
+Process-pool parse stage for the crawler
+
+HTML parsing is CPU-bound, so during a large crawl it serializes on one core
+no matter how many pages are fetched concurrently. A ParsePool hands fetched
+bodies to worker processes that return plain records. At most max_pending
+bodies are in flight; a crawl worker holding a page waits for a free slot
+before fetching its next URL, which bounds the memory held by parsed-but-
+unconsumed pages.
+
+With settings.parse_workers = 0 (the default) parsing stays in-process.
+"""
+
+import asyncio
+import multiprocessing
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePool:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = settings.parse_workers if workers is None else workers
+        self.max_pending = max_pending or max(1, self.workers * 2)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.parsed = 0
+        self.wait_s = 0.0
+        self.parse_s = 0.0
+
+    def __enter__(self) -> "ParsePool":
+        if self.workers > 0:
+            # spawn: forking a process that runs an event loop and an HTTP client is unsafe
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            self._slots = asyncio.Semaphore(self.max_pending)
+            logger.info(f"Parsing in {self.workers} worker processes")
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, parse: Callable[..., Any], *args) -> Any:
+        """parse(*args) in a worker process, or inline when the pool is disabled
+
+        parse must be a module-level function and its arguments and result
+        picklable.
+        """
+        started = time.perf_counter()
+        if not self._executor:
+            try:
+                return parse(*args)
+            finally:
+                self.parsed += 1
+                self.parse_s += time.perf_counter() - started
+
+        async with self._slots:
+            acquired = time.perf_counter()
+            self.wait_s += acquired - started
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, partial(parse, *args))
+            finally:
+                self.parsed += 1
+                self.parse_s += time.perf_counter() - acquired
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "parse_workers": self.workers,
+            "pages_parsed": self.parsed,
+            "parse_s": round(self.parse_s, 3),
+            "parse_wait_s": round(self.wait_s, 3)
+        }
@@ -0,0 +1,133 @@
+"""
+Background prefetch of the next episode's streams
+
+When a user asks for episode N, the stream handler schedules work for N+1
+so that Stremio's "next episode" is answered at once. Each user (one per
+addon config; requests without one are not prefetched) holds at most `prefetch_per_user` prefetches; scheduling
+another cancels the oldest. A prefetch is dropped, and cancelled if it is
+still running, when any of these happens:
+
+- it is not used within `prefetch_ttl` seconds
+- the user moves to another episode of the same show (asking for N
+  again keeps the prefetch of N+1)
+- it is displaced by a newer prefetch
+
+Results are only handed to the request when `keep_result` is set. Other
+prefetches exist to warm the upstream caches.
+"""
+
+import asyncio
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetch:
+    __slots__ = ("task", "group", "keep_result", "created_at")
+
+    def __init__(self, task: asyncio.Task, group: str, keep_result: bool):
+        self.task = task
+        self.group = group
+        self.keep_result = keep_result
+        self.created_at = time.monotonic()
+
+
+class Prefetcher:
+    def __init__(self, per_user: Optional[int] = None, ttl: Optional[float] = None):
+        self.per_user = settings.prefetch_per_user if per_user is None else per_user
+        self.ttl = settings.prefetch_ttl if ttl is None else ttl
+        self._users: Dict[str, "OrderedDict[Hashable, Prefetch]"] = {}
+        self.stats = {"scheduled": 0, "used": 0, "cancelled": 0, "expired": 0, "failed": 0}
+
+    def _drop(self, prefetch: Prefetch, reason: str):
+        if not prefetch.task.done():
+            prefetch.task.cancel()
+        self.stats[reason] += 1
+
+    def _expire(self):
+        horizon = time.monotonic() - self.ttl
+        for user in list(self._users):
+            slots = self._users[user]
+            for key in [k for k, p in slots.items() if p.created_at < horizon]:
+                self._drop(slots.pop(key), "expired")
+            if not slots:
+                del self._users[user]
+
+    def schedule(self, user: str, key: Hashable, group: str, factory: Callable[[], Awaitable[Any]],
+                 keep_result: bool = False) -> bool:
+        """Start factory() in the background for a request the user is expected to make"""
+        if self.per_user <= 0:
+            return False
+        self._expire()
+        slots = self._users.setdefault(user, OrderedDict())
+        if key in slots:
+            return False
+        while len(slots) >= self.per_user:
+            _, oldest = slots.popitem(last=False)
+            self._drop(oldest, "cancelled")
+
+        task = asyncio.get_running_loop().create_task(factory())
+        task.add_done_callback(self._task_done)
+        slots[key] = Prefetch(task, group, keep_result)
+        self.stats["scheduled"] += 1
+        return True
+
+    def _task_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["failed"] += 1
+            logger.debug(f"Prefetch failed: {task.exception()}")
+
+    async def take(self, user: str, key: Hashable, group: str, keep: Optional[Hashable] = None) -> Tuple[bool, Any]:
+        """(True, result) if key was prefetched with keep_result, joining it if still running
+
+        Prefetches of the same group under other keys, except keep, are
+        cancelled: the user went somewhere else.
+        """
+        slots = self._users.get(user)
+        if not slots:
+            return False, None
+        prefetch = slots.pop(key, None)
+        for other in [k for k, p in slots.items() if p.group == group and k != keep]:
+            self._drop(slots.pop(other), "cancelled")
+        if not slots:
+            self._users.pop(user, None)
+
+        if prefetch is None or not prefetch.keep_result or prefetch.task.cancelled():
+            return False, None
+        if time.monotonic() - prefetch.created_at > self.ttl:
+            self._drop(prefetch, "expired")
+            return False, None
+        try:
+            result = await asyncio.shield(prefetch.task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False, None
+        self.stats["used"] += 1
+        return True, result
+
+    async def shutdown(self):
+        tasks = [p.task for slots in self._users.values() for p in slots.values() if not p.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._users.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        self._expire()
+        return {
+            "per_user": self.per_user,
+            "ttl_s": self.ttl,
+            "users": len(self._users),
+            "pending": sum(1 for slots in self._users.values() for p in slots.values() if not p.task.done()),
+            "ready": sum(1 for slots in self._users.values() for p in slots.values() if p.task.done()),
+            **self.stats
+        }
+
+
+prefetcher = Prefetcher()
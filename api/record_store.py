@@ -0,0 +1,347 @@
+"""
+Append-only record store for the scraped catalog
+
+Instead of rewriting the whole catalog on every scrape, each run appends
+one small delta file holding only the records that were added, changed or
+removed. A record counts as changed when its content hash differs. Every
+few runs the deltas are compacted into a new base file. Both files are
+NDJSON, one operation per line:
+
+    {"op": "meta", "seq": 12, "last_updated": "..."}
+    {"op": "put", "list": "series", "id": "td_kayal", "hash": "...", "record": {...}}
+    {"op": "del", "list": "series", "id": "td_old_show"}
+    {"op": "order", "list": "series", "ids": ["td_kayal", ...]}
+
+Loading replays base.ndjson and then every delta-<seq>.ndjson newer than it.
+Writing and compacting stream records through; StoreCatalog serves reads
+from an index of line offsets instead of holding the records in memory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from api.catalog_snapshot import CONTENT_LISTS
+from api.config import settings
+from api.ndjson import NdjsonWriter
+
+logger = logging.getLogger(__name__)
+
+RECORD_STORE_DIRNAME = "catalog_store"
+BASE_FILENAME = "base.ndjson"
+RECORD_LISTS = ("movies", "series", "episodes")
+
+_DELTA_FILE = re.compile(r"^delta-(\d+)\.ndjson$")
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class StoreState:
+    """Replayed contents: ordered records per list plus their hashes
+
+    With keep_records=False only ids, order and hashes are kept, which is
+    all a write needs to compute the next delta.
+    """
+
+    def __init__(self, keep_records: bool = True):
+        self.keep_records = keep_records
+        self.seq = 0
+        self.last_updated: Optional[str] = None
+        self.records: Dict[str, "OrderedDict[str, Any]"] = {name: OrderedDict() for name in RECORD_LISTS}
+        self.hashes: Dict[str, Dict[str, str]] = {name: {} for name in RECORD_LISTS}
+
+    def apply(self, op: Dict[str, Any]):
+        kind = op.get("op")
+        name = op.get("list")
+        if kind == "meta":
+            self.seq = op.get("seq", self.seq)
+            self.last_updated = op.get("last_updated", self.last_updated)
+        elif kind == "put":
+            self.records.setdefault(name, OrderedDict())[op["id"]] = op["record"] if self.keep_records else None
+            self.hashes.setdefault(name, {})[op["id"]] = op["hash"]
+        elif kind == "del":
+            self.records.get(name, {}).pop(op["id"], None)
+            self.hashes.get(name, {}).pop(op["id"], None)
+        elif kind == "order":
+            self.records[name] = _reorder(self.records.setdefault(name, OrderedDict()), op["ids"])
+
+    def as_data(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: list(records.values()) for name, records in self.records.items()}
+        data["last_updated"] = self.last_updated
+        return data
+
+
+def _reorder(entries: "OrderedDict[str, Any]", ids: List[str]) -> "OrderedDict[str, Any]":
+    ordered = OrderedDict((i, entries[i]) for i in ids if i in entries)
+    for key, value in entries.items():
+        ordered.setdefault(key, value)
+    return ordered
+
+
+class RecordStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @property
+    def base_path(self) -> str:
+        return os.path.join(self.directory, BASE_FILENAME)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.base_path)
+
+    def _delta_files(self) -> List[Tuple[int, str]]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        deltas = []
+        for name in names:
+            match = _DELTA_FILE.match(name)
+            if match:
+                deltas.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(deltas)
+
+    def current_seq(self) -> int:
+        """Sequence number of the newest change, from the base header and the delta names"""
+        base_seq = 0
+        if self.exists():
+            with open(self.base_path, "rb") as f:
+                first = f.readline()
+            op = json.loads(first) if first.strip() else {}
+            if op.get("op") == "meta":
+                base_seq = op.get("seq", 0)
+        return max([base_seq] + [seq for seq, _ in self._delta_files()])
+
+    def file_key(self) -> Tuple:
+        """Identity of the base and delta files, for change detection"""
+        key = []
+        for path in [self.base_path] + [p for _, p in self._delta_files()]:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            key.append((os.path.basename(path), st.st_mtime_ns, st.st_size))
+        return tuple(key)
+
+    def iter_lines(self) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        """(path, offset, length, op) for the base followed by the deltas newer than it"""
+        base_seq = 0
+        paths = [self.base_path] if self.exists() else []
+        for path in paths + [p for _, p in self._delta_files()]:
+            with open(path, "rb") as f:
+                offset = 0
+                first = True
+                for line in f:
+                    length = len(line)
+                    if line.strip():
+                        op = json.loads(line)
+                        if first and op.get("op") == "meta":
+                            if path == self.base_path:
+                                base_seq = op.get("seq", 0)
+                            elif op.get("seq", 0) <= base_seq:
+                                # Already folded into the base
+                                break
+                        first = False
+                        yield path, offset, length, op
+                    offset += length
+
+    def iter_ops(self) -> Iterator[Dict[str, Any]]:
+        for _, _, _, op in self.iter_lines():
+            yield op
+
+    def load(self, keep_records: bool = True) -> StoreState:
+        state = StoreState(keep_records)
+        for op in self.iter_ops():
+            state.apply(op)
+        return state
+
+    def open_catalog(self) -> "StoreCatalog":
+        return StoreCatalog(self)
+
+    def save(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a delta with the differences between data and the stored catalog
+
+        Each list in data may be any iterable; records are hashed and written
+        as they stream past, so only ids and hashes are held in memory.
+        """
+        state = self.load(keep_records=False)
+        seq = state.seq + 1
+        first_run = not self.exists()
+        path = self.base_path if first_run else os.path.join(self.directory, f"delta-{seq:06d}.ndjson")
+        stats = {"added": 0, "changed": 0, "removed": 0, "reordered": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        writer = NdjsonWriter(path)
+        try:
+            writer.write({"op": "meta", "seq": seq, "last_updated": data.get("last_updated")})
+            for name in RECORD_LISTS:
+                current = state.hashes.get(name, {})
+                seen = set()
+                ids = []
+                for record in data.get(name) or []:
+                    record_id = record.get("id")
+                    if not record_id or record_id in seen:
+                        continue
+                    seen.add(record_id)
+                    ids.append(record_id)
+                    digest = record_hash(record)
+                    if current.get(record_id) != digest:
+                        stats["added" if record_id not in current else "changed"] += 1
+                        writer.write({"op": "put", "list": name, "id": record_id, "hash": digest, "record": record})
+                for record_id in current:
+                    if record_id not in seen:
+                        stats["removed"] += 1
+                        writer.write({"op": "del", "list": name, "id": record_id})
+
+                expected = [i for i in state.records.get(name, {}) if i in seen] + [i for i in ids if i not in current]
+                if ids != expected:
+                    stats["reordered"] += 1
+                    writer.write({"op": "order", "list": name, "ids": ids})
+        except BaseException:
+            writer.discard()
+            raise
+
+        if writer.count == 1:
+            writer.discard()
+            logger.info("Record store unchanged, no delta written")
+            stats.update({"seq": state.seq, "delta_bytes": 0, "compacted": False})
+            return stats
+
+        writer.close()
+        stats.update({"seq": seq, "delta_bytes": writer.size, "compacted": first_run})
+        if not first_run and self._should_compact():
+            self.compact()
+            stats["compacted"] = True
+        logger.info(f"Record store delta {seq}: {stats}")
+        return stats
+
+    def _should_compact(self) -> bool:
+        deltas = self._delta_files()
+        if len(deltas) >= settings.record_store_compact_every:
+            return True
+        delta_bytes = sum(os.path.getsize(p) for _, p in deltas)
+        base_bytes = os.path.getsize(self.base_path) if self.exists() else 0
+        return delta_bytes > base_bytes
+
+    def compact(self) -> int:
+        """Fold all deltas into a new base and drop them; returns the new seq"""
+        catalog = self.open_catalog()
+        try:
+            with NdjsonWriter(self.base_path) as writer:
+                writer.write({"op": "meta", "seq": catalog.seq, "last_updated": catalog.last_updated,
+                              "compacted_at": time.time()})
+                for name in RECORD_LISTS:
+                    for line in catalog.iter_raw(name):
+                        writer.write_line(line)
+        finally:
+            catalog.close()
+        for seq, path in self._delta_files():
+            if seq <= catalog.seq:
+                os.remove(path)
+        logger.info(f"Compacted record store at seq {catalog.seq}")
+        return catalog.seq
+
+
+class StoreCatalog:
+    """Catalog interface over a record store, reading records by line offset on demand"""
+
+    def __init__(self, store: RecordStore):
+        self.path = store.directory
+        self.seq = 0
+        self.last_updated: Optional[str] = None
+        self._entries: Dict[str, "OrderedDict[str, Tuple[int, int, int, Optional[str]]]"] = \
+            {name: OrderedDict() for name in RECORD_LISTS}
+        self._fds: List[int] = []
+        self._fd_index: Dict[str, int] = {}
+
+        try:
+            for path, offset, length, op in store.iter_lines():
+                kind = op.get("op")
+                name = op.get("list")
+                if kind == "meta":
+                    self.seq = op.get("seq", self.seq)
+                    self.last_updated = op.get("last_updated", self.last_updated)
+                elif kind == "put":
+                    entries = self._entries.setdefault(name, OrderedDict())
+                    entries[op["id"]] = (self._fd(path), offset, length, op["record"].get("imdb_id"))
+                elif kind == "del":
+                    self._entries.get(name, {}).pop(op["id"], None)
+                elif kind == "order":
+                    self._entries[name] = _reorder(self._entries.setdefault(name, OrderedDict()), op["ids"])
+        except Exception:
+            self.close()
+            raise
+
+        self.version = f"seq{self.seq}"
+        self._index: Dict[str, Tuple[str, str]] = {}
+        for name in CONTENT_LISTS:
+            for record_id, (_, _, _, imdb_id) in self._entries.get(name, {}).items():
+                if imdb_id:
+                    self._index.setdefault(imdb_id, (name, record_id))
+                self._index[record_id] = (name, record_id)
+
+    def _fd(self, path: str) -> int:
+        if path not in self._fd_index:
+            self._fd_index[path] = len(self._fds)
+            self._fds.append(os.open(path, os.O_RDONLY))
+        return self._fd_index[path]
+
+    def _read_line(self, entry: Tuple[int, int, int, Optional[str]]) -> bytes:
+        fd, offset, length, _ = entry
+        return os.pread(self._fds[fd], length, offset)
+
+    def _read(self, entry: Tuple[int, int, int, Optional[str]]) -> Dict[str, Any]:
+        return json.loads(self._read_line(entry))["record"]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        located = self._index.get(key)
+        if not located:
+            return None
+        name, record_id = located
+        return self._read(self._entries[name][record_id])
+
+    def count(self, name: str) -> int:
+        return len(self._entries.get(name, {}))
+
+    def iter_list(self, name: str) -> Iterator[Dict[str, Any]]:
+        for entry in list(self._entries.get(name, {}).values()):
+            yield self._read(entry)
+
+    def iter_raw(self, name: str) -> Iterator[str]:
+        """Stored put lines of a list, in catalog order"""
+        for entry in list(self._entries.get(name, {}).values()):
+            yield self._read_line(entry).decode("utf-8")
+
+    def close(self):
+        fds, self._fds = self._fds, []
+        for fd in fds:
+            os.close(fd)
+
+    def __del__(self):
+        self.close()
+
+
+def default_store_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", RECORD_STORE_DIRNAME)
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    store = RecordStore(sys.argv[2] if len(sys.argv) > 2 else default_store_dir())
+    if len(sys.argv) > 1 and sys.argv[1] == "compact":
+        store.compact()
+    else:
+        catalog = store.open_catalog()
+        print(json.dumps({"seq": catalog.seq, "last_updated": catalog.last_updated,
+                          **{name: catalog.count(name) for name in RECORD_LISTS}}))
+        catalog.close()
@@ -0,0 +1,167 @@
+"""
+Single-pass release-name parser
+
+One master regex tokenizes a release title ("Leo.2023.Tamil.1080p.WEB-DL.x264
+.DD5.1", "Kayal S01E101-E105 Tamil 720p HDTV") into resolution, source,
+codec, audio, language, season/episode and year tokens. Tokens only match
+whole words, so "HD" never matches inside "HDCAM" and "TS" never matches
+inside a title. The title is everything before the first metadata token.
+Results are memoized per title.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from api.models import StreamQuality
+
+
+class ReleaseInfo(NamedTuple):
+    title: str
+    year: Optional[int]
+    resolution: Optional[str]
+    source: Optional[str]
+    codec: Optional[str]
+    audio: Tuple[str, ...]
+    languages: Tuple[str, ...]
+    seasons: Tuple[int, ...]
+    episodes: Tuple[int, ...]
+    quality: str
+
+    @property
+    def is_series(self) -> bool:
+        return bool(self.seasons or self.episodes)
+
+
+_TOKEN = re.compile(r"(?<![A-Za-z0-9])(?:" + "|".join([
+    r"(?P<se>S(?P<s1>\d{1,2})(?:[\s._-]?E(?P<e1>\d{1,4})(?:-?E?(?P<e2>\d{1,4}))?|-S?(?P<s2>\d{1,2}))?)",
+    r"(?P<season>Season[\s._-]*(?P<ss1>\d{1,2})(?:[\s._]*-[\s._]*(?P<ss2>\d{1,2}))?)",
+    r"(?P<ep>(?:(?:EP|Episode)[\s._-]*|E)(?P<ep1>\d{1,4})(?:[\s._]*-[\s._]*(?P<ep2>\d{1,4}))?)",
+    r"(?P<res>2160p|1080p|720p|576p|480p|4K|UHD|FHD|Full[\s.]?HD|HD)",
+    r"(?P<src>WEB[-.]?DL|WEB[-.]?Rip|HDRip|BluRay|BDRip|BRRip|DVDRip|DVDScr|HDTV|PreDVD|HDCAM|CAMRip|CAM|HDTS|HDTC|TS|TC)",
+    r"(?P<codec>[xXhH]\.?26[45]|HEVC|AVC|XviD)",
+    r"(?P<audio>DDP?\+?[\s.]?[257]\.[01]|DD\+|AAC(?:[\s.]?[257]\.[01])?|AC3|DTS(?:-HD)?|Atmos|TrueHD|[257]\.1|2\.0|Dual[\s._-]Audio|Multi[\s._-]Audio)",
+    r"(?P<lang>Tamil|Telugu|Hindi|Malayalam|Kannada|English|Tam|Tel|Hin|Mal|Kan|Eng)",
+    r"(?P<year>(?:19|20)\d{2})",
+]) + r")(?![A-Za-z0-9])", re.I)
+
+_RESOLUTIONS = {"2160p": "2160p", "4k": "2160p", "uhd": "2160p", "1080p": "1080p", "fhd": "1080p",
+                "fullhd": "1080p",
+                "720p": "720p", "hd": "720p", "576p": "576p", "480p": "480p"}
+_SOURCES = {"webdl": "WEB-DL", "webrip": "WEBRip", "hdrip": "HDRip", "bluray": "BluRay", "bdrip": "BluRay",
+            "brrip": "BluRay", "dvdrip": "DVDRip", "dvdscr": "DVDScr", "hdtv": "HDTV", "predvd": "PreDVD",
+            "hdcam": "HDCAM", "camrip": "CAM", "cam": "CAM", "hdts": "HDTS", "hdtc": "HDTS", "ts": "HDTS",
+            "tc": "HDTS"}
+_CODECS = {"x264": "x264", "h264": "x264", "avc": "x264", "x265": "x265", "h265": "x265", "hevc": "x265",
+           "xvid": "XviD"}
+_LANGUAGES = {"tam": "Tamil", "tel": "Telugu", "hin": "Hindi", "mal": "Malayalam", "kan": "Kannada", "eng": "English"}
+
+_CAM_QUALITIES = {"CAM": StreamQuality.CAM.value, "HDCAM": StreamQuality.HDCAM.value, "HDTS": StreamQuality.HDTS.value}
+_RESOLUTION_QUALITIES = {"2160p": StreamQuality.UHD_4K.value, "1080p": StreamQuality.FULL_HD.value,
+                         "720p": StreamQuality.HD.value}
+# Without a resolution the source still tells HD from SD rips
+_SOURCE_QUALITIES = {"WEB-DL": StreamQuality.HD.value, "WEBRip": StreamQuality.HD.value,
+                     "HDRip": StreamQuality.HD.value, "BluRay": StreamQuality.HD.value,
+                     "HDTV": StreamQuality.HD.value, "DVDRip": StreamQuality.SD.value,
+                     "DVDScr": StreamQuality.SD.value}
+
+_SEPARATORS = re.compile(r"[\s._\-\[\]()]+")
+# Dots between digits belong to the title ("2.0")
+_TITLE_SEPARATORS = re.compile(r"(?:[\s_\-\[\]()]|(?<!\d)\.|\.(?!\d))+")
+
+
+def _key(token: str) -> str:
+    return token.lower().replace("-", "").replace(".", "")
+
+
+def _span(start: Optional[str], end: Optional[str]) -> List[int]:
+    if start is None:
+        return []
+    first = int(start)
+    last = int(end) if end is not None else first
+    if last < first or last - first > 500:
+        return [first]
+    return list(range(first, last + 1))
+
+
+def _quality(resolution: Optional[str], source: Optional[str]) -> str:
+    if source in _CAM_QUALITIES:
+        return _CAM_QUALITIES[source]
+    if resolution is None:
+        return _SOURCE_QUALITIES.get(source, StreamQuality.UNKNOWN.value)
+    return _RESOLUTION_QUALITIES.get(resolution, StreamQuality.UNKNOWN.value)
+
+
+@lru_cache(maxsize=65536)
+def parse_release(name: str) -> ReleaseInfo:
+    """Parse a release title in one pass over its tokens"""
+    title_end = len(name)
+    year = resolution = source = codec = None
+    resolution_from_hd = False
+    audio: List[str] = []
+    languages: List[str] = []
+    seasons: List[int] = []
+    episodes: List[int] = []
+
+    for match in _TOKEN.finditer(name):
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        # A year, language or audio-like word at the very start is part of
+        # the title ("1917", "English Vinglish", "2.0")
+        if kind in ("year", "lang", "audio") and not name[:match.start()].strip(" ._-[("):
+            continue
+        if match.start() < title_end:
+            title_end = match.start()
+
+        if kind == "se":
+            seasons.extend(_span(match.group("s1"), match.group("s2")))
+            episodes.extend(_span(match.group("e1"), match.group("e2")))
+        elif kind == "season":
+            seasons.extend(_span(match.group("ss1"), match.group("ss2")))
+        elif kind == "ep":
+            episodes.extend(_span(match.group("ep1"), match.group("ep2")))
+        elif kind == "res":
+            # A bare "HD" only counts when no explicit resolution is given
+            bare_hd = value.lower() == "hd"
+            if resolution is None or (resolution_from_hd and not bare_hd):
+                resolution = _RESOLUTIONS[_SEPARATORS.sub("", value.lower())]
+                resolution_from_hd = bare_hd
+        elif kind == "src":
+            source = source or _SOURCES[_key(value)]
+        elif kind == "codec":
+            codec = codec or _CODECS[_key(value)]
+        elif kind == "audio":
+            if "audio" in value.lower():
+                value = _SEPARATORS.sub(" ", value).strip()
+            if value not in audio:
+                audio.append(value)
+        elif kind == "lang":
+            lang = _LANGUAGES.get(value.lower(), value.capitalize())
+            if lang not in languages:
+                languages.append(lang)
+        elif kind == "year" and year is None:
+            year = int(value)
+
+    title = " ".join(_TITLE_SEPARATORS.split(name[:title_end])).strip()
+    return ReleaseInfo(
+        title=title,
+        year=year,
+        resolution=resolution,
+        source=source,
+        codec=codec,
+        audio=tuple(audio),
+        languages=tuple(languages),
+        seasons=tuple(sorted(set(seasons))) if seasons else (),
+        episodes=tuple(sorted(set(episodes))) if episodes else (),
+        quality=_quality(resolution, source)
+    )
+
+
+def parse_releases(names: Iterable[str]) -> List[ReleaseInfo]:
+    """Batch API for ingestion; repeated titles hit the memo"""
+    return [parse_release(name) for name in names]
+
+
+def cache_info():
+    return parse_release.cache_info()
@@ -0,0 +1,256 @@
+"""
+Sample Tamil content used when no scraped catalog or database is available
+"""
+
+SAMPLE_TAMIL_MOVIES = [
+    {
+        "id": "tt15354916",
+        "imdb_id": "tt15354916",
+        "title": "Ponniyin Selvan I",
+        "year": 2022,
+        "type": "movie",
+        "description": "Vandiyathevan, a clever and brave warrior, goes on a mission to deliver a message to the Chola king.",
+        "genres": ["Action", "Drama", "History"],
+        "rating": 7.5,
+        "runtime": "167 min"
+    },
+    {
+        "id": "tt21064584",
+        "imdb_id": "tt21064584",
+        "title": "Jailer",
+        "year": 2023,
+        "type": "movie",
+        "description": "A retired jailer goes on a rampage when his son, an honest cop, is killed by a crime syndicate.",
+        "genres": ["Action", "Thriller"],
+        "rating": 7.0,
+        "runtime": "168 min"
+    },
+    {
+        "id": "tt9900782",
+        "imdb_id": "tt9900782",
+        "title": "Vikram",
+        "year": 2022,
+        "type": "movie",
+        "description": "A special agent investigates a murder committed by a masked group of serial killers.",
+        "genres": ["Action", "Crime", "Thriller"],
+        "rating": 8.3,
+        "runtime": "174 min"
+    },
+    {
+        "id": "tt6788942",
+        "imdb_id": "tt6788942",
+        "title": "Master",
+        "year": 2021,
+        "type": "movie",
+        "description": "An alcoholic professor is sent to a juvenile school, where he clashes with a gangster.",
+        "genres": ["Action", "Thriller"],
+        "rating": 7.2,
+        "runtime": "179 min"
+    },
+    {
+        "id": "tt10869796",
+        "imdb_id": "tt10869796",
+        "title": "Leo",
+        "year": 2023,
+        "type": "movie",
+        "description": "A cafe owner with a dark past takes on a group of gangsters.",
+        "genres": ["Action", "Crime", "Drama"],
+        "rating": 6.6,
+        "runtime": "164 min"
+    },
+    {
+        "id": "tt27524176",
+        "imdb_id": "tt27524176",
+        "title": "GOAT",
+        "year": 2024,
+        "type": "movie",
+        "description": "A retired special agent returns to action when his family is threatened.",
+        "genres": ["Action", "Thriller"],
+        "rating": 6.5,
+        "runtime": "170 min"
+    }
+]
+
+SAMPLE_TAMIL_SERIES = [
+    {
+        "id": "tt15744286",
+        "imdb_id": "tt15744286",
+        "title": "Suzhal: The Vortex",
+        "year": 2022,
+        "type": "series",
+        "description": "A missing child case in a small town uncovers dark secrets and hidden truths.",
+        "genres": ["Crime", "Drama", "Mystery"],
+        "rating": 7.3,
+        "runtime": "45 min",
+        "videos": [
+            {"id": "tt15744286:1:1", "title": "Episode 1", "season": 1, "episode": 1},
+            {"id": "tt15744286:1:2", "title": "Episode 2", "season": 1, "episode": 2},
+            {"id": "tt15744286:1:3", "title": "Episode 3", "season": 1, "episode": 3},
+            {"id": "tt15744286:1:4", "title": "Episode 4", "season": 1, "episode": 4},
+            {"id": "tt15744286:1:5", "title": "Episode 5", "season": 1, "episode": 5},
+            {"id": "tt15744286:1:6", "title": "Episode 6", "season": 1, "episode": 6},
+            {"id": "tt15744286:1:7", "title": "Episode 7", "season": 1, "episode": 7},
+            {"id": "tt15744286:1:8", "title": "Episode 8", "season": 1, "episode": 8}
+        ]
+    },
+    {
+        "id": "tt21245112",
+        "imdb_id": "tt21245112",
+        "title": "The Night Manager",
+        "year": 2023,
+        "type": "series",
+        "description": "A hotel night manager becomes an undercover agent to infiltrate an arms dealer's network.",
+        "genres": ["Action", "Drama", "Thriller"],
+        "rating": 7.8,
+        "runtime": "50 min",
+        "videos": [
+            {"id": "tt21245112:1:1", "title": "Episode 1", "season": 1, "episode": 1},
+            {"id": "tt21245112:1:2", "title": "Episode 2", "season": 1, "episode": 2},
+            {"id": "tt21245112:1:3", "title": "Episode 3", "season": 1, "episode": 3},
+            {"id": "tt21245112:1:4", "title": "Episode 4", "season": 1, "episode": 4},
+            {"id": "tt21245112:1:5", "title": "Episode 5", "season": 1, "episode": 5},
+            {"id": "tt21245112:1:6", "title": "Episode 6", "season": 1, "episode": 6},
+            {"id": "tt21245112:1:7", "title": "Episode 7", "season": 1, "episode": 7}
+        ]
+    },
+    {
+        "id": "tt11427016",
+        "imdb_id": "tt11427016",
+        "title": "November Story",
+        "year": 2021,
+        "type": "series",
+        "description": "A young woman fights to prove her father's innocence in a murder case.",
+        "genres": ["Crime", "Mystery", "Thriller"],
+        "rating": 8.0,
+        "runtime": "45 min",
+        "videos": [
+            {"id": "tt11427016:1:1", "title": "Episode 1", "season": 1, "episode": 1},
+            {"id": "tt11427016:1:2", "title": "Episode 2", "season": 1, "episode": 2},
+            {"id": "tt11427016:1:3", "title": "Episode 3", "season": 1, "episode": 3},
+            {"id": "tt11427016:1:4", "title": "Episode 4", "season": 1, "episode": 4},
+            {"id": "tt11427016:1:5", "title": "Episode 5", "season": 1, "episode": 5},
+            {"id": "tt11427016:1:6", "title": "Episode 6", "season": 1, "episode": 6},
+            {"id": "tt11427016:1:7", "title": "Episode 7", "season": 1, "episode": 7}
+        ]
+    }
+]
+
+SAMPLE_TORRENTS = [
+    {
+        "id": "torrent_1",
+        "content_id": "tt15354916",
+        "info_hash": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2",
+        "title": "Ponniyin.Selvan.I.2022.Tamil.1080p.BluRay.x264",
+        "size": 4294967296,
+        "size_readable": "4.0 GB",
+        "quality": "1080p",
+        "seeders": 150,
+        "leechers": 20,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2&dn=Ponniyin.Selvan.I.2022.Tamil.1080p.BluRay.x264"
+    },
+    {
+        "id": "torrent_2",
+        "content_id": "tt21064584",
+        "info_hash": "b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3",
+        "title": "Jailer.2023.Tamil.1080p.WEB-DL.x264",
+        "size": 3221225472,
+        "size_readable": "3.0 GB",
+        "quality": "1080p",
+        "seeders": 200,
+        "leechers": 30,
+        "source": "TamilBlasters",
+        "magnet": "magnet:?xt=urn:btih:b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3&dn=Jailer.2023.Tamil.1080p.WEB-DL.x264"
+    },
+    {
+        "id": "torrent_3",
+        "content_id": "tt9900782",
+        "info_hash": "c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4",
+        "title": "Vikram.2022.Tamil.2160p.4K.WEB-DL.x265",
+        "size": 8589934592,
+        "size_readable": "8.0 GB",
+        "quality": "4K",
+        "seeders": 100,
+        "leechers": 15,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4&dn=Vikram.2022.Tamil.2160p.4K.WEB-DL.x265"
+    },
+    {
+        "id": "torrent_4",
+        "content_id": "tt6788942",
+        "info_hash": "d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5",
+        "title": "Master.2021.Tamil.720p.WEB-DL.x264",
+        "size": 1610612736,
+        "size_readable": "1.5 GB",
+        "quality": "HD",
+        "seeders": 80,
+        "leechers": 10,
+        "source": "TamilBlasters",
+        "magnet": "magnet:?xt=urn:btih:d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5&dn=Master.2021.Tamil.720p.WEB-DL.x264"
+    },
+    {
+        "id": "torrent_5",
+        "content_id": "tt10869796",
+        "info_hash": "e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6",
+        "title": "Leo.2023.Tamil.1080p.BluRay.x264",
+        "size": 4294967296,
+        "size_readable": "4.0 GB",
+        "quality": "1080p",
+        "seeders": 250,
+        "leechers": 40,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6&dn=Leo.2023.Tamil.1080p.BluRay.x264"
+    },
+    {
+        "id": "torrent_6",
+        "content_id": "tt27524176",
+        "info_hash": "f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1",
+        "title": "GOAT.2024.Tamil.1080p.WEB-DL.x264",
+        "size": 3500000000,
+        "size_readable": "3.3 GB",
+        "quality": "1080p",
+        "seeders": 300,
+        "leechers": 50,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1&dn=GOAT.2024.Tamil.1080p.WEB-DL.x264"
+    },
+    {
+        "id": "torrent_7",
+        "content_id": "tt15744286",
+        "info_hash": "1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b",
+        "title": "Suzhal.The.Vortex.S01.Complete.Tamil.1080p.AMZN.WEB-DL",
+        "size": 5000000000,
+        "size_readable": "4.7 GB",
+        "quality": "1080p",
+        "seeders": 120,
+        "leechers": 15,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b&dn=Suzhal.The.Vortex.S01.Complete.Tamil.1080p.AMZN.WEB-DL"
+    },
+    {
+        "id": "torrent_8",
+        "content_id": "tt21245112",
+        "info_hash": "2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c",
+        "title": "The.Night.Manager.S01.Complete.Tamil.1080p.DSNP.WEB-DL",
+        "size": 6000000000,
+        "size_readable": "5.6 GB",
+        "quality": "1080p",
+        "seeders": 180,
+        "leechers": 25,
+        "source": "TamilMV",
+        "magnet": "magnet:?xt=urn:btih:2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c&dn=The.Night.Manager.S01.Complete.Tamil.1080p.DSNP.WEB-DL"
+    },
+    {
+        "id": "torrent_9",
+        "content_id": "tt11427016",
+        "info_hash": "3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d",
+        "title": "November.Story.S01.Complete.Tamil.1080p.DSNP.WEB-DL",
+        "size": 4500000000,
+        "size_readable": "4.2 GB",
+        "quality": "1080p",
+        "seeders": 90,
+        "leechers": 12,
+        "source": "TamilBlasters",
+        "magnet": "magnet:?xt=urn:btih:3c4d5e6f1a2b3c4d5e6f1a2b3c4d5e6f1a2b3c4d&dn=November.Story.S01.Complete.Tamil.1080p.DSNP.WEB-DL"
+    }
+]
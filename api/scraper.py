@@ -1,11 +1,22 @@
-import httpx
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+import asyncio
+import json
 import re
+import time
 import hashlib
 import logging
+import xml.etree.ElementTree as ET
 from datetime import datetime
-from api.content_store import add_content, add_torrent, load_content, load_torrents
+from api.catalog_data import find_data_file
+from api.config import settings
+from api.content_store import get_content_by_id, upsert_batch
+from api.http_client import get_http_client
+from api.release_parser import parse_release, parse_releases
+from api.storage_backends import get_backend
+from api.title_index import get_title_index
+from api.torrent_files import normalize_files
+from api.upstream_guard import upstream_guard
 
 logger = logging.getLogger(__name__)
 
@@ -27,35 +38,15 @@ def parse_size(size_str: str) -> tuple:
 
 
 def detect_quality(title: str) -> str:
-    title_upper = title.upper()
-    if '2160P' in title_upper or '4K' in title_upper or 'UHD' in title_upper:
-        return '4K'
-    elif '1080P' in title_upper or 'FULL HD' in title_upper or 'FHD' in title_upper:
-        return '1080p'
-    elif '720P' in title_upper or 'HD' in title_upper:
-        return 'HD'
-    elif 'HDCAM' in title_upper:
-        return 'HDCAM'
-    elif 'CAM' in title_upper or 'CAMRIP' in title_upper:
-        return 'CAM'
-    elif 'HDTS' in title_upper or 'TS' in title_upper:
-        return 'HDTS'
-    return 'Unknown'
+    return parse_release(title).quality
 
 
 def extract_year(title: str) -> Optional[int]:
-    match = re.search(r'\b(19|20)\d{2}\b', title)
-    if match:
-        return int(match.group(0))
-    return None
+    return parse_release(title).year
 
 
 def clean_title(title: str) -> str:
-    clean = re.sub(r'\b(19|20)\d{2}\b', '', title)
-    clean = re.sub(r'\b(720p|1080p|2160p|4K|UHD|HDRip|BluRay|WEB-DL|WEBRip|HDCAM|CAM|DVDRip|x264|x265|HEVC|AAC|Tamil|Hindi|English|Dual Audio|Multi Audio)\b', '', clean, flags=re.IGNORECASE)
-    clean = re.sub(r'[._\-\[\]()]', ' ', clean)
-    clean = ' '.join(clean.split())
-    return clean.strip()
+    return parse_release(title).title
 
 
 def extract_info_hash_from_magnet(magnet: str) -> Optional[str]:
@@ -68,6 +59,11 @@ def extract_info_hash_from_magnet(magnet: str) -> Optional[str]:
     return None
 
 
+# Content ids minted for torrents not yet linked to an IMDb id; kept out of
+# the tt namespace so they never collide with real titles
+PROVISIONAL_PREFIX = "ts_"
+
+
 class TamilContentScraper:
     def __init__(self):
         self.headers = {
@@ -78,21 +74,7 @@ class TamilContentScraper:
         self.timeout = 30.0
     
     async def fetch_page(self, url: str) -> Optional[str]:
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    follow_redirects=True
-                )
-                if response.status_code == 200:
-                    return response.text
-                logger.warning(f"Failed to fetch {url}: {response.status_code}")
-                return None
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return None
+        return await fetch_text(url, self.headers, self.timeout)
     
     def parse_torrent_entry(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
@@ -103,19 +85,22 @@ class TamilContentScraper:
             if not title or not magnet:
                 return None
             
-            info_hash = extract_info_hash_from_magnet(magnet)
+            info_hash = (entry.get('info_hash') or extract_info_hash_from_magnet(magnet) or '').lower()
             if not info_hash:
                 info_hash = generate_hash(title)
             
-            size_bytes, size_readable = parse_size(size_str)
-            quality = detect_quality(title)
-            year = extract_year(title)
-            clean_name = clean_title(title)
+            if entry.get('size_readable'):
+                size_bytes, size_readable = int(entry.get('size') or 0), entry['size_readable']
+            else:
+                size_bytes, size_readable = parse_size(str(size_str))
+            release = parse_release(title)
+            quality = entry.get('quality') or release.quality
+            clean_name = release.title
             
-            content_id = f"tt{generate_hash(clean_name)[:7]}"
+            content_id = entry.get('content_id') or f"{PROVISIONAL_PREFIX}{generate_hash(clean_name)[:7]}"
             
-            return {
-                'id': f"torrent_{generate_hash(info_hash)[:8]}",
+            torrent = {
+                'id': entry.get('id') or f"torrent_{generate_hash(info_hash)[:8]}",
                 'content_id': content_id,
                 'info_hash': info_hash,
                 'title': title,
@@ -128,16 +113,19 @@ class TamilContentScraper:
                 'magnet': magnet,
                 'created_at': datetime.utcnow().isoformat()
             }
+            files = normalize_files(entry.get('files'))
+            if files:
+                torrent['files'] = files
+            return torrent
         except Exception as e:
             logger.error(f"Error parsing torrent entry: {e}")
             return None
     
     def create_content_from_torrent(self, torrent: Dict[str, Any]) -> Dict[str, Any]:
-        title = clean_title(torrent.get('title', ''))
-        year = extract_year(torrent.get('title', ''))
-        
-        is_series = any(pattern in torrent.get('title', '').upper() 
-                       for pattern in ['S01', 'S02', 'SEASON', 'EPISODE', 'EP0', 'EP1'])
+        release = parse_release(torrent.get('title', ''))
+        title = release.title
+        year = release.year
+        is_series = release.is_series
         
         return {
             'id': torrent.get('content_id'),
@@ -154,31 +142,277 @@ class TamilContentScraper:
             'updated_at': datetime.utcnow().isoformat()
         }
     
-    async def run_scrape(self) -> Dict[str, int]:
+    def sources(self) -> List["TorrentSource"]:
+        return configured_sources(self.headers, self.timeout)
+    
+    async def run_scrape(self, sources: Optional[List["TorrentSource"]] = None) -> Dict[str, Any]:
         logger.info("Starting content scrape...")
         
-        stats = {
-            'new_content': 0,
-            'new_torrents': 0,
-            'errors': 0
-        }
+        pipeline = IngestPipeline(self, sources if sources is not None else self.sources())
+        stats = await pipeline.run()
         
         logger.info(f"Scrape completed. Stats: {stats}")
         return stats
 
 
-async def run_scheduled_scrape():
-    scraper = TamilContentScraper()
+async def fetch_text(url: str, headers: Dict[str, str], timeout: float) -> Optional[str]:
     try:
-        stats = await scraper.run_scrape()
-        logger.info(f"Scheduled scrape completed: {stats}")
+        async with upstream_guard(url).attempt() as attempt:
+            response = await get_http_client().get(url, headers=headers, timeout=timeout, follow_redirects=True)
+            if response.status_code >= 500:
+                attempt.fail(f"HTTP {response.status_code}")
+        if response.status_code == 200:
+            return response.text
+        logger.warning(f"Failed to fetch {url}: {response.status_code}")
+        return None
     except Exception as e:
-        logger.error(f"Scheduled scrape failed: {e}")
+        logger.error(f"Error fetching {url}: {e}")
+        return None
+
+
+class TorrentSource:
+    """Yields raw torrent entries (title, magnet, size, seeders, ...) from one origin"""
+    
+    name = "source"
+    
+    def entries(self) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class JsonFileSource(TorrentSource):
+    """A JSON array of entries, or one JSON object per line (.jsonl / .ndjson)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.name = f"json:{path}"
+    
+    async def entries(self) -> AsyncIterator[Dict[str, Any]]:
+        if self.path.endswith((".jsonl", ".ndjson")):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            return
+        
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data if isinstance(data, list) else data.get("torrents", []):
+            yield entry
+
+
+TORRENT_NS = "{http://xmlns.ezrss.it/0.1/}"
+
+
+class RssSource(TorrentSource):
+    """Torrent RSS feed: magnet from the link/enclosure, size and seeders from torrent: tags"""
+    
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0):
+        self.url = url
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.name = f"rss:{url}"
+    
+    async def entries(self) -> AsyncIterator[Dict[str, Any]]:
+        text = await fetch_text(self.url, self.headers, self.timeout)
+        if not text:
+            return
+        
+        for item in ET.fromstring(text).iter("item"):
+            enclosure = item.find("enclosure")
+            links = [
+                item.findtext("link") or "",
+                item.findtext(f"{TORRENT_NS}magnetURI") or "",
+                enclosure.get("url", "") if enclosure is not None else ""
+            ]
+            magnet = next((link for link in links if link.startswith("magnet:")), "")
+            length = item.findtext(f"{TORRENT_NS}contentLength") or (enclosure.get("length") if enclosure is not None else None)
+            yield {
+                "title": (item.findtext("title") or "").strip(),
+                "magnet": magnet,
+                "size": f"{int(length) / 1024 ** 2:.0f} MB" if length and length.isdigit() else "0 MB",
+                "seeders": int(item.findtext(f"{TORRENT_NS}seeds") or 0),
+                "leechers": int(item.findtext(f"{TORRENT_NS}peers") or 0),
+                "source": self.url.split("/")[2] if "://" in self.url else self.url
+            }
+
+
+def configured_sources(headers: Optional[Dict[str, str]] = None, timeout: float = 30.0) -> List[TorrentSource]:
+    """Sources from settings.torrent_sources ("json:<path>,rss:<url>"); defaults to data/torrents.json"""
+    sources: List[TorrentSource] = []
+    for spec in filter(None, (part.strip() for part in settings.torrent_sources.split(","))):
+        kind, _, target = spec.partition(":")
+        if kind == "json":
+            sources.append(JsonFileSource(target))
+        elif kind == "rss":
+            sources.append(RssSource(target, headers, timeout))
+        else:
+            logger.warning(f"Unknown torrent source: {spec}")
+    
+    if not sources and not settings.torrent_sources:
+        path = find_data_file("torrents.json")
+        if path:
+            sources.append(JsonFileSource(path))
+    return sources
+
+
+_DONE = object()
+
+
+class IngestPipeline:
+    """sources -> parse/normalize -> dedupe by info_hash -> batched upsert
+    
+    Stages are connected by bounded queues, so a fast source blocks instead
+    of buffering the whole feed, and memory stays flat regardless of how many
+    entries a run reads. Only the info hashes and content ids seen in the run
+    are kept.
+    """
+    
+    def __init__(self, scraper: TamilContentScraper, sources: List[TorrentSource],
+                 batch_size: Optional[int] = None, queue_size: Optional[int] = None):
+        self.scraper = scraper
+        self.sources = sources
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.queue_size = queue_size or settings.ingest_queue_size
+        self.stats: Dict[str, Any] = {
+            "sources": len(sources),
+            "entries_read": 0,
+            "parsed": 0,
+            "invalid": 0,
+            "duplicates": 0,
+            "batches": 0,
+            "new_content": 0,
+            "upserted_torrents": 0,
+            "resolved_ids": 0,
+            "skipped": 0,
+            "errors": 0,
+            "write_s": 0.0
+        }
+    
+    async def _read(self, source: TorrentSource, raw: asyncio.Queue):
+        try:
+            async for entry in source.entries():
+                self.stats["entries_read"] += 1
+                await raw.put(entry)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Torrent source {source.name} failed: {e}")
+    
+    async def _produce(self, raw: asyncio.Queue):
+        try:
+            await asyncio.gather(*(self._read(source, raw) for source in self.sources))
+        finally:
+            await raw.put(_DONE)
+    
+    async def _normalize(self, raw: asyncio.Queue, unique: asyncio.Queue):
+        seen_hashes = set()
+        while True:
+            entry = await raw.get()
+            if entry is _DONE:
+                await unique.put(_DONE)
+                return
+            torrent = self.scraper.parse_torrent_entry(entry)
+            if not torrent:
+                self.stats["invalid"] += 1
+                continue
+            self.stats["parsed"] += 1
+            if torrent["info_hash"] in seen_hashes:
+                self.stats["duplicates"] += 1
+                continue
+            seen_hashes.add(torrent["info_hash"])
+            await unique.put(torrent)
+    
+    def _resolve_ids(self, torrents: List[Dict[str, Any]]) -> int:
+        """Link provisional content ids to real IMDb ids through the offline title index"""
+        index = get_title_index()
+        pending = [t for t in torrents if t["content_id"].startswith(PROVISIONAL_PREFIX)]
+        if not index or not pending:
+            return 0
+        
+        releases = parse_releases(t["title"] for t in pending)
+        imdb_ids = index.resolve_many(
+            # A series' start year rarely matches the year in a season's release name
+            (r.title, None, "series") if r.is_series else (r.title, r.year, "movie") for r in releases
+        )
+        resolved = 0
+        for torrent, imdb_id in zip(pending, imdb_ids):
+            if imdb_id:
+                torrent["content_id"] = imdb_id
+                resolved += 1
+        return resolved
+    
+    def _write_batch(self, torrents: List[Dict[str, Any]], seen_content: set) -> Dict[str, int]:
+        resolved = self._resolve_ids(torrents)
+        contents = []
+        for torrent in torrents:
+            content_id = torrent["content_id"]
+            if content_id in seen_content:
+                continue
+            seen_content.add(content_id)
+            if not get_content_by_id(content_id):
+                contents.append(self.scraper.create_content_from_torrent(torrent))
+        written = upsert_batch(contents, torrents)
+        written["resolved"] = resolved
+        return written
+    
+    async def _write(self, unique: asyncio.Queue):
+        writable = get_backend().writable
+        seen_content = set()
+        batch: List[Dict[str, Any]] = []
+        done = False
+        while not done:
+            torrent = await unique.get()
+            if torrent is _DONE:
+                done = True
+            else:
+                batch.append(torrent)
+            if batch and (done or len(batch) >= self.batch_size):
+                started = time.perf_counter()
+                written = await asyncio.to_thread(self._write_batch, batch, seen_content)
+                self.stats["write_s"] += time.perf_counter() - started
+                self.stats["batches"] += 1
+                self.stats["new_content"] += written["content"]
+                self.stats["upserted_torrents"] += written["torrents"]
+                self.stats["resolved_ids"] += written["resolved"]
+                # A read-only backend keeps nothing; that is not a failed write
+                self.stats["errors" if writable else "skipped"] += len(batch) - written["torrents"]
+                batch = []
+    
+    async def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        raw: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        unique: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        await asyncio.gather(self._produce(raw), self._normalize(raw, unique), self._write(unique))
+        self.stats["write_s"] = round(self.stats["write_s"], 3)
+        self.stats["duration_s"] = round(time.perf_counter() - started, 3)
+        return self.stats
+
+
+last_run_stats: Optional[Dict[str, Any]] = None
+
+
+async def ingest_job(job) -> Dict[str, Any]:
+    """Background job body: run the torrent ingestion pipeline and keep its stats"""
+    global last_run_stats
+    scraper = TamilContentScraper()
+    pipeline = IngestPipeline(scraper, scraper.sources())
+    job.progress_source = lambda: dict(pipeline.stats)
+    stats = await pipeline.run()
+    stats["finished_at"] = datetime.utcnow().isoformat()
+    last_run_stats = stats
+    logger.info(f"Torrent ingestion completed: {stats}")
+    return stats
+
+
+async def run_scheduled_scrape():
+    from api.jobs import jobs
+    
+    job, created = jobs.submit("torrent_ingest", ingest_job)
+    if not created:
+        logger.info(f"Torrent ingestion already running as job {job.id}, skipping")
 
 
 def setup_scheduler():
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
-    from api.config import settings
     
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
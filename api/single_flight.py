@@ -0,0 +1,69 @@
+"""
+Single-flight coalescing of identical in-flight requests
+
+Stremio clients repeat the same /stream or /meta request (retries, prefetch,
+several devices on one account). The first request for a key runs the
+computation; duplicates that arrive while it is still running await the
+same task and share its result instead of repeating every upstream call.
+Nothing is cached once the computation finishes.
+
+The computation runs as its own task, so a leader whose client disconnects
+does not cancel the work the other callers are waiting on.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"requests": 0, "computed": 0, "joins": 0, "errors": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func() once per key at a time; concurrent callers get the same result"""
+        self.stats["requests"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats["computed"] += 1
+            task = asyncio.get_running_loop().create_task(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finished(k, t))
+        else:
+            self.stats["joins"] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+            logger.debug(f"{self.name} computation failed: {task.exception()}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        return {
+            "name": self.name,
+            "in_flight": len(self._in_flight),
+            **self.stats,
+            "join_ratio": round(self.stats["joins"] / requests, 3) if requests else 0.0
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    """Process-wide coalescing group for a route"""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def single_flight_status() -> Dict[str, Any]:
+    return {"groups": [group.as_dict() for group in _groups.values()]}
@@ -0,0 +1,846 @@
+"""
+Storage backends for TamilStream content
+
+Every backend exposes the same read interface (catalog, meta, torrents,
+episodes, search). The active one is chosen by `settings.storage_backend`:
+
+    memory    scraped catalog snapshot, or sample data when none is present
+    sqlite    prebuilt read-only SQLite file with indexes and FTS5 search
+    postgres  SQLAlchemy database from DATABASE_URL (read/write)
+    auto      postgres if reachable, else sqlite if the file exists, else memory
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+from api.config import settings
+from api.catalog_data import get_catalog, has_content, iter_content, find_data_file
+from api.catalog_snapshot import CONTENT_LISTS
+from api.record_store import RecordStore, RECORD_STORE_DIRNAME
+from api.sample_data import SAMPLE_TAMIL_MOVIES, SAMPLE_TAMIL_SERIES, SAMPLE_TORRENTS
+
+logger = logging.getLogger(__name__)
+
+SQLITE_CATALOG_FILENAME = "catalog.sqlite3"
+
+# File lists learned at runtime by backends that cannot store them
+_learned_files: Dict[str, List[Dict[str, Any]]] = {}
+
+
+def iter_catalog_content(content_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream the content served without a database: the scraped catalog, else the samples"""
+    catalog = get_catalog()
+    if has_content(catalog):
+        return iter_content(catalog, content_type)
+    return (c for c in SAMPLE_TAMIL_MOVIES + SAMPLE_TAMIL_SERIES if not content_type or c.get("type") == content_type)
+
+
+class StorageBackend:
+    """Read interface shared by all backends; writes are unsupported by default"""
+
+    name = "base"
+    writable = False
+
+    def warmup(self) -> Dict[str, Any]:
+        return {}
+
+    def data_version(self) -> Any:
+        """Changes whenever the data is replaced outside the write methods"""
+        return None
+
+    def get_all_content(self, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_content_by_id(self, content_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_torrents_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_episodes_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_episode(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        for episode in self.get_episodes_for_content(episode_id.split(":", 1)[0]):
+            if episode.get("id") == episode_id:
+                return episode
+        return None
+
+    def search_content(self, query: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_content_count(self) -> int:
+        return len(self.get_all_content())
+
+    def get_torrent_files(self, info_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """Stored file list of a torrent, or None if it was never seen"""
+        return _learned_files.get(info_hash.lower())
+
+    def set_torrent_files(self, info_hash: str, files: List[Dict[str, Any]]) -> bool:
+        """Store a torrent's file list; read-only backends keep it for the process lifetime"""
+        _learned_files[info_hash.lower()] = files
+        return True
+
+    def update_content_poster(self, content_id: str, poster_url: str) -> bool:
+        return False
+
+    def add_content(self, content_data: Dict[str, Any]) -> bool:
+        return False
+
+    def add_torrent(self, torrent_data: Dict[str, Any]) -> bool:
+        return False
+
+    def add_episode(self, episode_data: Dict[str, Any]) -> bool:
+        return False
+
+    def upsert_batch(self, contents: List[Dict[str, Any]], torrents: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Write a batch of content and torrents; returns how many of each were stored"""
+        return {
+            "content": sum(1 for c in contents if self.add_content(c)),
+            "torrents": sum(1 for t in torrents if self.add_torrent(t))
+        }
+
+
+class MemoryBackend(StorageBackend):
+    """Scraped catalog (memory-mapped snapshot or JSON) plus sample torrents"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._sample_index: Dict[str, Dict[str, Any]] = {}
+        for c in SAMPLE_TAMIL_MOVIES + SAMPLE_TAMIL_SERIES:
+            if c.get("imdb_id"):
+                self._sample_index.setdefault(c["imdb_id"], c)
+            self._sample_index[c["id"]] = c
+
+        self._torrent_index: Dict[str, List[Dict[str, Any]]] = {}
+        for t in SAMPLE_TORRENTS:
+            self._torrent_index.setdefault(t["content_id"], []).append(t)
+
+    def warmup(self) -> Dict[str, Any]:
+        catalog = get_catalog()
+        return {"catalog_version": getattr(catalog, "version", None)}
+
+    def data_version(self) -> Any:
+        return getattr(get_catalog(), "version", None)
+
+    def get_all_content(self, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        return list(iter_catalog_content(content_type))
+
+    def get_content_by_id(self, content_id: str) -> Optional[Dict[str, Any]]:
+        catalog = get_catalog()
+        if has_content(catalog):
+            return catalog.get(content_id)
+        return self._sample_index.get(content_id)
+
+    def get_torrents_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        return list(self._torrent_index.get(content_id, []))
+
+    def get_episodes_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        content = self.get_content_by_id(content_id)
+        return list(content.get("episodes") or []) if content else []
+
+    def search_content(self, query: str) -> List[Dict[str, Any]]:
+        query_lower = query.lower()
+        return [c for c in iter_catalog_content() if query_lower in c.get("title", "").lower()]
+
+    def get_content_count(self) -> int:
+        return sum(1 for _ in iter_catalog_content())
+
+
+class SQLiteBackend(StorageBackend):
+    """Prebuilt read-only SQLite catalog, reopened when the file is replaced"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, check_interval: Optional[float] = None):
+        self.path = path
+        self.check_interval = settings.catalog_reload_interval if check_interval is None else check_interval
+        self._local = threading.local()
+        self._checked_at = float("-inf")
+        self._key: Optional[Tuple] = None
+
+    def _file_key(self) -> Optional[Tuple]:
+        """Identity of the file, re-read at most once per check_interval like the catalog watcher"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            try:
+                st = os.stat(self.path)
+                self._key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError as e:
+                # Open connections keep reading the file they mapped
+                logger.warning(f"SQLite catalog {self.path} unavailable: {e}")
+        return self._key
+
+    def _conn(self) -> sqlite3.Connection:
+        file_key = self._file_key()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.file_key != file_key:
+            if file_key is None:
+                if conn is not None:
+                    return conn
+                raise sqlite3.OperationalError(f"SQLite catalog {self.path} is missing")
+            if conn is not None:
+                conn.close()
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True)
+            self._local.conn = conn
+            self._local.file_key = file_key
+            self._local.has_fts = bool(conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'content_fts'"
+            ).fetchone())
+        return conn
+
+    def warmup(self) -> Dict[str, Any]:
+        return {"sqlite_path": self.path, "content_count": self.get_content_count()}
+
+    def data_version(self) -> Any:
+        return self._file_key()
+
+    def get_all_content(self, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        if content_type:
+            rows = self._conn().execute(
+                "SELECT data FROM content WHERE type = ? ORDER BY position", (content_type,)
+            )
+        else:
+            rows = self._conn().execute("SELECT data FROM content ORDER BY position")
+        return [json.loads(data) for (data,) in rows]
+
+    def get_content_by_id(self, content_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT data FROM content WHERE id = ? UNION ALL "
+            "SELECT data FROM content WHERE imdb_id = ? LIMIT 1",
+            (content_id, content_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_torrents_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT data FROM torrents WHERE content_id = ? ORDER BY quality", (content_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def get_episodes_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT data FROM episodes WHERE content_id = ? ORDER BY episode_date, episode",
+            (content_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def get_episode(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT data FROM episodes WHERE id = ?", (episode_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search_content(self, query: str) -> List[Dict[str, Any]]:
+        conn = self._conn()
+        tokens = [t for t in query.replace('"', " ").split() if t]
+        if not tokens:
+            return []
+        if self._local.has_fts:
+            match = " ".join(f'"{t}"*' for t in tokens)
+            rows = conn.execute(
+                "SELECT c.data FROM content_fts f JOIN content c ON c.rowid = f.rowid "
+                "WHERE content_fts MATCH ? ORDER BY rank",
+                (match,)
+            )
+        else:
+            rows = conn.execute(
+                "SELECT data FROM content WHERE lower(title) LIKE ? ORDER BY position",
+                (f"%{query.lower()}%",)
+            )
+        return [json.loads(data) for (data,) in rows]
+
+    def get_content_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM content").fetchone()[0]
+
+
+def build_sqlite_catalog(path: str, content: Optional[Iterable[Dict[str, Any]]] = None,
+                         torrents: Optional[Iterable[Dict[str, Any]]] = None,
+                         store_seq: Optional[int] = None) -> int:
+    """Build the read-only SQLite catalog file, atomically replacing `path`
+
+    store_seq records the record store change the content was read at, so the
+    file shipped next to the store can be checked against it.
+    """
+    content = iter_catalog_content() if content is None else content
+    torrents = SAMPLE_TORRENTS if torrents is None else torrents
+
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE content (
+                id TEXT PRIMARY KEY, imdb_id TEXT, title TEXT NOT NULL,
+                type TEXT, position INTEGER, data TEXT NOT NULL
+            );
+            CREATE INDEX ix_content_imdb_id ON content (imdb_id);
+            CREATE INDEX ix_content_type_position ON content (type, position);
+            CREATE TABLE torrents (
+                id TEXT PRIMARY KEY, content_id TEXT NOT NULL, info_hash TEXT,
+                quality TEXT, data TEXT NOT NULL
+            );
+            CREATE INDEX ix_torrents_content_id_quality ON torrents (content_id, quality);
+            CREATE TABLE episodes (
+                id TEXT PRIMARY KEY, content_id TEXT NOT NULL, episode_date TEXT,
+                episode INTEGER, data TEXT NOT NULL
+            );
+            CREATE INDEX ix_episodes_content_id_episode_date ON episodes (content_id, episode_date);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        conn.execute("INSERT INTO meta VALUES ('store_seq', ?)", (store_seq,))
+
+        count = 0
+        for position, item in enumerate(content):
+            count = position + 1
+            record = {k: v for k, v in item.items() if k != "episodes"}
+            conn.execute(
+                "INSERT OR REPLACE INTO content VALUES (?, ?, ?, ?, ?, ?)",
+                (item["id"], item.get("imdb_id"), item.get("title", ""), item.get("type"),
+                 position, json.dumps(record, ensure_ascii=False))
+            )
+            for episode in item.get("episodes") or []:
+                conn.execute(
+                    "INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?)",
+                    (episode["id"], episode["content_id"], episode.get("episode_date"),
+                     episode.get("episode"), json.dumps(episode, ensure_ascii=False))
+                )
+
+        for t in torrents:
+            conn.execute(
+                "INSERT OR REPLACE INTO torrents VALUES (?, ?, ?, ?, ?)",
+                (t["id"], t["content_id"], t.get("info_hash"), t.get("quality"),
+                 json.dumps(t, ensure_ascii=False))
+            )
+
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE content_fts USING fts5(title, content='content', content_rowid='rowid');
+                INSERT INTO content_fts (rowid, title) SELECT rowid, title FROM content;
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, SQLite catalog will use LIKE search: {e}")
+
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    logger.info(f"Built SQLite catalog with {count} titles at {path}")
+    return count
+
+
+class PostgresBackend(StorageBackend):
+    """SQLAlchemy database from DATABASE_URL, seeded with sample data when empty"""
+
+    name = "postgres"
+    writable = True
+
+    def __init__(self):
+        from sqlalchemy import func
+        from api import db as db_module
+
+        self._db = db_module
+        self._func = func
+        self._seeded = False
+
+    def _session(self):
+        return self._db.get_db()
+
+    def _content_to_dict(self, content) -> Dict[str, Any]:
+        return {
+            "id": content.id,
+            "imdb_id": content.imdb_id,
+            "title": content.title,
+            "type": content.type,
+            "poster": content.poster,
+            "background": content.background,
+            "description": content.description,
+            "year": content.year,
+            "rating": content.rating,
+            "genres": content.genres or [],
+            "runtime": content.runtime,
+            "channel": content.channel,
+            "source_url": content.source_url,
+            "videos": content.videos or []
+        }
+
+    def _torrent_to_dict(self, torrent) -> Dict[str, Any]:
+        return {
+            "id": torrent.id,
+            "content_id": torrent.content_id,
+            "info_hash": torrent.info_hash,
+            "title": torrent.title,
+            "size": torrent.size,
+            "size_readable": torrent.size_readable,
+            "quality": torrent.quality,
+            "seeders": torrent.seeders,
+            "leechers": torrent.leechers,
+            "source": torrent.source,
+            "magnet": torrent.magnet,
+            "files": torrent.files
+        }
+
+    def _episode_to_dict(self, episode) -> Dict[str, Any]:
+        return {
+            "id": episode.id,
+            "content_id": episode.content_id,
+            "title": episode.title,
+            "season": episode.season,
+            "episode": episode.episode,
+            "episode_date": episode.episode_date,
+            "source_url": episode.source_url,
+            "poster": episode.poster
+        }
+
+    def _seed_sample_data(self):
+        """Initialize database with sample data if empty"""
+        if self._seeded:
+            return
+        db = self._session()
+        if not db:
+            return
+
+        Content, Torrent = self._db.Content, self._db.Torrent
+        try:
+            if db.query(Content).count() == 0:
+                for item in SAMPLE_TAMIL_MOVIES + SAMPLE_TAMIL_SERIES:
+                    db.merge(Content(
+                        id=item["id"],
+                        imdb_id=item.get("imdb_id"),
+                        title=item["title"],
+                        type=item.get("type", "movie"),
+                        description=item.get("description"),
+                        year=item.get("year"),
+                        rating=str(item.get("rating")) if item.get("rating") else None,
+                        genres=item.get("genres", []),
+                        runtime=item.get("runtime"),
+                        videos=item.get("videos", [])
+                    ))
+                db.commit()
+                logger.info("Initialized database with sample content")
+
+            if db.query(Torrent).count() == 0:
+                for t in SAMPLE_TORRENTS:
+                    db.merge(self._torrent_model(t))
+                db.commit()
+                logger.info("Initialized database with sample torrents")
+        except Exception as e:
+            logger.error(f"Error initializing sample data: {e}")
+            db.rollback()
+        finally:
+            self._seeded = True
+            db.close()
+
+    def warmup(self) -> Dict[str, Any]:
+        self._seed_sample_data()
+        warmed = self._db.warm_pool(settings.db_warm_connections)
+        return {"warm_connections": warmed}
+
+    def get_all_content(self, content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        db = self._session()
+        if not db:
+            return []
+        Content = self._db.Content
+        try:
+            query = db.query(Content)
+            if content_type:
+                query = query.filter(Content.type == content_type)
+            results = query.order_by(Content.updated_at.desc()).all()
+            return [self._content_to_dict(c) for c in results]
+        except Exception as e:
+            logger.error(f"Error getting content: {e}")
+            return []
+        finally:
+            db.close()
+
+    def get_content_by_id(self, content_id: str) -> Optional[Dict[str, Any]]:
+        db = self._session()
+        if not db:
+            return None
+        Content = self._db.Content
+        try:
+            content = db.query(Content).filter(
+                (Content.id == content_id) | (Content.imdb_id == content_id)
+            ).first()
+            return self._content_to_dict(content) if content else None
+        except Exception as e:
+            logger.error(f"Error getting content by id: {e}")
+            return None
+        finally:
+            db.close()
+
+    def get_torrents_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        content = self.get_content_by_id(content_id)
+        if not content:
+            return []
+        db = self._session()
+        if not db:
+            return []
+        Torrent = self._db.Torrent
+        try:
+            content_ids = {cid for cid in (content_id, content.get("imdb_id"), content.get("id")) if cid}
+            torrents = db.query(Torrent).filter(
+                Torrent.content_id.in_(content_ids)
+            ).order_by(Torrent.content_id, Torrent.quality).all()
+            return [self._torrent_to_dict(t) for t in torrents]
+        except Exception as e:
+            logger.error(f"Error getting torrents: {e}")
+            return []
+        finally:
+            db.close()
+
+    def get_episodes_for_content(self, content_id: str) -> List[Dict[str, Any]]:
+        db = self._session()
+        if not db:
+            return []
+        Episode = self._db.Episode
+        try:
+            episodes = db.query(Episode).filter(
+                Episode.content_id == content_id
+            ).order_by(Episode.episode_date, Episode.episode).all()
+            return [self._episode_to_dict(e) for e in episodes]
+        except Exception as e:
+            logger.error(f"Error getting episodes: {e}")
+            return []
+        finally:
+            db.close()
+
+    def get_episode(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        db = self._session()
+        if not db:
+            return None
+        Episode = self._db.Episode
+        try:
+            episode = db.query(Episode).filter(Episode.id == episode_id).first()
+            return self._episode_to_dict(episode) if episode else None
+        except Exception as e:
+            logger.error(f"Error getting episode: {e}")
+            return None
+        finally:
+            db.close()
+
+    def search_content(self, query: str) -> List[Dict[str, Any]]:
+        db = self._session()
+        if not db:
+            return []
+        Content = self._db.Content
+        try:
+            results = db.query(Content).filter(
+                self._func.lower(Content.title).like(f"%{query.lower()}%")
+            ).all()
+            return [self._content_to_dict(c) for c in results]
+        except Exception as e:
+            logger.error(f"Error searching content: {e}")
+            return []
+        finally:
+            db.close()
+
+    def get_content_count(self) -> int:
+        db = self._session()
+        if not db:
+            return 0
+        try:
+            return db.query(self._db.Content).count()
+        except Exception as e:
+            logger.error(f"Error counting content: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def update_content_poster(self, content_id: str, poster_url: str) -> bool:
+        db = self._session()
+        if not db:
+            return False
+        Content = self._db.Content
+        try:
+            content = db.query(Content).filter(
+                (Content.id == content_id) | (Content.imdb_id == content_id)
+            ).first()
+            if content:
+                content.poster = poster_url
+                content.updated_at = datetime.utcnow()
+                db.commit()
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"Error updating poster: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def get_torrent_files(self, info_hash: str) -> Optional[List[Dict[str, Any]]]:
+        db = self._session()
+        if not db:
+            return None
+        Torrent = self._db.Torrent
+        try:
+            row = db.query(Torrent.files).filter(Torrent.info_hash == info_hash.lower()).first()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error getting torrent files: {e}")
+            return None
+        finally:
+            db.close()
+
+    def set_torrent_files(self, info_hash: str, files: List[Dict[str, Any]]) -> bool:
+        db = self._session()
+        if not db:
+            return False
+        Torrent = self._db.Torrent
+        try:
+            updated = db.query(Torrent).filter(Torrent.info_hash == info_hash.lower()).update(
+                {Torrent.files: files}, synchronize_session=False
+            )
+            db.commit()
+            return bool(updated)
+        except Exception as e:
+            logger.error(f"Error storing torrent files: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def _torrent_model(self, torrent_data: Dict[str, Any]):
+        torrent = self._db.Torrent(
+            id=torrent_data.get("id"),
+            content_id=torrent_data.get("content_id"),
+            info_hash=torrent_data.get("info_hash"),
+            title=torrent_data.get("title"),
+            size=torrent_data.get("size", 0),
+            size_readable=torrent_data.get("size_readable"),
+            quality=torrent_data.get("quality"),
+            seeders=torrent_data.get("seeders", 0),
+            leechers=torrent_data.get("leechers", 0),
+            source=torrent_data.get("source"),
+            magnet=torrent_data.get("magnet")
+        )
+        # Left unset, merge keeps a file list stored by an earlier lookup
+        if torrent_data.get("files"):
+            torrent.files = torrent_data["files"]
+        return torrent
+
+    def _content_model(self, content_data: Dict[str, Any]):
+        return self._db.Content(
+            id=content_data.get("id"),
+            imdb_id=content_data.get("imdb_id"),
+            title=content_data.get("title"),
+            type=content_data.get("type", "series"),
+            poster=content_data.get("poster"),
+            background=content_data.get("background"),
+            description=content_data.get("description"),
+            year=content_data.get("year"),
+            rating=str(content_data.get("rating")) if content_data.get("rating") else None,
+            genres=content_data.get("genres", []),
+            runtime=content_data.get("runtime"),
+            channel=content_data.get("channel"),
+            source_url=content_data.get("source_url"),
+            videos=content_data.get("videos", [])
+        )
+
+    def add_content(self, content_data: Dict[str, Any]) -> bool:
+        db = self._session()
+        if not db:
+            return False
+        try:
+            db.merge(self._content_model(content_data))
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding content: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def add_torrent(self, torrent_data: Dict[str, Any]) -> bool:
+        db = self._session()
+        if not db:
+            return False
+        try:
+            db.merge(self._torrent_model(torrent_data))
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding torrent: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def add_episode(self, episode_data: Dict[str, Any]) -> bool:
+        db = self._session()
+        if not db:
+            return False
+        try:
+            db.merge(self._db.Episode(
+                id=episode_data.get("id"),
+                content_id=episode_data.get("content_id"),
+                title=episode_data.get("title"),
+                season=episode_data.get("season", 1),
+                episode=episode_data.get("episode"),
+                episode_date=episode_data.get("episode_date"),
+                source_url=episode_data.get("source_url"),
+                poster=episode_data.get("poster"),
+                video_sources=episode_data.get("video_sources", [])
+            ))
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding episode: {e}")
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def upsert_batch(self, contents: List[Dict[str, Any]], torrents: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Merge a whole batch in one transaction"""
+        db = self._session()
+        if not db:
+            return {"content": 0, "torrents": 0}
+        try:
+            for content_data in contents:
+                db.merge(self._content_model(content_data))
+            for torrent_data in torrents:
+                db.merge(self._torrent_model(torrent_data))
+            db.commit()
+            return {"content": len(contents), "torrents": len(torrents)}
+        except Exception as e:
+            logger.error(f"Error upserting batch: {e}")
+            db.rollback()
+            return {"content": 0, "torrents": 0}
+        finally:
+            db.close()
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+# Set while a configured database was down at selection and another backend stands in
+_postgres_pending = False
+
+
+def _postgres_available() -> bool:
+    try:
+        from api.db import init_db
+    except ImportError:
+        return False
+    return bool(init_db())
+
+
+def _postgres_configured() -> bool:
+    try:
+        from api.db import database_configured
+    except ImportError:
+        return False
+    return database_configured()
+
+
+def sqlite_catalog_seq(path: str) -> Optional[int]:
+    """Record store change a SQLite catalog was built at, or None if unknown"""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'store_seq'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def _sqlite_path() -> Optional[str]:
+    if settings.sqlite_catalog_path:
+        return settings.sqlite_catalog_path if os.path.exists(settings.sqlite_catalog_path) else None
+    path = find_data_file(SQLITE_CATALOG_FILENAME)
+    if not path:
+        return None
+    # The default file ships with the record store; one built at an older
+    # store change would serve an outdated catalog
+    store_dir = find_data_file(RECORD_STORE_DIRNAME)
+    if store_dir:
+        seq, store_seq = sqlite_catalog_seq(path), RecordStore(store_dir).current_seq()
+        if seq != store_seq:
+            logger.warning(f"Ignoring {path}: built at store change {seq}, the store is at {store_seq}; "
+                           f"rebuild it with python -m api.storage_backends")
+            return None
+    return path
+
+
+def create_backend(kind: str) -> StorageBackend:
+    """Instantiate a backend by name, falling back to memory when unavailable"""
+    if kind in ("postgres", "auto") and _postgres_available():
+        return PostgresBackend()
+    if kind == "postgres":
+        logger.warning("Postgres backend requested but database is unavailable, using memory")
+
+    if kind in ("sqlite", "auto"):
+        path = _sqlite_path()
+        if path:
+            return SQLiteBackend(path)
+        if kind == "sqlite":
+            logger.warning("SQLite backend requested but no catalog file found, using memory")
+
+    return MemoryBackend()
+
+
+def get_backend() -> StorageBackend:
+    """Active storage backend, selected once per process from settings
+
+    If Postgres was wanted but down at selection, each call past the
+    database retry backoff (see api.db.init_db) tries it again and switches
+    over once it connects.
+    """
+    global _backend, _postgres_pending
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(settings.storage_backend)
+                _postgres_pending = (settings.storage_backend in ("postgres", "auto")
+                                     and _backend.name != "postgres" and _postgres_configured())
+                logger.info(f"Using {_backend.name} storage backend")
+    elif _postgres_pending and _backend_lock.acquire(blocking=False):
+        # One caller retries; the others keep using the stand-in meanwhile
+        try:
+            if _postgres_pending and _postgres_available():
+                backend = PostgresBackend()
+                try:
+                    backend.warmup()
+                except Exception as e:
+                    logger.warning(f"Postgres warmup failed: {e}")
+                _backend = backend
+                _postgres_pending = False
+                logger.info("Database is available again, using postgres storage backend")
+        finally:
+            _backend_lock.release()
+    return _backend
+
+
+def build_store_sqlite_catalog(store: RecordStore, path: str) -> int:
+    """Build the SQLite catalog from a record store, streaming its movies and series"""
+    catalog = store.open_catalog()
+    try:
+        content = itertools.chain.from_iterable(catalog.iter_list(name) for name in CONTENT_LISTS)
+        return build_sqlite_catalog(path, content, store_seq=catalog.seq)
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+    store = RecordStore(os.path.join(data_dir, RECORD_STORE_DIRNAME))
+    if store.exists():
+        build_store_sqlite_catalog(store, os.path.join(data_dir, SQLITE_CATALOG_FILENAME))
+    else:
+        build_sqlite_catalog(os.path.join(data_dir, SQLITE_CATALOG_FILENAME))
@@ -6,32 +6,44 @@ import json
 import logging
 from api.config import settings
 from api.models import UserConfig
-try:
-    from api.content_store import (
-        get_all_content, get_content_by_id, get_torrents_for_content,
-        search_content, initialize_sample_data, update_content_poster
-    )
-except ImportError:
-    from api.content_store_fallback import (
-        get_all_content, get_content_by_id, get_torrents_for_content,
-        search_content, initialize_sample_data, update_content_poster
-    )
+from api.content_store import (
+    get_all_content, get_content_by_id, get_torrents_for_content,
+    get_episodes_for_content, get_episode, search_content, update_content_poster,
+    get_torrent_files, set_torrent_files, content_generation, data_version
+)
+from api.torrent_files import normalize_files, select_file, largest_video
 
 from api.torbox_service import create_torbox_service
+from api.single_flight import single_flight
+from api.prefetch import prefetcher
+from api.swr_cache import SwrCache
+from api.latest_index import latest_index
 
 try:
-    from api.metadata_service import get_poster_for_imdb_sync
+    from api.metadata_service import get_poster_for_imdb
 except ImportError:
-    get_poster_for_imdb_sync = lambda x: None
+    async def get_poster_for_imdb(imdb_id):
+        return None
 
 try:
-    from api.tamildhool_scraper import scrape_episode_details
+    from api.tamildhool_scraper import get_episode_details
 except ImportError:
-    scrape_episode_details = lambda x: None
+    async def get_episode_details(episode_url):
+        return None
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+LATEST_CATALOG_ID = "tamilstream_latest"
+
+meta_flights = single_flight("meta")
+stream_flights = single_flight("stream")
+
+# Shared part of every /stream response per video id; users only add their TorBox overlay
+stream_skeletons = SwrCache("stream_skeletons", ttl=settings.stream_skeleton_ttl, max_entries=4096)
+# File lists learned from TorBox, by info hash; merged into user overlays, never into skeletons
+learned_files = SwrCache("learned_files", ttl=settings.stream_skeleton_ttl, max_entries=4096)
+
 
 def decode_user_config(config_str: Optional[str]) -> UserConfig:
     if not config_str:
@@ -53,6 +65,19 @@ def encode_user_config(config: UserConfig) -> str:
     return base64.urlsafe_b64encode(config_json.encode()).decode().rstrip('=')
 
 
+def episode_to_video(episode: dict) -> dict:
+    video = {
+        "id": episode.get("id"),
+        "title": episode.get("title"),
+        "season": episode.get("season") or 1,
+        "episode": episode.get("episode"),
+        "thumbnail": episode.get("poster") or None
+    }
+    if episode.get("episode_date"):
+        video["released"] = f"{episode['episode_date']}T00:00:00.000Z"
+    return video
+
+
 def get_manifest(config: Optional[str] = None) -> dict:
     return {
         "id": "com.tamilstream.addon",
@@ -81,9 +106,19 @@ def get_manifest(config: Optional[str] = None) -> dict:
                     {"name": "search", "isRequired": False},
                     {"name": "skip", "isRequired": False}
                 ]
+            },
+            {
+                "id": LATEST_CATALOG_ID,
+                "type": "series",
+                "name": "Latest Tamil TV Episodes",
+                "extra": [
+                    # Stremio's genre filter, offered per channel
+                    {"name": "genre", "options": latest_index.channels(), "isRequired": False},
+                    {"name": "skip", "isRequired": False}
+                ]
             }
         ],
-        "idPrefixes": ["tt"],
+        "idPrefixes": ["tt", "td_", "ts_"],
         "behaviorHints": {
             "configurable": True,
             "configurationRequired": False
@@ -108,17 +143,25 @@ async def manifest_with_config(config: str):
 
 
 @router.get("/catalog/{type}/{id}.json")
-async def catalog_root(type: str, id: str, skip: int = 0, search: Optional[str] = None):
-    return await handle_catalog(type, id, None, skip, search)
+async def catalog_root(type: str, id: str, skip: int = 0, search: Optional[str] = None,
+                       genre: Optional[str] = None):
+    return await handle_catalog(type, id, None, skip, search, genre)
 
 
 @router.get("/{config}/catalog/{type}/{id}.json")
-async def catalog_with_config(config: str, type: str, id: str, skip: int = 0, search: Optional[str] = None):
-    return await handle_catalog(type, id, config, skip, search)
+async def catalog_with_config(config: str, type: str, id: str, skip: int = 0, search: Optional[str] = None,
+                              genre: Optional[str] = None):
+    return await handle_catalog(type, id, config, skip, search, genre)
 
 
-async def handle_catalog(type: str, id: str, config: Optional[str], skip: int, search: Optional[str]):
-    initialize_sample_data()
+async def handle_catalog(type: str, id: str, config: Optional[str], skip: int, search: Optional[str],
+                         genre: Optional[str] = None):
+    if id == LATEST_CATALOG_ID:
+        metas, _ = latest_index.page(channel=genre, skip=skip, limit=100)
+        return JSONResponse(
+            content={"metas": metas},
+            headers={"Access-Control-Allow-Origin": "*"}
+        )
     
     if search:
         content_list = search_content(search)
@@ -134,7 +177,7 @@ async def handle_catalog(type: str, id: str, config: Optional[str], skip: int, s
         poster = content.get("poster")
         
         if not poster and imdb_id and imdb_id.startswith("tt"):
-            poster = get_poster_for_imdb_sync(imdb_id)
+            poster = await get_poster_for_imdb(imdb_id)
             if poster:
                 update_content_poster(imdb_id, poster)
         
@@ -169,22 +212,26 @@ async def meta_with_config(config: str, type: str, id: str):
 
 
 async def handle_meta(type: str, id: str, config: Optional[str]):
-    initialize_sample_data()
-    
     content_id = id.replace(".json", "")
+    # Meta does not depend on the user config, so all users share one flight
+    meta_data = await meta_flights.do((type, content_id), lambda: build_meta(content_id))
+    return JSONResponse(
+        content={"meta": meta_data},
+        headers={"Access-Control-Allow-Origin": "*"}
+    )
+
+
+async def build_meta(content_id: str) -> Optional[dict]:
     content = get_content_by_id(content_id)
     
     if not content:
-        return JSONResponse(
-            content={"meta": None},
-            headers={"Access-Control-Allow-Origin": "*"}
-        )
+        return None
     
     imdb_id = content.get("imdb_id") or content.get("id")
     poster = content.get("poster")
     
     if not poster and imdb_id and imdb_id.startswith("tt"):
-        poster = get_poster_for_imdb_sync(imdb_id)
+        poster = await get_poster_for_imdb(imdb_id)
         if poster:
             update_content_poster(imdb_id, poster)
     
@@ -201,13 +248,14 @@ async def handle_meta(type: str, id: str, config: Optional[str]):
         "runtime": content.get("runtime")
     }
     
-    if content.get("type") == "series" and content.get("videos"):
-        meta_data["videos"] = content.get("videos", [])
+    if content.get("type") == "series":
+        videos = content.get("videos") or [
+            episode_to_video(e) for e in get_episodes_for_content(content.get("id"))
+        ]
+        if videos:
+            meta_data["videos"] = videos
     
-    return JSONResponse(
-        content={"meta": meta_data},
-        headers={"Access-Control-Allow-Origin": "*"}
-    )
+    return meta_data
 
 
 @router.get("/stream/{type}/{id}.json")
@@ -221,14 +269,148 @@ async def stream_with_config(config: str, type: str, id: str):
 
 
 async def handle_stream(type: str, id: str, config: Optional[str]):
-    initialize_sample_data()
-    user_config = decode_user_config(config)
-    
     raw_id = id.replace(".json", "")
-    
+    user_config = decode_user_config(config)
+    show_id = raw_id.split(":", 1)[0]
+    next_id = next_episode_id(raw_id) if config else None
+    found, streams = False, None
+    if config:
+        # A repeated request for this episode leaves the running prefetch of the next one alone
+        found, streams = await prefetcher.take(config, (config, type, raw_id), show_id,
+                                               keep=(config, type, next_id))
+    if not found:
+        streams = await stream_flights.do(
+            (config, type, raw_id),
+            lambda: build_streams(raw_id, user_config)
+        )
+    if next_id:
+        prefetch_next_episode(type, next_id, config, user_config)
+    return JSONResponse(
+        content={"streams": streams},
+        headers={"Access-Control-Allow-Origin": "*"}
+    )
+
+
+def next_episode_id(raw_id: str) -> Optional[str]:
+    """Video id Stremio will ask for after raw_id, if it is an episode"""
+    parts = raw_id.split(":")
+    if len(parts) >= 3:
+        try:
+            return f"{parts[0]}:{int(parts[1])}:{int(parts[2]) + 1}"
+        except ValueError:
+            return None
+    if len(parts) == 2:
+        # TamilDhool episodes are ordered by air date, oldest first
+        episode_ids = [e.get("id") for e in get_episodes_for_content(parts[0])]
+        if raw_id in episode_ids:
+            index = episode_ids.index(raw_id)
+            if index + 1 < len(episode_ids):
+                return episode_ids[index + 1]
+    return None
+
+
+def prefetch_next_episode(type: str, next_id: str, config: Optional[str], user_config: UserConfig):
+    """Build next_id's streams in the background under the key handle_stream will ask for"""
+    if not config:
+        return
+    key = (config, type, next_id)
+    resolve_links = settings.prefetch_resolve_links and bool(user_config.torbox_api_key)
+    # Without PREFETCH_RESOLVE_LINKS a TorBox user's prefetch only warms caches and never adds
+    # torrents on a guess; its link-less result must not be joined by the real request
+    shared = resolve_links or not user_config.torbox_api_key
+    flight_key = key if shared else key + ("warm",)
+    prefetcher.schedule(
+        config,
+        key,
+        next_id.split(":", 1)[0],
+        lambda: stream_flights.do(
+            flight_key,
+            lambda: build_streams(next_id, user_config, resolve_links=resolve_links)
+        ),
+        keep_result=shared
+    )
+
+
+def known_files(torrent: dict) -> Optional[List[dict]]:
+    return (torrent.get("files") or learned_files.peek(torrent["info_hash"].lower())
+            or get_torrent_files(torrent["info_hash"]))
+
+
+def learn_files(torrent: dict, torbox_files: Optional[list]) -> Optional[List[dict]]:
+    """Remember the file list from a TorBox lookup so later requests skip it
+
+    The shared torrent dict is left alone and no content generation is
+    bumped, so cached skeletons stay valid.
+    """
+    files = normalize_files(torbox_files)
+    if files:
+        learned_files.set(torrent["info_hash"].lower(), files)
+        set_torrent_files(torrent["info_hash"], files)
+    return files
+
+
+async def resolve_torbox_link(torbox_service, torrent: dict, episode_info: Optional[dict],
+                              resolve_links: bool = True):
+    """(is_cached, download_url) for a torrent through the user's TorBox account
+
+    A torrent already in the user's library is used as listed there, which
+    skips adding it. The file list is fetched from TorBox only when none is
+    stored yet. With resolve_links False nothing is added and no link is
+    requested.
+    """
+    info_hash = torrent["info_hash"].lower()
+    if not await torbox_service.check_cache(info_hash):
+        return False, None
+
+    files = known_files(torrent)
+    library_entry = next(
+        (t for t in await torbox_service.get_torrent_list() if str(t.get("hash", "")).lower() == info_hash),
+        None
+    )
+    if library_entry:
+        torrent_id = library_entry.get("id")
+        if files is None:
+            files = learn_files(torrent, library_entry.get("files"))
+    elif resolve_links:
+        result = await torbox_service.add_magnet(torrent["magnet"], torrent.get("title", ""))
+        torrent_id = (result.get("torrent_id") or result.get("id")) if result else None
+        if torrent_id and files is None:
+            torrent_info = await torbox_service.get_torrent_info(str(torrent_id))
+            files = learn_files(torrent, torrent_info.get("files") if torrent_info else None)
+    else:
+        return True, None
+
+    if not torrent_id or not resolve_links:
+        return True, None
+    file = select_file(files, episode_info) or (largest_video(files) if files else None)
+    download_url = await torbox_service.get_download_link(
+        str(torrent_id),
+        str(file["idx"]) if file else None
+    )
+    return True, download_url
+
+
+def sort_streams(streams: List[dict]) -> List[dict]:
+    streams.sort(key=lambda x: (
+        0 if x.get("url") else 1,
+        0 if "[CACHED]" in x.get("title", "") else 1,
+        -1 if "4K" in x.get("title", "") else 
+        0 if "1080p" in x.get("title", "") else 
+        1 if "HD" in x.get("title", "") else 2
+    ))
+    return streams
+
+
+async def build_stream_skeleton(raw_id: str) -> dict:
+    """The part of a stream response that is the same for every user
+
+    Holds the TamilDhool streams, one P2P stream per torrent and the
+    torrents themselves for the per-user TorBox overlay. "anonymous" is the
+    finished response for users without a TorBox key.
+    """
     episode_info = None
+    tamildhool_episode = None
     base_content_id = raw_id
-    
     if ":" in raw_id:
         parts = raw_id.split(":")
         base_content_id = parts[0]
@@ -237,6 +419,12 @@ async def handle_stream(type: str, id: str, config: Optional[str]):
                 episode_info = {"season": int(parts[1]), "episode": int(parts[2])}
             except ValueError:
                 pass
+    # Taken before reading, so a write that lands during the build is not missed
+    version = data_version()
+    generations = {base_content_id: content_generation(base_content_id)}
+
+    if ":" in raw_id and len(raw_id.split(":")) == 2:
+        tamildhool_episode = get_episode(raw_id)
     
     torrents = get_torrents_for_content(base_content_id)
     content = get_content_by_id(base_content_id)
@@ -244,15 +432,18 @@ async def handle_stream(type: str, id: str, config: Optional[str]):
     if not torrents and content:
         lookup_id = content.get("imdb_id") or content.get("id")
         if lookup_id != base_content_id:
+            generations[lookup_id] = content_generation(lookup_id)
             torrents = get_torrents_for_content(lookup_id)
     
     streams = []
     
-    if content and content.get("source_url"):
-        source_url = content.get("source_url")
+    source_item = tamildhool_episode or content
+    
+    if source_item and source_item.get("source_url"):
+        source_url = source_item.get("source_url")
         streams.append({
             "name": "TamilDhool",
-            "title": f"Watch on TamilDhool\n{content.get('title', 'Episode')}",
+            "title": f"Watch on TamilDhool\n{source_item.get('title', 'Episode')}",
             "externalUrl": source_url,
             "behaviorHints": {
                 "bingeGroup": "tamildhool-web",
@@ -261,7 +452,7 @@ async def handle_stream(type: str, id: str, config: Optional[str]):
         })
         
         try:
-            episode_details = scrape_episode_details(source_url)
+            episode_details = await get_episode_details(source_url)
             if episode_details and episode_details.get("video_sources"):
                 for idx, source in enumerate(episode_details["video_sources"]):
                     video_url = source.get("url", "")
@@ -286,109 +477,90 @@ async def handle_stream(type: str, id: str, config: Optional[str]):
         except Exception as e:
             logger.debug(f"Error getting TamilDhool streams: {e}")
     
-    torbox_service = None
-    
-    if user_config.torbox_api_key:
-        torbox_service = create_torbox_service(user_config.torbox_api_key)
-    
+    torrent_streams = []
     for torrent in torrents:
         info_hash = torrent.get("info_hash")
-        magnet = torrent.get("magnet")
         quality = torrent.get("quality", "Unknown")
-        size = torrent.get("size_readable", "")
-        seeders = torrent.get("seeders", 0)
-        source = torrent.get("source", "Unknown")
-        torrent_title = torrent.get("title", "")
         
         if not info_hash:
             continue
         
-        title_parts = [
-            f"TamilStream | {quality}",
-            f"{size} | {seeders} seeders",
-            f"Source: {source}"
-        ]
-        
         stream_data = {
             "name": settings.app_name,
-            "title": "\n".join(title_parts),
+            "title": "\n".join([
+                f"TamilStream | {quality}",
+                f"{torrent.get('size_readable', '')} | {torrent.get('seeders', 0)} seeders",
+                f"Source: {torrent.get('source', 'Unknown')}"
+            ]),
             "infoHash": info_hash,
             "behaviorHints": {
                 "bingeGroup": f"tamilstream-{quality}",
                 "notWebReady": True
             }
         }
-        
-        torbox_success = False
-        if torbox_service and user_config.torbox_api_key and magnet:
+        file = select_file(known_files(torrent), episode_info)
+        if file:
+            stream_data["fileIdx"] = file["idx"]
+        torrent_streams.append((torrent, stream_data))
+    
+    return {
+        "version": version,
+        "generations": generations,
+        "episode_info": episode_info,
+        "streams": streams,
+        "torrents": torrent_streams,
+        "anonymous": sort_streams(streams + [stream for _, stream in torrent_streams])
+    }
+
+
+def skeleton_current(skeleton: dict) -> bool:
+    return skeleton["version"] == data_version() and all(
+        content_generation(content_id) == generation
+        for content_id, generation in skeleton["generations"].items()
+    )
+
+
+async def get_stream_skeleton(raw_id: str) -> dict:
+    skeleton = stream_skeletons.peek(raw_id)
+    if skeleton is not None and not skeleton_current(skeleton):
+        stream_skeletons.invalidate(raw_id)
+    return await stream_skeletons.get(raw_id, lambda: build_stream_skeleton(raw_id))
+
+
+async def build_streams(raw_id: str, user_config: UserConfig, resolve_links: bool = True) -> List[dict]:
+    skeleton = await get_stream_skeleton(raw_id)
+    if not user_config.torbox_api_key:
+        return list(skeleton["anonymous"])
+    
+    torbox_service = create_torbox_service(user_config.torbox_api_key)
+    streams = list(skeleton["streams"])
+    
+    for torrent, stream_data in skeleton["torrents"]:
+        if torrent.get("magnet"):
             try:
-                is_cached = await torbox_service.check_cache(info_hash)
-                
-                if is_cached:
-                    result = await torbox_service.add_magnet(magnet, torrent_title)
-                    
-                    if result:
-                        torrent_id = result.get("torrent_id") or result.get("id")
-                        
-                        if torrent_id:
-                            torrent_info = await torbox_service.get_torrent_info(str(torrent_id))
-                            
-                            file_id = None
-                            if torrent_info and torrent_info.get("files"):
-                                files = torrent_info["files"]
-                                video_files = [f for f in files if any(
-                                    f.get("name", "").lower().endswith(ext) 
-                                    for ext in ['.mp4', '.mkv', '.avi', '.mov', '.wmv']
-                                )]
-                                
-                                if video_files:
-                                    if episode_info:
-                                        ep_num = episode_info["episode"]
-                                        for vf in video_files:
-                                            if f"e{ep_num:02d}" in vf.get("name", "").lower() or \
-                                               f"episode{ep_num}" in vf.get("name", "").lower() or \
-                                               f"ep{ep_num}" in vf.get("name", "").lower():
-                                                file_id = vf.get("id")
-                                                break
-                                    
-                                    if not file_id:
-                                        largest_file = max(video_files, key=lambda f: f.get("size", 0))
-                                        file_id = largest_file.get("id")
-                            
-                            download_url = await torbox_service.get_download_link(
-                                str(torrent_id), 
-                                str(file_id) if file_id else None
-                            )
-                            
-                            if download_url:
-                                stream_data = {
-                                    "name": settings.app_name,
-                                    "title": f"[CACHED] {title_parts[0]}\n{title_parts[1]}\n{title_parts[2]}",
-                                    "url": download_url,
-                                    "behaviorHints": {
-                                        "bingeGroup": f"tamilstream-{quality}",
-                                        "notWebReady": False
-                                    }
-                                }
-                                torbox_success = True
-                    
-                    if not torbox_success and is_cached:
-                        stream_data["title"] = f"[CACHED] {stream_data['title']}"
+                is_cached, download_url = await resolve_torbox_link(
+                    torbox_service, torrent, skeleton["episode_info"], resolve_links
+                )
+                if download_url:
+                    stream_data = {
+                        "name": settings.app_name,
+                        "title": f"[CACHED] {stream_data['title']}",
+                        "url": download_url,
+                        "behaviorHints": {
+                            "bingeGroup": stream_data["behaviorHints"]["bingeGroup"],
+                            "notWebReady": False
+                        }
+                    }
+                elif is_cached:
+                    stream_data = dict(stream_data, title=f"[CACHED] {stream_data['title']}")
+                if "infoHash" in stream_data and "fileIdx" not in stream_data:
+                    file = select_file(learned_files.peek(torrent["info_hash"].lower()), skeleton["episode_info"])
+                    if file:
+                        stream_data = dict(stream_data, fileIdx=file["idx"])
                         
             except Exception as e:
-                logger.error(f"TorBox error for {info_hash}: {e}")
+                logger.error(f"TorBox error for {torrent.get('info_hash')}: {e}")
         
         streams.append(stream_data)
     
-    streams.sort(key=lambda x: (
-        0 if x.get("url") else 1,
-        0 if "[CACHED]" in x.get("title", "") else 1,
-        -1 if "4K" in x.get("title", "") else 
-        0 if "1080p" in x.get("title", "") else 
-        1 if "HD" in x.get("title", "") else 2
-    ))
-    
-    return JSONResponse(
-        content={"streams": streams},
-        headers={"Access-Control-Allow-Origin": "*"}
-    )
+    return sort_streams(streams)
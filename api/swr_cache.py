@@ -0,0 +1,199 @@
+"""
+Async stale-while-revalidate cache for upstream-derived data
+
+A value is fresh for `ttl` seconds. For `stale_ttl` seconds after that it
+is still served as-is while one background task reloads it, so a hot key
+never waits on the upstream after its first fill. Only past that window
+does a caller wait for the loader again. Concurrent misses for the same
+key share one load. Entries are evicted least-recently-used beyond
+`max_entries`.
+
+None results can be kept for a shorter `negative_ttl`, so a missing
+poster is not looked up on every request while a transient failure is not
+remembered for long. A None result never replaces a known value.
+
+Caches created with persist=True are written to SWR_CACHE_DIR/<name>.json
+on shutdown and read back on start; values must be JSON-serializable.
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class SwrCache:
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, max_entries: int = 1024,
+                 negative_ttl: Optional[float] = None, persist: bool = False):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.persist_path = os.path.join(settings.swr_cache_dir, f"{name}.json") \
+            if persist and settings.swr_cache_dir else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0,
+                      "load_errors": 0, "evictions": 0}
+        if self.persist_path:
+            self.load_from_disk()
+        _caches[name] = self
+
+    def _fresh_for(self, value: Any) -> float:
+        return self.negative_ttl if value is None else self.ttl
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, calling loader() to fill or refresh it"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            fresh_for = self._fresh_for(entry.value)
+            if age < fresh_for:
+                self.stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < fresh_for + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._entries.move_to_end(key)
+                self._refresh(key, loader)
+                return entry.value
+
+        self.stats["misses"] += 1
+        try:
+            return await asyncio.shield(self._start_load(key, loader))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats["load_errors"] += 1
+            raise
+
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fill(key, loader))
+            self._loading[key] = task
+            task.add_done_callback(lambda t, k=key: self._load_done(k, t))
+        return task
+
+    def _load_done(self, key: str, task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+
+    async def _fill(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        known = self._entries.get(key)
+        if value is None and known is not None and known.value is not None:
+            # Loaders return None on upstream errors; keep serving the last good value
+            return known.value
+        self.set(key, value)
+        return value
+
+    def _refresh(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        if key in self._loading:
+            return
+        self.stats["refreshes"] += 1
+        task = self._start_load(key, loader)
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # The stale value stays in place until the next attempt
+            self.stats["refresh_errors"] += 1
+            logger.debug(f"{self.name} cache refresh failed: {task.exception()}")
+
+    def peek(self, key: str) -> Any:
+        """Stored value regardless of age, without loading"""
+        entry = self._entries.get(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value: Any):
+        self._entries[key] = CacheEntry(value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def load_from_disk(self):
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {self.name} cache file: {e}")
+            return
+        horizon = time.time() - self.ttl - self.stale_ttl
+        for key, value, stored_at in stored.get("entries", [])[-self.max_entries:]:
+            if stored_at > horizon:
+                self._entries[key] = CacheEntry(value, stored_at)
+        logger.info(f"Loaded {len(self._entries)} {self.name} cache entries")
+
+    def save_to_disk(self):
+        if not self.persist_path:
+            return
+        entries = [[key, entry.value, entry.stored_at] for key, entry in self._entries.items()]
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.persist_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist {self.name} cache: {e}")
+
+    async def close(self):
+        """Cancel background refreshes and persist the entries"""
+        tasks = list(self._refreshes)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.save_to_disk()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "stale_ttl_s": self.stale_ttl,
+            "persistent": bool(self.persist_path),
+            "loading": len(self._loading),
+            **self.stats
+        }
+
+
+_caches: Dict[str, SwrCache] = {}
+
+
+def cache_status() -> Dict[str, List[Dict[str, Any]]]:
+    return {"caches": [cache.as_dict() for cache in _caches.values()]}
+
+
+async def close_caches():
+    for cache in list(_caches.values()):
+        await cache.close()
@@ -2,14 +2,32 @@
 TamilDhool Scraper - Scrapes Tamil TV shows and episodes from tamildhool.tech
 """
 
+import asyncio
+import contextlib
+import itertools
+import os
+import tempfile
 import urllib.request
 import urllib.error
 import re
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Callable
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from api.catalog_data import write_store_snapshot
+from api.catalog_snapshot import CatalogSnapshot, SNAPSHOT_FILENAME
+from api.config import settings
+from api.crawl_checkpoints import CrawlCheckpoints, CHECKPOINT_FILENAME
+from api.crawler import Crawler, CrawlTask
+from api.http_cache import get_http_cache
+from api.ndjson import NdjsonWriter, iter_ndjson
+from api.parse_pool import ParsePool
+from api.record_store import RecordStore, RECORD_STORE_DIRNAME
+from api.storage_backends import build_store_sqlite_catalog, sqlite_catalog_seq, SQLITE_CATALOG_FILENAME
+from api.swr_cache import SwrCache
+from api.upstream_guard import upstream_guard
 
 logger = logging.getLogger(__name__)
 
@@ -23,42 +41,160 @@ CHANNELS = {
 }
 
 
-def fetch_page(url: str) -> Optional[str]:
-    """Fetch a webpage and return its HTML content"""
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+def fetch_page_conditional(url: str, max_wait: Optional[float] = None) -> Tuple[Optional[str], bool]:
+    """Fetch a webpage through the HTTP cache; returns (html, changed)
+    
+    The upstream guard waits at most max_wait (settings.upstream_max_wait by
+    default) for the host's rate limit; batch crawls pass float("inf").
+    """
+    cache = get_http_cache()
+    headers = dict(HEADERS)
+    if cache:
+        headers.update(cache.conditional_headers(url))
+    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-        }
         req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=15) as response:
-            return response.read().decode('utf-8', errors='ignore')
+        with upstream_guard(url).attempt_sync(max_wait=max_wait):
+            try:
+                with urllib.request.urlopen(req, timeout=15) as response:
+                    body = response.read()
+            except urllib.error.HTTPError as e:
+                if e.code >= 500 or e.code == 429:
+                    raise
+                if e.code == 304 and cache:
+                    html = cache.load_body(url)
+                    if html is not None:
+                        return html, False
+                logger.error(f"Failed to fetch {url}: {e}")
+                return None, False
+        changed = cache.store(url, response.headers, body) if cache else True
+        return body.decode('utf-8', errors='ignore'), changed
     except Exception as e:
         logger.error(f"Failed to fetch {url}: {e}")
-        return None
+        return None, False
 
 
-def scrape_show_list(channel_slug: str, content_type: str = "serials") -> List[Dict[str, Any]]:
-    """Scrape list of shows from a channel page"""
-    shows = []
+def fetch_page(url: str, max_wait: Optional[float] = None) -> Optional[str]:
+    """Fetch a webpage and return its HTML content"""
+    return fetch_page_conditional(url, max_wait)[0]
+
+
+def parse_cached(url: str, kind: str, html: str, changed: bool, parse: Callable[[str], Any]) -> Any:
+    """Parse a page, reusing the cached result when the page is unchanged"""
+    cache = get_http_cache()
+    if cache and not changed:
+        parsed = cache.get_parsed(url, kind)
+        if parsed is not None:
+            return parsed
     
+    parsed = parse(html)
+    if cache and parsed is not None:
+        cache.put_parsed(url, kind, parsed)
+    return parsed
+
+
+async def parse_cached_async(url: str, kind: str, changed: bool, pool: ParsePool,
+                             parse: Callable[..., Any], html: str, *args) -> Any:
+    """parse_cached for crawl handlers: parse(html, *args) runs on the parse pool"""
+    cache = get_http_cache()
+    if cache and not changed:
+        parsed = cache.get_parsed(url, kind)
+        if parsed is not None:
+            return parsed
+    
+    parsed = await pool.run(parse, html, *args)
+    if cache and parsed is not None:
+        cache.put_parsed(url, kind, parsed)
+    return parsed
+
+
+def listing_url(channel_slug: str, content_type: str = "serials") -> Optional[str]:
+    """URL of a channel's serial or show listing"""
     channel = CHANNELS.get(channel_slug)
     if not channel:
-        return shows
+        return None
     
     path = channel.get(content_type) or channel.get("serials")
     if not path:
-        return shows
-    
-    url = f"{BASE_URL}{path}"
-    html = fetch_page(url)
-    
-    if not html:
-        return shows
+        return None
+    return f"{BASE_URL}{path}"
+
+
+_html_parser: Optional[str] = None
+
+
+def get_html_parser() -> str:
+    """BeautifulSoup tree builder from settings.html_parser; "auto" prefers lxml when installed"""
+    global _html_parser
+    if _html_parser is None:
+        choice = settings.html_parser
+        if choice == "auto":
+            try:
+                import lxml  # noqa: F401
+                choice = "lxml"
+            except ImportError:
+                choice = "html.parser"
+        _html_parser = choice
+    return _html_parser
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse HTML with the configured backend, building only the strained subtrees"""
+    return BeautifulSoup(html, get_html_parser(), parse_only=parse_only)
+
+
+# Only these subtrees are built; the rest of the page (head, nav, sidebars,
+# scripts, footer) is skipped by the tokenizer.
+ARTICLE_STRAINER = SoupStrainer('article')
+EPISODE_STRAINER = SoupStrainer(['article', 'h1', 'iframe', 'video'])
+
+
+def page_url(url: str, page: int) -> str:
+    """WordPress archive URL for a given page of a listing"""
+    if page <= 1:
+        return url
+    return f"{url.rstrip('/')}/page/{page}/"
+
+
+_LINK_TAG = re.compile(r'<(?:a|link)\b[^>]*>', re.I)
+_NEXT_MARKER = re.compile(r'rel=["\']next["\']|class=["\'][^"\']*\bnext\b', re.I)
+_HREF = re.compile(r'href=["\']([^"\']+)["\']', re.I)
+
+
+def find_next_page(html: str) -> Optional[str]:
+    """URL of the next archive page (rel="next" or the "next page-numbers" link)"""
+    for tag in _LINK_TAG.findall(html or ""):
+        if _NEXT_MARKER.search(tag):
+            href = _HREF.search(tag)
+            if href:
+                return href.group(1)
+    return None
+
+
+def _find_poster(article) -> str:
+    for img in article.find_all('img'):
+        src = img.get('src', '')
+        data_src = img.get('data-src', '') or img.get('data-lazy-src', '')
+        if data_src and not data_src.startswith('data:'):
+            return data_src
+        elif src and not src.startswith('data:') and 'wp-content' in src:
+            return src
+    return ""
+
+
+def parse_show_list(html: str, channel_name: str) -> List[Dict[str, Any]]:
+    """Extract show posts from a channel listing page"""
+    shows = []
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, ARTICLE_STRAINER)
         
         articles = soup.find_all('article')
         
@@ -69,32 +205,18 @@ def scrape_show_list(channel_slug: str, content_type: str = "serials") -> List[D
                     title_elem = article.find('a', class_='post-title')
                 
                 link_elem = article.find('a', href=True)
-                img_elem = article.find('img', src=True)
                 
                 if title_elem and link_elem:
                     title = title_elem.get_text(strip=True)
                     link = link_elem.get('href', '')
-                    
-                    poster = ""
-                    all_imgs = article.find_all('img')
-                    for img in all_imgs:
-                        src = img.get('src', '')
-                        data_src = img.get('data-src', '') or img.get('data-lazy-src', '')
-                        if data_src and not data_src.startswith('data:'):
-                            poster = data_src
-                            break
-                        elif src and not src.startswith('data:') and 'wp-content' in src:
-                            poster = src
-                            break
-                    
                     show_id = link.rstrip('/').split('/')[-1]
                     
                     shows.append({
                         "id": f"td_{show_id}",
                         "title": title,
                         "url": link,
-                        "poster": poster,
-                        "channel": channel["name"],
+                        "poster": _find_poster(article),
+                        "channel": channel_name,
                         "type": "series"
                     })
             except Exception as e:
@@ -107,16 +229,31 @@ def scrape_show_list(channel_slug: str, content_type: str = "serials") -> List[D
     return shows
 
 
-def scrape_latest_episodes(limit: int = 20) -> List[Dict[str, Any]]:
-    """Scrape latest episodes from homepage"""
-    episodes = []
+def scrape_show_list(channel_slug: str, content_type: str = "serials", max_pages: int = 1) -> List[Dict[str, Any]]:
+    """Scrape list of shows from a channel page, following up to max_pages archive pages"""
+    url = listing_url(channel_slug, content_type)
+    if not url:
+        return []
     
-    html = fetch_page(BASE_URL)
-    if not html:
-        return episodes
+    channel_name = CHANNELS[channel_slug]["name"]
+    shows = []
+    for _ in range(max_pages):
+        html, changed = fetch_page_conditional(url)
+        if not html:
+            break
+        shows.extend(parse_cached(url, "show_list", html, changed, lambda h: parse_show_list(h, channel_name)))
+        url = find_next_page(html)
+        if not url:
+            break
+    return shows
+
+
+def parse_latest_episodes(html: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Extract the latest episode posts from the homepage"""
+    episodes = []
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, ARTICLE_STRAINER)
         
         posts = soup.find_all('article', class_='post')
         
@@ -127,25 +264,12 @@ def scrape_latest_episodes(limit: int = 20) -> List[Dict[str, Any]]:
                     title_elem = post.find('a')
                 
                 link_elem = post.find('a', href=True)
-                img_elem = post.find('img')
                 date_elem = post.find('time') or post.find(class_='entry-date')
                 
                 if title_elem and link_elem:
                     title = title_elem.get_text(strip=True)
                     link = link_elem.get('href', '')
                     
-                    poster = ""
-                    all_imgs = post.find_all('img')
-                    for img in all_imgs:
-                        src = img.get('src', '')
-                        data_src = img.get('data-src', '') or img.get('data-lazy-src', '')
-                        if data_src and not data_src.startswith('data:'):
-                            poster = data_src
-                            break
-                        elif src and not src.startswith('data:') and 'wp-content' in src:
-                            poster = src
-                            break
-                    
                     date_str = ""
                     if date_elem:
                         date_str = date_elem.get('datetime', '') or date_elem.get_text(strip=True)
@@ -156,7 +280,7 @@ def scrape_latest_episodes(limit: int = 20) -> List[Dict[str, Any]]:
                         "id": f"td_ep_{episode_id}",
                         "title": title,
                         "url": link,
-                        "poster": poster,
+                        "poster": _find_poster(post),
                         "date": date_str,
                         "type": "episode"
                     })
@@ -170,128 +294,467 @@ def scrape_latest_episodes(limit: int = 20) -> List[Dict[str, Any]]:
     return episodes
 
 
-def scrape_episode_details(episode_url: str) -> Optional[Dict[str, Any]]:
-    """Scrape episode details and video sources from an episode page"""
-    html = fetch_page(episode_url)
-    if not html:
-        return None
+def scrape_latest_episodes(limit: int = 20) -> List[Dict[str, Any]]:
+    """Scrape latest episodes from the homepage, paging back until limit posts are found"""
+    episodes = []
+    url = BASE_URL
+    while url and len(episodes) < limit:
+        html, changed = fetch_page_conditional(url)
+        if not html:
+            break
+        episodes.extend(parse_cached(url, "latest_episodes", html, changed, lambda h: parse_latest_episodes(h, 500)))
+        url = find_next_page(html)
+    return episodes[:limit]
+
+
+def _extract_episode_details(soup: BeautifulSoup, episode_url: str) -> Dict[str, Any]:
+    title = ""
+    title_elem = soup.find('h1', class_='entry-title')
+    if title_elem:
+        title = title_elem.get_text(strip=True)
+    
+    video_sources = []
+    
+    iframes = soup.find_all('iframe', src=True)
+    for iframe in iframes:
+        src = iframe.get('src', '')
+        if src and ('player' in src.lower() or 'video' in src.lower() or 'embed' in src.lower()):
+            video_sources.append({
+                "type": "iframe",
+                "url": src
+            })
+    
+    video_tags = soup.find_all('video')
+    for video in video_tags:
+        source = video.find('source', src=True)
+        if source:
+            video_sources.append({
+                "type": "direct",
+                "url": source.get('src', '')
+            })
+    
+    player_divs = soup.find_all('div', class_=re.compile(r'player|video', re.I))
+    for div in player_divs:
+        data_src = div.get('data-src') or div.get('data-video')
+        if data_src:
+            video_sources.append({
+                "type": "data",
+                "url": data_src
+            })
     
+    return {
+        "title": title,
+        "url": episode_url,
+        "video_sources": video_sources
+    }
+
+
+def parse_episode_details(html: str, episode_url: str) -> Optional[Dict[str, Any]]:
+    """Extract the title and video sources from an episode page
+    
+    Only the post, headings and media tags are parsed; a page whose player
+    sits outside the post is re-parsed in full.
+    """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        title = ""
-        title_elem = soup.find('h1', class_='entry-title')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
-        
-        video_sources = []
-        
-        iframes = soup.find_all('iframe', src=True)
-        for iframe in iframes:
-            src = iframe.get('src', '')
-            if src and ('player' in src.lower() or 'video' in src.lower() or 'embed' in src.lower()):
-                video_sources.append({
-                    "type": "iframe",
-                    "url": src
-                })
-        
-        video_tags = soup.find_all('video')
-        for video in video_tags:
-            source = video.find('source', src=True)
-            if source:
-                video_sources.append({
-                    "type": "direct",
-                    "url": source.get('src', '')
-                })
-        
-        player_divs = soup.find_all('div', class_=re.compile(r'player|video', re.I))
-        for div in player_divs:
-            data_src = div.get('data-src') or div.get('data-video')
-            if data_src:
-                video_sources.append({
-                    "type": "data",
-                    "url": data_src
-                })
-        
-        return {
-            "title": title,
-            "url": episode_url,
-            "video_sources": video_sources
-        }
+        details = _extract_episode_details(make_soup(html, EPISODE_STRAINER), episode_url)
+        if not details["video_sources"]:
+            details = _extract_episode_details(make_soup(html), episode_url)
+        return details
         
     except Exception as e:
         logger.error(f"Error parsing episode details: {e}")
         return None
 
 
-def scrape_all_shows() -> List[Dict[str, Any]]:
-    """Scrape all shows from all channels"""
-    all_shows = []
+def scrape_episode_details(episode_url: str) -> Optional[Dict[str, Any]]:
+    """Scrape episode details and video sources from an episode page"""
+    html, changed = fetch_page_conditional(episode_url)
+    if not html:
+        return None
+    return parse_cached(episode_url, "episode_details", html, changed, lambda h: parse_episode_details(h, episode_url))
+
+
+# Player sources of a published episode rarely change; failed scrapes retry after 10 minutes
+episode_sources_cache = SwrCache("episode_sources", ttl=6 * 3600, stale_ttl=2 * 86400, max_entries=2000,
+                                 negative_ttl=600, persist=True)
+
+
+async def get_episode_details(episode_url: str) -> Optional[Dict[str, Any]]:
+    """Cached scrape_episode_details for request handlers"""
+    return await episode_sources_cache.get(episode_url, lambda: asyncio.to_thread(scrape_episode_details, episode_url))
+
+
+def listing_key(url: str) -> str:
+    """Checkpoint key for a listing: its path, so it survives domain changes"""
+    return "/" + "/".join(_url_segments(url)) + "/"
+
+
+async def crawl_site(latest_limit: int = 50, crawler: Optional[Crawler] = None,
+                     checkpoints: Optional[CrawlCheckpoints] = None, mode: str = "incremental",
+                     max_pages: Optional[int] = None,
+                     on_show: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     parse_pool: Optional[ParsePool] = None) -> Dict[str, Any]:
+    """Crawl every channel listing and the homepage concurrently
+    
+    In incremental mode each listing is paged until a post seen by the
+    previous run turns up (or max_pages is reached). In backfill mode each
+    listing resumes from its checkpointed page and walks towards the oldest
+    posts; max_pages then bounds the pages fetched per listing in this run.
     
-    for channel_slug in CHANNELS:
-        logger.info(f"Scraping {channel_slug}...")
+    Show posts are collected in result["shows"], or handed to on_show as
+    they are parsed so the caller can stream them out instead. Pages are
+    parsed on parse_pool, or on a pool sized by settings.parse_workers.
+    """
+    if max_pages is None:
+        max_pages = settings.crawl_backfill_pages if mode == "backfill" else settings.crawl_incremental_pages
+    result = {"shows": [], "episodes": [], "stats": {}, "show_count": 0}
+    
+    async def handle_listing(task: CrawlTask, html: str):
+        channel_name = task.data["channel"]
+        listing = task.data["listing"]
+        page = task.data["page"]
+        shows = await parse_cached_async(task.url, "show_list", task.changed, pool, parse_show_list, html, channel_name)
+        result["show_count"] += len(shows)
+        if on_show:
+            for show in shows:
+                on_show(show)
+        else:
+            result["shows"].extend(shows)
+        next_url = find_next_page(html)
         
-        serials = scrape_show_list(channel_slug, "serials")
-        all_shows.extend(serials)
+        if mode == "backfill":
+            if checkpoints:
+                checkpoints.record_backfill(listing, page, bool(next_url))
+        else:
+            if checkpoints and page == 1:
+                urls = [show["url"] for show in shows]
+                checkpoints.record_newest(listing, urls, parse_air_date(urls[0]) if urls else None)
+            if any(show["url"] in task.data["known"] for show in shows):
+                return []
         
-        shows = scrape_show_list(channel_slug, "shows")
-        all_shows.extend(shows)
+        if not next_url or (max_pages and task.data["pages"] >= max_pages):
+            return []
+        return [CrawlTask(next_url, handle_listing, dict(task.data, page=page + 1, pages=task.data["pages"] + 1))]
+    
+    async def handle_homepage(task: CrawlTask, html: str):
+        episodes = await parse_cached_async(task.url, "latest_episodes", task.changed, pool,
+                                            parse_latest_episodes, html, 500)
+        result["episodes"].extend(episodes[:latest_limit - len(result["episodes"])])
+        next_url = find_next_page(html)
+        if next_url and len(result["episodes"]) < latest_limit:
+            return [CrawlTask(next_url, handle_homepage)]
+        return []
     
-    return all_shows
+    seeds = [CrawlTask(BASE_URL, handle_homepage)] if latest_limit else []
+    for channel_slug, channel in CHANNELS.items():
+        for content_type in ("serials", "shows"):
+            if not channel.get(content_type):
+                continue
+            url = listing_url(channel_slug, content_type)
+            listing = listing_key(url)
+            page = 1
+            if mode == "backfill" and checkpoints:
+                page = checkpoints.backfill_page(listing)
+                if page is None:
+                    continue
+            seeds.append(CrawlTask(page_url(url, page), handle_listing, {
+                "channel": channel["name"],
+                "content_type": content_type,
+                "listing": listing,
+                "page": page,
+                "pages": 1,
+                "known": checkpoints.known_urls(listing) if checkpoints and mode != "backfill" else set()
+            }))
+    
+    with (contextlib.nullcontext(parse_pool) if parse_pool else ParsePool()) as pool:
+        if crawler is None:
+            async with Crawler(headers=HEADERS, cache=get_http_cache()) as own_crawler:
+                await own_crawler.crawl(seeds)
+                result["stats"] = own_crawler.stats.as_dict()
+        else:
+            await crawler.crawl(seeds)
+            result["stats"] = crawler.stats.as_dict()
+        result["stats"].update(pool.stats())
+    
+    logger.info(f"Crawl finished ({mode}): {result['stats']}")
+    return result
+
+
+async def scrape_all_shows_async(crawler: Optional[Crawler] = None) -> List[Dict[str, Any]]:
+    """Scrape all shows from all channels concurrently"""
+    result = await crawl_site(latest_limit=0, crawler=crawler)
+    return result["shows"]
+
+
+def scrape_all_shows() -> List[Dict[str, Any]]:
+    """Scrape all shows from all channels"""
+    return asyncio.run(scrape_all_shows_async())
+
 
+DATE_PATTERN = re.compile(r'(\d{1,2})-(\d{1,2})-(\d{4})')
+EPISODE_NUMBER_PATTERN = re.compile(r'episode[\s\-–]*(\d+)', re.I)
+SERIES_TITLE_SPLIT = re.compile(r'\s*(?:\||\d{1,2}-\d{1,2}-\d{4}|\bepisode\b)', re.I)
 
-def convert_to_stremio_format(shows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Convert scraped shows to Stremio catalog format"""
-    stremio_content = []
+_SECTION_SEGMENTS = {
+    segment
+    for channel in CHANNELS.values()
+    for key in ("serials", "shows")
+    if channel.get(key)
+    for segment in channel[key].strip("/").split("/")
+}
+
+
+def _url_segments(url: str) -> List[str]:
+    path = url.split("://", 1)[-1].split("/", 1)[-1] if "://" in url else url
+    return [segment for segment in path.split("?")[0].strip("/").split("/") if segment]
+
+
+def parse_show_slug(url: str) -> Optional[str]:
+    """Show slug from a post URL, e.g. .../sun-tv-serial/aadukalam/aadukalam-17-12-2025/ -> aadukalam"""
+    segments = _url_segments(url)
+    if len(segments) >= 2 and segments[-2] not in _SECTION_SEGMENTS:
+        return segments[-2]
+    if segments:
+        slug = DATE_PATTERN.split(segments[-1])[0]
+        slug = re.split(r'-episode-', slug)[0]
+        return slug.strip("-") or None
+    return None
+
+
+def parse_air_date(text: str) -> Optional[str]:
+    """ISO air date from a dd-mm-yyyy fragment in a slug or title"""
+    match = DATE_PATTERN.search(text or "")
+    if not match:
+        return None
+    day, month, year = (int(g) for g in match.groups())
+    try:
+        return datetime(year, month, day).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def parse_episode_number(text: str) -> Optional[int]:
+    match = EPISODE_NUMBER_PATTERN.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+def _series_title(post_title: str) -> str:
+    return SERIES_TITLE_SPLIT.split(post_title, maxsplit=1)[0].strip(" -–|")
+
+
+def series_id(slug: str) -> str:
+    return f"td_{slug}"
+
+
+def aggregate_shows(shows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group dated posts by show slug into series records with date-ordered episodes"""
+    groups: Dict[str, Dict[str, Any]] = {}
     
     for show in shows:
-        content = {
-            "id": show["id"],
-            "imdb_id": show["id"],
-            "title": show["title"],
+        url = show.get("url", "")
+        slug = parse_show_slug(url)
+        if not slug:
+            continue
+        
+        group = groups.setdefault(slug, {"posts": {}, "titles": {}, "channel": show.get("channel")})
+        if url in group["posts"]:
+            continue
+        group["posts"][url] = show
+        
+        title = _series_title(show.get("title", ""))
+        if title:
+            group["titles"][title] = group["titles"].get(title, 0) + 1
+    
+    series_list = []
+    for slug, group in groups.items():
+        content_id = series_id(slug)
+        episodes = []
+        for url, post in group["posts"].items():
+            post_slug = _url_segments(url)[-1] if _url_segments(url) else ""
+            air_date = parse_air_date(post_slug) or parse_air_date(post.get("title", "")) or parse_air_date(post.get("date", ""))
+            number = parse_episode_number(post_slug) or parse_episode_number(post.get("title", ""))
+            key = air_date or (f"ep{number}" if number else post_slug)
+            episodes.append({
+                "id": f"{content_id}:{key}",
+                "content_id": content_id,
+                "title": post.get("title", ""),
+                "season": 1,
+                "episode": number,
+                "episode_date": air_date,
+                "source_url": url,
+                "poster": post.get("poster", "")
+            })
+        
+        episodes.sort(key=lambda e: (e["episode_date"] or "", e["episode"] or 0))
+        for idx, episode in enumerate(episodes, 1):
+            if not episode["episode"]:
+                episode["episode"] = idx
+        
+        titles = group["titles"]
+        title = min(titles, key=lambda t: (-titles[t], len(t))) if titles else slug.replace("-", " ").title()
+        latest = episodes[-1]
+        channel = group["channel"] or "TamilDhool"
+        show_url = latest["source_url"].rstrip("/").rsplit("/", 1)[0] + "/"
+        
+        series_list.append({
+            "id": content_id,
+            "imdb_id": content_id,
+            "title": title,
             "type": "series",
-            "poster": show.get("poster", ""),
-            "description": f"Tamil TV Series from {show.get('channel', 'TamilDhool')}",
-            "genres": ["Tamil", "Drama", show.get("channel", "TV")],
-            "source_url": show.get("url", "")
-        }
-        stremio_content.append(content)
+            "poster": latest["poster"],
+            "description": f"Tamil TV Series from {channel}",
+            "genres": ["Tamil", "Drama", channel],
+            "channel": channel,
+            "source_url": show_url,
+            "latest_episode_date": latest["episode_date"],
+            "episodes": episodes
+        })
     
-    return stremio_content
+    series_list.sort(key=lambda s: s["latest_episode_date"] or "", reverse=True)
+    return series_list
 
 
-def save_scraped_content():
-    """Scrape all content and save to JSON file for Vercel"""
-    import os
-    
-    logger.info("Starting full scrape...")
-    
-    all_shows = scrape_all_shows()
-    logger.info(f"Found {len(all_shows)} shows")
+def convert_to_stremio_format(shows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert scraped posts to Stremio catalog series, one per show"""
+    return aggregate_shows(shows)
+
+
+def series_posts(series_list: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Flatten aggregated series back into posts so new crawls can be merged in"""
+    for series in series_list:
+        for episode in series.get("episodes", []):
+            yield {
+                "title": episode.get("title", ""),
+                "url": episode.get("source_url", ""),
+                "poster": episode.get("poster", ""),
+                "channel": series.get("channel"),
+                "type": "series"
+            }
+
+
+def snapshot_seq(path: str) -> Optional[int]:
+    """Record store change a snapshot file was written at, or None if it cannot be read"""
+    try:
+        snapshot = CatalogSnapshot(path)
+    except (OSError, ValueError):
+        return None
+    try:
+        return snapshot.store_seq
+    finally:
+        snapshot.close()
+
+
+def merge_series(posts: Iterable[Dict[str, Any]], stored_ids: Iterable[Tuple[str, Optional[str]]],
+                 get_stored: Callable[[str], Optional[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Stored series with crawled posts merged in, newest episode first
     
-    stremio_series = convert_to_stremio_format(all_shows)
+    stored_ids yields (series id, latest episode date) in catalog order.
+    Only the series that received posts are held in memory; the others are
+    looked up again with get_stored as the merged list is written out.
+    """
+    crawled: Dict[str, List[Dict[str, Any]]] = {}
+    for post in posts:
+        slug = parse_show_slug(post.get("url", ""))
+        if slug:
+            crawled.setdefault(series_id(slug), []).append(post)
     
-    latest_episodes = scrape_latest_episodes(50)
-    logger.info(f"Found {len(latest_episodes)} latest episodes")
+    touched: Dict[str, Dict[str, Any]] = {}
+    for content_id, new_posts in crawled.items():
+        stored = get_stored(content_id)
+        merged = aggregate_shows(itertools.chain(new_posts, series_posts([stored] if stored else [])))
+        if merged:
+            touched[content_id] = merged[0]
     
-    data = {
-        "movies": [],
-        "series": stremio_series,
-        "episodes": latest_episodes,
-        "last_updated": datetime.now().isoformat()
-    }
+    order = [(s["latest_episode_date"], content_id) for content_id, s in touched.items()]
+    order.extend((latest, content_id) for content_id, latest in stored_ids if content_id not in touched)
+    order.sort(key=lambda entry: entry[0] or "", reverse=True)
+    for _, content_id in order:
+        series = touched.get(content_id) or get_stored(content_id)
+        if series:
+            yield series
+
+
+def save_scraped_content(mode: str = "incremental", max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """Scrape new content, merge it into the saved catalog and append the changes to the record store
     
+    Crawled posts are spooled to an NDJSON file as they are parsed. Stored
+    series are streamed from the record store into the new delta; only the
+    shows that received posts and the (date, id) order are held in memory.
+    """
     data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
     os.makedirs(data_dir, exist_ok=True)
+    store = RecordStore(os.path.join(data_dir, RECORD_STORE_DIRNAME))
+    checkpoints = CrawlCheckpoints.load(os.path.join(data_dir, CHECKPOINT_FILENAME))
     
-    json_path = os.path.join(data_dir, "scraped_content.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    logger.info(f"Starting {mode} scrape...")
     
-    logger.info(f"Saved content to {json_path}")
-    return data
+    spool_fd, spool_path = tempfile.mkstemp(prefix="crawl-posts-", suffix=".ndjson")
+    os.close(spool_fd)
+    catalog = None
+    try:
+        with NdjsonWriter(spool_path) as spool:
+            crawl = asyncio.run(crawl_site(latest_limit=50, checkpoints=checkpoints, mode=mode,
+                                           max_pages=max_pages, on_show=spool.write))
+        logger.info(f"Found {crawl['show_count']} show posts")
+        logger.info(f"Found {len(crawl['episodes'])} latest episodes")
+        
+        if store.exists():
+            catalog = store.open_catalog()
+            get_stored = catalog.get
+            stored_ids = ((s["id"], s.get("latest_episode_date")) for s in catalog.iter_list("series"))
+        else:
+            # Seed the first store from the catalog written before the store existed
+            legacy_path = os.path.join(data_dir, "scraped_content.json")
+            legacy: Dict[str, Dict[str, Any]] = {}
+            if os.path.exists(legacy_path):
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    legacy = {s["id"]: s for s in json.load(f).get("series", [])}
+            get_stored = legacy.get
+            stored_ids = [(s["id"], s.get("latest_episode_date")) for s in legacy.values()]
+        
+        delta = store.save({
+            "movies": [],
+            "series": merge_series(iter_ndjson(spool_path), stored_ids, get_stored),
+            "episodes": crawl["episodes"],
+            "last_updated": datetime.now().isoformat()
+        })
+    finally:
+        if catalog:
+            catalog.close()
+        os.remove(spool_path)
+    logger.info(f"Record store: {delta}")
+    
+    # The snapshot and SQLite catalog are derived from the store and shipped
+    # with it; an unchanged store keeps the existing files
+    snapshot_path = os.path.join(data_dir, SNAPSHOT_FILENAME)
+    if delta["delta_bytes"] or snapshot_seq(snapshot_path) != store.current_seq():
+        write_store_snapshot(store, snapshot_path)
+    else:
+        logger.info("Catalog unchanged, keeping the snapshot")
+    sqlite_path = os.path.join(data_dir, SQLITE_CATALOG_FILENAME)
+    if delta["delta_bytes"] or sqlite_catalog_seq(sqlite_path) != store.current_seq():
+        build_store_sqlite_catalog(store, sqlite_path)
+    else:
+        logger.info("Catalog unchanged, keeping the SQLite catalog")
+    checkpoints.save()
+    
+    logger.info(f"Saved content to {store.directory}")
+    return delta
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Scrape TamilDhool into data/")
+    parser.add_argument("--backfill", action="store_true",
+                        help="walk listings back to their oldest page, resuming from the last checkpoint")
+    parser.add_argument("--max-pages", type=int, default=None,
+                        help="pages per listing in this run (0 = no limit)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="worker processes for HTML parsing (0 = parse in-process)")
+    args = parser.parse_args()
+    if args.parse_workers is not None:
+        settings.parse_workers = args.parse_workers
+    
     logging.basicConfig(level=logging.INFO)
-    save_scraped_content()
+    save_scraped_content(mode="backfill" if args.backfill else "incremental", max_pages=args.max_pages)
@@ -0,0 +1,240 @@
+"""
+Offline title -> IMDb id resolver
+
+Built once from an IMDb title.basics TSV (or any TSV/CSV with title, year,
+type, imdb_id columns) into a small SQLite file, so opening it in the
+scheduled ingestion job costs nothing. Lookups normalize the title
+(case, accents, punctuation, "&", leading "the") and try an exact match
+first. Failing that, they fuzzy-match with difflib among titles that share
+the first word. The year must agree within one year when it is known.
+
+    python -m api.title_index build title.basics.tsv.gz [--out data/title_index.sqlite3]
+"""
+
+import csv
+import difflib
+import gzip
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from api.catalog_data import find_data_file
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+TITLE_INDEX_FILENAME = "title_index.sqlite3"
+
+IMDB_TYPES = {
+    "movie": "movie",
+    "tvMovie": "movie",
+    "tvSeries": "series",
+    "tvMiniSeries": "series",
+}
+
+FUZZY_CUTOFF = 0.88
+MAX_FUZZY_CANDIDATES = 5000
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    text = unicodedata.normalize("NFKD", title or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("&", " and ")
+    text = _SPACES.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+    if text.startswith("the "):
+        text = text[4:]
+    return text
+
+
+def _block(norm: str) -> str:
+    return norm.split(" ", 1)[0] if norm else ""
+
+
+def _open_table(path: str) -> Iterator[Dict[str, str]]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        delimiter = "," if (path[:-3] if path.endswith(".gz") else path).endswith(".csv") else "\t"
+        yield from csv.DictReader(f, delimiter=delimiter, quoting=csv.QUOTE_NONE if delimiter == "\t" else csv.QUOTE_MINIMAL)
+
+
+def _dataset_rows(path: str, min_year: int) -> Iterator[Tuple[str, str, Optional[int], str, List[str]]]:
+    """(imdb_id, title, year, type, alternate titles) from IMDb basics or a plain title table"""
+    for row in _open_table(path):
+        if "tconst" in row:
+            kind = IMDB_TYPES.get(row.get("titleType", ""))
+            if not kind or row.get("isAdult") == "1":
+                continue
+            imdb_id, title = row["tconst"], row.get("primaryTitle", "")
+            year_text = row.get("startYear", "")
+            alternates = [row.get("originalTitle", "")]
+        else:
+            imdb_id, title = row.get("imdb_id", ""), row.get("title", "")
+            kind = row.get("type", "movie") or "movie"
+            year_text = row.get("year", "")
+            alternates = []
+
+        year = int(year_text) if year_text and year_text.isdigit() else None
+        if not imdb_id or not title or (min_year and year and year < min_year):
+            continue
+        yield imdb_id, title, year, kind, [a for a in alternates if a and a != "\\N" and a != title]
+
+
+def build_title_index(source: str, path: str, min_year: int = 0, batch_size: int = 10000) -> int:
+    """Stream a title dataset into a fresh index file; returns the number of titles"""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript("""
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE titles (imdb_id TEXT PRIMARY KEY, title TEXT NOT NULL, year INTEGER, type TEXT NOT NULL);
+        CREATE TABLE names (norm TEXT NOT NULL, block TEXT NOT NULL, imdb_id TEXT NOT NULL);
+    """)
+
+    count = 0
+    titles, names = [], []
+    for imdb_id, title, year, kind, alternates in _dataset_rows(source, min_year):
+        titles.append((imdb_id, title, year, kind))
+        for name in {normalize_title(t) for t in [title] + alternates}:
+            if name:
+                names.append((name, _block(name), imdb_id))
+        count += 1
+        if len(titles) >= batch_size:
+            conn.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)", titles)
+            conn.executemany("INSERT INTO names VALUES (?, ?, ?)", names)
+            titles, names = [], []
+    conn.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)", titles)
+    conn.executemany("INSERT INTO names VALUES (?, ?, ?)", names)
+
+    conn.executescript("""
+        CREATE INDEX ix_names_norm ON names (norm);
+        CREATE INDEX ix_names_block ON names (block);
+        ANALYZE;
+    """)
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, path)
+    return count
+
+
+class TitleIndex:
+    """Read-only resolver over a built index file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _candidates(self, column: str, value: str, kind: Optional[str]) -> List[Tuple[str, str, Optional[int]]]:
+        sql = (f"SELECT n.norm, t.imdb_id, t.year FROM names n JOIN titles t ON t.imdb_id = n.imdb_id "
+               f"WHERE n.{column} = ?")
+        params: List = [value]
+        if kind:
+            sql += " AND t.type = ?"
+            params.append(kind)
+        return self._conn().execute(sql + f" LIMIT {MAX_FUZZY_CANDIDATES}", params).fetchall()
+
+    @staticmethod
+    def _pick(candidates: Sequence[Tuple[str, str, Optional[int]]], year: Optional[int]) -> Optional[str]:
+        if not candidates:
+            return None
+        if year is None:
+            # Without a year only an unambiguous title is trusted
+            ids = {imdb_id for _, imdb_id, _ in candidates}
+            return ids.pop() if len(ids) == 1 else None
+        close = [(abs((y or 0) - year), imdb_id) for _, imdb_id, y in candidates if y and abs(y - year) <= 1]
+        return min(close)[1] if close else None
+
+    def resolve(self, title: str, year: Optional[int] = None, kind: Optional[str] = None) -> Optional[str]:
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        exact = self._pick(self._candidates("norm", norm, kind), year)
+        if exact:
+            return exact
+
+        matcher = difflib.SequenceMatcher(b=norm)
+        scored = []
+        for cand_norm, imdb_id, cand_year in self._candidates("block", _block(norm), kind):
+            if year is not None and not (cand_year and abs(cand_year - year) <= 1):
+                continue
+            matcher.set_seq1(cand_norm)
+            if matcher.real_quick_ratio() < FUZZY_CUTOFF or matcher.quick_ratio() < FUZZY_CUTOFF:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= FUZZY_CUTOFF:
+                scored.append((ratio, imdb_id))
+        if not scored:
+            return None
+        top = max(ratio for ratio, _ in scored)
+        ids = {imdb_id for ratio, imdb_id in scored if ratio == top}
+        return ids.pop() if len(ids) == 1 else None
+
+    def resolve_many(self, queries: Iterable[Tuple[str, Optional[int], Optional[str]]]) -> List[Optional[str]]:
+        """Resolve (title, year, type) tuples, answering repeated queries once"""
+        memo: Dict[Tuple[str, Optional[int], Optional[str]], Optional[str]] = {}
+        results = []
+        for title, year, kind in queries:
+            key = (normalize_title(title), year, kind)
+            if key not in memo:
+                memo[key] = self.resolve(title, year, kind)
+            results.append(memo[key])
+        return results
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+
+
+_index: Optional[TitleIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_title_index() -> Optional[TitleIndex]:
+    """Process-wide index, or None when no index file has been built"""
+    global _index
+    path = settings.title_index_path or find_data_file(TITLE_INDEX_FILENAME)
+    if not path or not os.path.exists(path):
+        return None
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = TitleIndex(path)
+    return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the offline title index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build the index from title.basics.tsv(.gz) or a title,year,type,imdb_id table")
+    build.add_argument("source")
+    build.add_argument("--out", default=os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", TITLE_INDEX_FILENAME))
+    build.add_argument("--min-year", type=int, default=0)
+    query = sub.add_parser("resolve", help="resolve a title against the built index")
+    query.add_argument("title")
+    query.add_argument("--year", type=int)
+    query.add_argument("--type", choices=["movie", "series"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "build":
+        logger.info(f"Indexed {build_title_index(args.source, args.out, args.min_year)} titles into {args.out}")
+    else:
+        index = get_title_index()
+        print(index.resolve(args.title, args.year, args.type) if index else "No title index built")
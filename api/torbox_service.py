@@ -1,10 +1,20 @@
-import httpx
 from typing import Optional, Dict, Any, List
 from api.config import settings
+from api.http_client import get_http_client
+from api.swr_cache import SwrCache
+from api.upstream_guard import upstream_guard
+import hashlib
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Instant availability is global per hash; failed checks are retried after 30s
+availability_cache = SwrCache("torbox_availability", ttl=600, stale_ttl=3600, max_entries=20000,
+                              negative_ttl=30, persist=True)
+# A user's library, invalidated whenever this service adds or deletes a torrent
+library_cache = SwrCache("torbox_library", ttl=30, stale_ttl=300, max_entries=512, negative_ttl=5)
+
 
 class TorBoxService:
     def __init__(self, api_key: str):
@@ -14,31 +24,44 @@ class TorBoxService:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.user_key = hashlib.sha1(api_key.encode()).hexdigest()[:16]
+    
+    async def _request(self, method: str, path: str, timeout: float, **kwargs) -> httpx.Response:
+        """Call the TorBox API through its upstream guard"""
+        async with upstream_guard(self.base_url).attempt() as attempt:
+            response = await get_http_client().request(
+                method,
+                f"{self.base_url}{path}",
+                headers=self.headers,
+                timeout=timeout,
+                **kwargs
+            )
+            if response.status_code >= 500 or response.status_code == 429:
+                attempt.fail(f"HTTP {response.status_code}")
+            return response
     
     async def verify_api_key(self) -> bool:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/user/me",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                return response.status_code == 200
+            response = await self._request(
+                "GET",
+                "/api/user/me",
+                timeout=10.0
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Error verifying TorBox API key: {e}")
             return False
     
     async def get_user_info(self) -> Optional[Dict[str, Any]]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/user/me",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                if response.status_code == 200:
-                    return response.json().get("data")
-                return None
+            response = await self._request(
+                "GET",
+                "/api/user/me",
+                timeout=10.0
+            )
+            if response.status_code == 200:
+                return response.json().get("data")
+            return None
         except Exception as e:
             logger.error(f"Error getting TorBox user info: {e}")
             return None
@@ -49,50 +72,51 @@ class TorBoxService:
             if name:
                 data["name"] = name
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/torrents/createtorrent",
-                    headers=self.headers,
-                    json=data,
-                    timeout=30.0
-                )
-                if response.status_code == 200:
-                    return response.json().get("data")
-                logger.error(f"TorBox add magnet error: {response.text}")
-                return None
+            response = await self._request(
+                "POST",
+                "/api/torrents/createtorrent",
+                json=data,
+                timeout=30.0
+            )
+            if response.status_code == 200:
+                library_cache.invalidate(self.user_key)
+                return response.json().get("data")
+            logger.error(f"TorBox add magnet error: {response.text}")
+            return None
         except Exception as e:
             logger.error(f"Error adding magnet to TorBox: {e}")
             return None
     
     async def get_torrent_list(self) -> List[Dict[str, Any]]:
+        return await library_cache.get(self.user_key, self._fetch_torrent_list) or []
+    
+    async def _fetch_torrent_list(self) -> Optional[List[Dict[str, Any]]]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/torrents/mylist",
-                    headers=self.headers,
-                    timeout=15.0
-                )
-                if response.status_code == 200:
-                    return response.json().get("data", [])
-                return []
+            response = await self._request(
+                "GET",
+                "/api/torrents/mylist",
+                timeout=15.0
+            )
+            if response.status_code == 200:
+                return response.json().get("data", [])
+            return None
         except Exception as e:
             logger.error(f"Error getting TorBox torrent list: {e}")
-            return []
+            return None
     
     async def get_torrent_info(self, torrent_id: str) -> Optional[Dict[str, Any]]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/torrents/mylist",
-                    headers=self.headers,
-                    params={"id": torrent_id},
-                    timeout=15.0
-                )
-                if response.status_code == 200:
-                    data = response.json().get("data", [])
-                    if data:
-                        return data[0] if isinstance(data, list) else data
-                return None
+            response = await self._request(
+                "GET",
+                "/api/torrents/mylist",
+                params={"id": torrent_id},
+                timeout=15.0
+            )
+            if response.status_code == 200:
+                data = response.json().get("data", [])
+                if data:
+                    return data[0] if isinstance(data, list) else data
+            return None
         except Exception as e:
             logger.error(f"Error getting TorBox torrent info: {e}")
             return None
@@ -103,48 +127,51 @@ class TorBoxService:
             if file_id:
                 params["file_id"] = file_id
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/torrents/requestdl",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0
-                )
-                if response.status_code == 200:
-                    return response.json().get("data")
-                logger.error(f"TorBox download link error: {response.text}")
-                return None
+            response = await self._request(
+                "GET",
+                "/api/torrents/requestdl",
+                params=params,
+                timeout=30.0
+            )
+            if response.status_code == 200:
+                return response.json().get("data")
+            logger.error(f"TorBox download link error: {response.text}")
+            return None
         except Exception as e:
             logger.error(f"Error getting TorBox download link: {e}")
             return None
     
     async def check_cache(self, info_hash: str) -> bool:
+        return bool(await availability_cache.get(info_hash.lower(), lambda: self._fetch_cached(info_hash)))
+    
+    async def _fetch_cached(self, info_hash: str) -> Optional[bool]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/torrents/checkcached",
-                    headers=self.headers,
-                    params={"hash": info_hash},
-                    timeout=10.0
-                )
-                if response.status_code == 200:
-                    data = response.json().get("data", {})
-                    return data.get(info_hash, False)
-                return False
+            response = await self._request(
+                "GET",
+                "/api/torrents/checkcached",
+                params={"hash": info_hash},
+                timeout=10.0
+            )
+            if response.status_code == 200:
+                data = response.json().get("data", {})
+                return bool(data.get(info_hash, False))
+            return None
         except Exception as e:
             logger.error(f"Error checking TorBox cache: {e}")
-            return False
+            return None
     
     async def delete_torrent(self, torrent_id: str) -> bool:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/torrents/controltorrent",
-                    headers=self.headers,
-                    json={"torrent_id": torrent_id, "operation": "delete"},
-                    timeout=15.0
-                )
-                return response.status_code == 200
+            response = await self._request(
+                "POST",
+                "/api/torrents/controltorrent",
+                json={"torrent_id": torrent_id, "operation": "delete"},
+                timeout=15.0
+            )
+            if response.status_code == 200:
+                library_cache.invalidate(self.user_key)
+                return True
+            return False
         except Exception as e:
             logger.error(f"Error deleting TorBox torrent: {e}")
             return False
@@ -0,0 +1,101 @@
+"""
+Torrent file lists and episode file selection
+
+A torrent's file list is stored as [{"idx", "name", "size"}] in torrent
+order, where idx is the index Stremio expects as fileIdx and TorBox uses as
+its file id. Lists come from ingestion entries that carry .torrent metadata
+or from the first TorBox lookup of the torrent.
+
+Episode matching parses each file name (and its folders) with the release
+parser, so "E1" never matches "E10"-"E19" the way a substring would.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from api.release_parser import parse_release
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.m4v', '.ts', '.webm')
+
+# Forms the release parser leaves alone because they are too loose for titles
+_BARE_EPISODE = re.compile(r"(?<![A-Za-z0-9])E(\d{1,4})(?![A-Za-z0-9])", re.I)
+_CROSS_EPISODE = re.compile(r"(?<![A-Za-z0-9])(\d{1,2})x(\d{1,4})(?![A-Za-z0-9])", re.I)
+
+
+def normalize_files(files: Optional[Iterable[Any]]) -> Optional[List[Dict[str, Any]]]:
+    """File list from .torrent metadata, an ingestion entry or TorBox, or None if empty
+
+    Accepts {"path": [..], "length"} entries from .torrent info dicts,
+    {"name", "size"} entries (TorBox numbers them with "id") and plain names.
+    """
+    normalized = []
+    for position, entry in enumerate(files or []):
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        elif not isinstance(entry, dict):
+            continue
+        name = entry.get("name")
+        if name is None and entry.get("path") is not None:
+            path = entry["path"]
+            name = "/".join(path) if isinstance(path, (list, tuple)) else str(path)
+        if not name:
+            continue
+        idx = entry.get("idx", entry.get("id", position))
+        try:
+            idx = int(idx)
+        except (TypeError, ValueError):
+            idx = position
+        normalized.append({"idx": idx, "name": name, "size": int(entry.get("size", entry.get("length")) or 0)})
+    return normalized or None
+
+
+def is_video(file: Dict[str, Any]) -> bool:
+    return file.get("name", "").lower().endswith(VIDEO_EXTENSIONS)
+
+
+def _episode_numbers(name: str):
+    """(seasons, episodes) named by a file path"""
+    release = parse_release(name.replace("/", " / "))
+    seasons, episodes = set(release.seasons), set(release.episodes)
+    for match in _CROSS_EPISODE.finditer(name):
+        seasons.add(int(match.group(1)))
+        episodes.add(int(match.group(2)))
+    if not episodes:
+        episodes.update(int(e) for e in _BARE_EPISODE.findall(name))
+    return seasons, episodes
+
+
+def match_episode_file(files: List[Dict[str, Any]], season: int, episode: int) -> Optional[Dict[str, Any]]:
+    """Video file holding season/episode, preferring single-episode files, then the largest"""
+    candidates = []
+    for file in files:
+        if not is_video(file):
+            continue
+        seasons, episodes = _episode_numbers(file["name"])
+        if episode in episodes and (not seasons or season in seasons):
+            candidates.append((len(episodes) == 1, file.get("size", 0), file))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (c[0], c[1]))[2]
+
+
+def largest_video(files: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    videos = [f for f in files if is_video(f)]
+    return max(videos, key=lambda f: f.get("size", 0)) if videos else None
+
+
+def select_file(files: Optional[List[Dict[str, Any]]], episode_info: Optional[Dict[str, int]]) -> Optional[Dict[str, Any]]:
+    """File to play for a request: the episode's file, or the main video of a movie
+
+    Returns None for an episode that is not in the list, unless the torrent
+    holds a single video.
+    """
+    if not files:
+        return None
+    if episode_info:
+        match = match_episode_file(files, episode_info["season"], episode_info["episode"])
+        if match:
+            return match
+        videos = [f for f in files if is_video(f)]
+        return videos[0] if len(videos) == 1 else None
+    return largest_video(files)
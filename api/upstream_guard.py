@@ -0,0 +1,233 @@
+"""
+Per-host rate limiting and circuit breaking for upstream calls
+
+Every outbound call to TorBox, OMDb, TMDB or the scraped site goes through
+the guard for its host:
+
+    async with upstream_guard(url).attempt() as attempt:
+        response = await client.get(url, timeout=10.0)
+        if response.status_code >= 500:
+            attempt.fail(f"HTTP {response.status_code}")
+
+A token bucket spaces out requests to the same host. A circuit breaker
+opens after `upstream_failure_threshold` consecutive failures and then
+rejects calls at once with UpstreamUnavailable for `upstream_reset_timeout`
+seconds. After that one probe call is let through: if it succeeds the
+breaker closes, and if it fails the breaker opens again. Callers already
+fall back to empty results on errors, so an outage costs a failed
+lookup instead of a request held for the full timeout.
+
+Per-host rates come from UPSTREAM_RATE_LIMITS, e.g.
+"www.tamildhool.tech=2,api.torbox.app=10" (requests per second).
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling a host whose breaker is open or whose rate limit would stall the caller"""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Take a token; returns the delay before it may be used, or None if that exceeds max_wait"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            if delay > max_wait:
+                return None
+            self._tokens -= 1
+            return delay
+
+
+class Attempt:
+    """One guarded call; marks itself failed on exceptions or via fail()"""
+
+    def __init__(self):
+        self.failed = False
+        self.error: Optional[str] = None
+
+    def fail(self, reason: str = "failed"):
+        self.failed = True
+        self.error = reason
+
+
+class UpstreamGuard:
+    def __init__(self, host: str, rate: float, burst: int, failure_threshold: int,
+                 reset_timeout: float, max_wait: float):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_wait = max_wait
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "successes": 0, "failures": 0, "rejected": 0, "rate_limited": 0,
+                      "throttled_s": 0.0}
+
+    def _admit(self, max_wait: Optional[float]) -> float:
+        """Check the breaker and take a token; returns the delay to wait before calling"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.stats["rejected"] += 1
+                    raise UpstreamUnavailable(f"{self.host} circuit open: {self.last_error}")
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    self.stats["rejected"] += 1
+                    raise UpstreamUnavailable(f"{self.host} circuit half-open, probe in flight")
+                self._probing = True
+
+        delay = self.bucket.reserve(self.max_wait if max_wait is None else max_wait)
+        with self._lock:
+            if delay is None:
+                self._probing = False
+                self.stats["rate_limited"] += 1
+                raise UpstreamUnavailable(f"{self.host} rate limit exceeded")
+            self.stats["calls"] += 1
+            self.stats["throttled_s"] += delay
+        return delay
+
+    def _record(self, attempt: Attempt):
+        with self._lock:
+            self._probing = False
+            if not attempt.failed:
+                self.stats["successes"] += 1
+                if self.state != CLOSED:
+                    logger.info(f"Upstream {self.host} recovered, closing circuit")
+                self.state = CLOSED
+                self.consecutive_failures = 0
+                return
+
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            self.last_error = attempt.error
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"Upstream {self.host} failing ({attempt.error}), opening circuit "
+                                   f"for {self.reset_timeout}s")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def _release_probe(self):
+        with self._lock:
+            self._probing = False
+
+    @asynccontextmanager
+    async def attempt(self, max_wait: Optional[float] = None) -> AsyncIterator[Attempt]:
+        """Guard one call; max_wait overrides how long the caller will queue for a token"""
+        delay = self._admit(max_wait)
+        attempt = Attempt()
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            yield attempt
+        except asyncio.CancelledError:
+            # A cancelled caller says nothing about the upstream
+            self._release_probe()
+            raise
+        except Exception as e:
+            attempt.fail(f"{type(e).__name__}: {e}")
+            self._record(attempt)
+            raise
+        else:
+            self._record(attempt)
+
+    @contextmanager
+    def attempt_sync(self, max_wait: Optional[float] = None) -> Iterator[Attempt]:
+        """attempt() for blocking callers running in a worker thread"""
+        delay = self._admit(max_wait)
+        if delay:
+            time.sleep(delay)
+        attempt = Attempt()
+        try:
+            yield attempt
+        except Exception as e:
+            attempt.fail(f"{type(e).__name__}: {e}")
+            self._record(attempt)
+            raise
+        else:
+            self._record(attempt)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+            return {
+                "host": self.host,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+                "retry_in_s": retry_in,
+                "rate_per_s": self.bucket.rate,
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()}
+            }
+
+
+def _rate_limits() -> Dict[str, float]:
+    limits = {}
+    for entry in settings.upstream_rate_limits.split(","):
+        host, _, rate = entry.strip().partition("=")
+        if host and rate:
+            try:
+                limits[host.strip()] = float(rate)
+            except ValueError:
+                logger.warning(f"Ignoring invalid upstream rate limit {entry!r}")
+    return limits
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def upstream_guard(url: str) -> UpstreamGuard:
+    """Process-wide guard for the host of url"""
+    host = urlsplit(url).hostname or url
+    guard = _guards.get(host)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.get(host)
+            if guard is None:
+                rate = _rate_limits().get(host, settings.upstream_rate)
+                guard = UpstreamGuard(
+                    host, rate, settings.upstream_burst, settings.upstream_failure_threshold,
+                    settings.upstream_reset_timeout, settings.upstream_max_wait
+                )
+                _guards[host] = guard
+    return guard
+
+
+def upstream_status() -> Dict[str, Any]:
+    """State of every upstream host called so far"""
+    return {"upstreams": [guard.as_dict() for guard in sorted(_guards.values(), key=lambda g: g.host)]}
@@ -0,0 +1,87 @@
+"""
+Parse-time benchmark for the TamilDhool scraper
+
+Times parse_show_list, parse_latest_episodes and parse_episode_details on
+the saved fixture pages for every available parser backend, with and
+without restricted (SoupStrainer) parsing, and checks that every
+configuration extracts the same records.
+
+    python -m benchmarks.parse_benchmark [--iterations N]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from api import tamildhool_scraper as ts
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EPISODE_URL = "https://www.tamildhool.tech/sun-tv/sun-tv-serial/aadukalam/aadukalam-17-12-2025/"
+
+STRAINERS = ("ARTICLE_STRAINER", "EPISODE_STRAINER")
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def available_parsers() -> List[str]:
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def configure(parser: str, restricted: bool, saved: Dict[str, Any]):
+    ts._html_parser = parser
+    for name in STRAINERS:
+        setattr(ts, name, saved[name] if restricted else None)
+
+
+def time_call(func: Callable[[], Any], iterations: int) -> Tuple[float, Any]:
+    result = func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) * 1000 / iterations, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--iterations", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    cases = {
+        "channel_listing.html": lambda html: ts.parse_show_list(html, "Sun TV"),
+        "homepage.html": lambda html: ts.parse_latest_episodes(html, 500),
+        "episode.html": lambda html: ts.parse_episode_details(html, EPISODE_URL),
+    }
+    saved = {name: getattr(ts, name) for name in STRAINERS}
+    saved_parser = ts._html_parser
+
+    print(f"{'fixture':<22}{'parser':<13}{'mode':<12}{'ms/page':>10}{'speedup':>10}")
+    try:
+        for fixture, parse in cases.items():
+            html = load_fixture(fixture)
+            baseline_ms = None
+            expected = None
+            for parser in available_parsers():
+                for restricted in (False, True):
+                    configure(parser, restricted, saved)
+                    ms, result = time_call(lambda: parse(html), args.iterations)
+                    if expected is None:
+                        baseline_ms, expected = ms, result
+                    assert result == expected, f"{fixture}: {parser} restricted={restricted} extracted different records"
+                    mode = "restricted" if restricted else "full"
+                    print(f"{fixture:<22}{parser:<13}{mode:<12}{ms:>10.2f}{baseline_ms / ms:>9.1f}x")
+    finally:
+        configure(saved_parser, True, saved)
+
+
+if __name__ == "__main__":
+    main()
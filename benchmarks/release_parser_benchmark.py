@@ -0,0 +1,111 @@
+"""
+Release-name parser benchmark over a synthetic title corpus
+
+Compares the previous three-pass regex helpers (detect_quality, extract_year,
+clean_title and the series check, copied here as the baseline) with
+api.release_parser.parse_release, cold and memoized, and counts the titles
+on which the two disagree about quality.
+
+    python -m benchmarks.release_parser_benchmark [--titles N] [--unique N]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List, Optional
+
+from api import release_parser
+
+
+def legacy_detect_quality(title: str) -> str:
+    title_upper = title.upper()
+    if '2160P' in title_upper or '4K' in title_upper or 'UHD' in title_upper:
+        return '4K'
+    elif '1080P' in title_upper or 'FULL HD' in title_upper or 'FHD' in title_upper:
+        return '1080p'
+    elif '720P' in title_upper or 'HD' in title_upper:
+        return 'HD'
+    elif 'HDCAM' in title_upper:
+        return 'HDCAM'
+    elif 'CAM' in title_upper or 'CAMRIP' in title_upper:
+        return 'CAM'
+    elif 'HDTS' in title_upper or 'TS' in title_upper:
+        return 'HDTS'
+    return 'Unknown'
+
+
+def legacy_extract_year(title: str) -> Optional[int]:
+    match = re.search(r'\b(19|20)\d{2}\b', title)
+    return int(match.group(0)) if match else None
+
+
+def legacy_clean_title(title: str) -> str:
+    clean = re.sub(r'\b(19|20)\d{2}\b', '', title)
+    clean = re.sub(r'\b(720p|1080p|2160p|4K|UHD|HDRip|BluRay|WEB-DL|WEBRip|HDCAM|CAM|DVDRip|x264|x265|HEVC|AAC|Tamil|Hindi|English|Dual Audio|Multi Audio)\b', '', clean, flags=re.IGNORECASE)
+    clean = re.sub(r'[._\-\[\]()]', ' ', clean)
+    return ' '.join(clean.split()).strip()
+
+
+def legacy_parse(title: str):
+    is_series = any(p in title.upper() for p in ['S01', 'S02', 'SEASON', 'EPISODE', 'EP0', 'EP1'])
+    return legacy_detect_quality(title), legacy_extract_year(title), legacy_clean_title(title), is_series
+
+
+NAMES = ["Ponniyin Selvan", "Jailer", "Leo", "Vikram", "Master", "Kayal", "Ethirneechal", "Viduthalai",
+         "Maaveeran", "Thunivu", "Varisu", "Good Night", "Por Thozhil", "Amaran", "Raayan", "Vettaiyan",
+         "Siragadikka Aasai", "Baakiyalakshmi", "Sweet Kaaram Coffee", "Thalaivar Thambi Thalaimaiyil"]
+TAGS = [["2160p", "1080p", "720p", "480p", "HD", ""], ["WEB-DL", "WEBRip", "HDRip", "BluRay", "HDCAM", "CAMRip",
+        "HDTS", "TRUE WEB-DL", ""], ["x264", "x265", "HEVC", ""], ["AAC", "DD+5.1", "AAC 2.0", "Dual Audio", ""],
+        ["Tamil", "Tamil + Telugu", "Tam + Hin + Eng", ""]]
+
+
+def synthetic_titles(count: int, unique: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(unique):
+        parts = [rng.choice(NAMES)]
+        if rng.random() < 0.3:
+            parts.append(f"S0{rng.randint(1, 3)}E{rng.randint(1, 120):02d}" +
+                         (f"-E{rng.randint(121, 140)}" if rng.random() < 0.3 else ""))
+        else:
+            parts.append(f"({rng.randint(1995, 2025)})" if rng.random() < 0.5 else str(rng.randint(1995, 2025)))
+        parts.extend(tag for tag in (rng.choice(options) for options in TAGS) if tag)
+        separator = rng.choice([" ", ".", " - "])
+        pool.append(separator.join(parts))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(label: str, func, titles: List[str]) -> float:
+    started = time.perf_counter()
+    func(titles)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{elapsed * 1000:>10.1f} ms{len(titles) / elapsed:>14,.0f} titles/s")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--titles", type=int, default=200_000)
+    arg_parser.add_argument("--unique", type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    titles = synthetic_titles(args.titles, args.unique)
+    print(f"{len(titles):,} titles, {len(set(titles)):,} unique")
+
+    timed("legacy regex passes", lambda ts: [legacy_parse(t) for t in ts], titles)
+    release_parser.parse_release.cache_clear()
+    timed("parse_release (no memo)", lambda ts: [release_parser.parse_release.__wrapped__(t) for t in ts], titles)
+    timed("parse_releases (memo)", release_parser.parse_releases, titles)
+    print(f"memo: {release_parser.cache_info()}")
+
+    unique_titles = sorted(set(titles))
+    disagreements = [(t, legacy_detect_quality(t), release_parser.parse_release(t).quality)
+                     for t in unique_titles if legacy_detect_quality(t) != release_parser.parse_release(t).quality]
+    print(f"quality disagreements with the legacy helpers: {len(disagreements):,} of {len(unique_titles):,}")
+    for title, old, new in disagreements[:5]:
+        print(f"  {title!r}: {old} -> {new}")
+
+
+if __name__ == "__main__":
+    main()
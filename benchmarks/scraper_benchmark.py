@@ -0,0 +1,156 @@
+"""
+End-to-end benchmark and regression check for the TamilDhool scraper
+
+Runs each scraper entry point against the local stand-in server and reports
+pages/sec, parse ms/page and peak traced memory. The extracted titles, URLs,
+posters and video sources are compared with benchmarks/fixtures/expected.json.
+
+    python -m benchmarks.scraper_benchmark [--iterations N] [--record]
+
+--record rewrites expected.json from the current output; review the diff
+before committing it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from api import tamildhool_scraper as ts
+from api.config import settings
+from benchmarks.standin_server import (
+    CANONICAL_BASE, EPISODE_OUTSIDE_PATH, EPISODE_PATH, FIXTURES_DIR, StandInServer
+)
+
+EXPECTED_PATH = os.path.join(FIXTURES_DIR, "expected.json")
+
+PARSE_FUNCTIONS = ("parse_show_list", "parse_latest_episodes", "parse_episode_details")
+
+
+class ParseTimer:
+    """Wrap the scraper's parse functions to time them and count parsed pages"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.pages = 0
+        self._originals = {}
+
+    def _wrap(self, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - started
+                self.pages += 1
+        return timed
+
+    def __enter__(self) -> "ParseTimer":
+        for name in PARSE_FUNCTIONS:
+            self._originals[name] = getattr(ts, name)
+            setattr(ts, name, self._wrap(self._originals[name]))
+        return self
+
+    def __exit__(self, *exc):
+        for name, func in self._originals.items():
+            setattr(ts, name, func)
+
+
+def _posts(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{"title": r["title"], "url": r["url"], "poster": r["poster"]} for r in records]
+
+
+def entry_points(base_url: str) -> Dict[str, Callable[[], Any]]:
+    """Entry point name -> callable returning its comparable output"""
+    def crawl():
+        result = asyncio.run(ts.crawl_site(latest_limit=40))
+        return {
+            "shows": len(result["shows"]),
+            "unique_show_urls": len({s["url"] for s in result["shows"]}),
+            "episodes": _posts(result["episodes"])
+        }
+
+    return {
+        "scrape_show_list": lambda: _posts(ts.scrape_show_list("sun-tv", "serials", max_pages=5)),
+        "scrape_latest_episodes": lambda: _posts(ts.scrape_latest_episodes(40)),
+        "scrape_episode_details": lambda: [
+            ts.scrape_episode_details(base_url + EPISODE_PATH),
+            ts.scrape_episode_details(base_url + EPISODE_OUTSIDE_PATH)
+        ],
+        "crawl_site": crawl,
+    }
+
+
+def canonical(value: Any, base_url: str) -> Any:
+    """Swap the stand-in's address back to the live host so output is stable"""
+    return json.loads(json.dumps(value).replace(base_url, CANONICAL_BASE))
+
+
+def run(iterations: int, record: bool) -> int:
+    settings.http_cache_dir = ""
+    settings.upstream_rate = 0  # measure the scraper, not the politeness limit
+    saved_base = ts.BASE_URL
+    results = {}
+    failures = []
+
+    expected = {}
+    if not record:
+        with open(EXPECTED_PATH, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+
+    print(f"parser: {ts.get_html_parser()}")
+    print(f"{'entry point':<24}{'pages':>7}{'pages/s':>10}{'parse ms/page':>15}{'peak KiB':>10}")
+    with StandInServer() as standin:
+        ts.BASE_URL = standin.url
+        try:
+            for name, func in entry_points(standin.url).items():
+                output = canonical(func(), standin.url)
+                results[name] = output
+                if not record and output != expected.get(name):
+                    failures.append(name)
+
+                hits_before = standin.hits
+                with ParseTimer() as timer:
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        func()
+                    elapsed = time.perf_counter() - started
+
+                # Memory is traced in a separate run so tracing overhead stays out of the timings
+                tracemalloc.start()
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                pages = (standin.hits - hits_before) / (iterations + 1)
+                parse_ms = timer.seconds * 1000 / max(timer.pages, 1)
+                print(f"{name:<24}{pages:>7.0f}{pages * iterations / elapsed:>10.1f}{parse_ms:>15.2f}{peak / 1024:>10.0f}")
+        finally:
+            ts.BASE_URL = saved_base
+
+    if record:
+        with open(EXPECTED_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Recorded expected output to {EXPECTED_PATH}")
+        return 0
+
+    for name in failures:
+        print(f"FAIL {name}: output differs from expected.json", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--iterations", type=int, default=5)
+    arg_parser.add_argument("--record", action="store_true", help="rewrite expected.json from the current output")
+    args = arg_parser.parse_args()
+    sys.exit(run(args.iterations, args.record))
+
+
+if __name__ == "__main__":
+    main()
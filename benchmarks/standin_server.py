@@ -0,0 +1,110 @@
+"""
+Local HTTP stand-in for tamildhool.tech that serves the saved fixture pages
+
+Absolute links in the fixtures are rewritten to point back at the stand-in,
+so pagination and crawling stay local. Responses carry an ETag and honour
+If-None-Match, which lets the conditional-GET path be exercised as well.
+"""
+
+import hashlib
+import http.server
+import os
+import threading
+from typing import Dict, Optional
+
+from api.tamildhool_scraper import CHANNELS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CANONICAL_BASE = "https://www.tamildhool.tech"
+
+EPISODE_PATH = "/sun-tv/sun-tv-serial/aadukalam/aadukalam-17-12-2025/"
+EPISODE_OUTSIDE_PATH = "/sun-tv/sun-tv-serial/aadukalam/aadukalam-18-12-2025/"
+
+
+def default_routes() -> Dict[str, str]:
+    """URL path -> fixture file; every channel listing serves the same two pages"""
+    routes = {
+        "/": "homepage.html",
+        "/page/2/": "homepage_page2.html",
+        EPISODE_PATH: "episode.html",
+        EPISODE_OUTSIDE_PATH: "episode_player_outside_post.html",
+    }
+    for channel in CHANNELS.values():
+        for key in ("serials", "shows"):
+            if channel.get(key):
+                routes[channel[key]] = "channel_listing.html"
+                routes[f"{channel[key]}page/2/"] = "channel_listing_page2.html"
+    return routes
+
+
+class StandInServer:
+    """Serve fixture pages on 127.0.0.1; use as a context manager"""
+
+    def __init__(self, routes: Optional[Dict[str, str]] = None):
+        self.routes = routes or default_routes()
+        self.hits = 0
+        self.not_modified = 0
+        self._bodies: Dict[str, bytes] = {}
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _body(self, fixture: str) -> bytes:
+        if fixture not in self._bodies:
+            with open(os.path.join(FIXTURES_DIR, fixture), "r", encoding="utf-8") as f:
+                self._bodies[fixture] = f.read().replace(CANONICAL_BASE, self.url).encode("utf-8")
+        return self._bodies[fixture]
+
+    def _handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.hits += 1
+                fixture = server.routes.get(self.path.split("?")[0])
+                if not fixture:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = server._body(fixture)
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=UTF-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    with StandInServer() as standin:
+        print(f"Serving fixtures on {standin.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,28 @@
+from api import catalog_data
+
+
+class FakeCatalog:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_replaced_catalog_is_closed_on_the_next_swap(monkeypatch):
+    catalogs = [FakeCatalog(name) for name in "abc"]
+    loads = iter(catalogs)
+    keys = iter(range(10))
+    monkeypatch.setattr(catalog_data, "_source_file_key", lambda: next(keys))
+    monkeypatch.setattr(catalog_data, "load_catalog", lambda: next(loads))
+    monkeypatch.setattr(catalog_data, "_state", None)
+    monkeypatch.setattr(catalog_data, "_retired", None)
+
+    first, second, third = catalogs
+    assert catalog_data.get_catalog() is first
+    assert catalog_data.check_for_update()
+    assert catalog_data.get_catalog() is second and not first.closed
+    assert catalog_data.check_for_update()
+    assert catalog_data.get_catalog() is third
+    assert first.closed and not second.closed
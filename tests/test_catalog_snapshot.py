@@ -0,0 +1,81 @@
+import itertools
+import json
+import sqlite3
+
+from api.catalog_snapshot import CatalogSnapshot, write_snapshot
+from api.storage_backends import build_sqlite_catalog
+
+DATA = {
+    "last_updated": "2025-12-17T06:00:00",
+    "movies": [{"id": "ts-leo", "imdb_id": "tt15654328", "type": "movie", "title": "Leo"}],
+    "series": [{"id": "ts-kayal", "type": "series", "title": "Kayal", "episodes": [
+        {"id": "ts-kayal:2025-12-16", "content_id": "ts-kayal", "episode_date": "2025-12-16"}
+    ]}],
+    "episodes": [{"id": "ts-kayal:2025-12-16", "content_id": "ts-kayal", "episode_date": "2025-12-16"}],
+}
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    version = write_snapshot(DATA, path)
+
+    snapshot = CatalogSnapshot(path)
+    try:
+        assert snapshot.version == version
+        assert snapshot.last_updated == DATA["last_updated"]
+        assert snapshot.get("tt15654328")["title"] == "Leo"
+        assert snapshot.get("ts-kayal")["title"] == "Kayal"
+        assert snapshot.get("tt0000000") is None
+        assert [m["id"] for m in snapshot.iter_list("movies")] == ["ts-leo"]
+        assert snapshot.count("episodes") == 1
+    finally:
+        snapshot.close()
+    assert list(tmp_path.iterdir()) == [tmp_path / "catalog.snap"]
+
+
+def test_snapshot_version_follows_records(tmp_path):
+    first = write_snapshot(DATA, str(tmp_path / "a.snap"))
+    same = write_snapshot(dict(DATA, last_updated="2025-12-18T06:00:00"), str(tmp_path / "b.snap"))
+    changed = write_snapshot(dict(DATA, movies=[]), str(tmp_path / "c.snap"))
+    assert first == same != changed
+
+
+def test_sqlite_catalog_from_iterator(tmp_path):
+    path = str(tmp_path / "catalog.sqlite3")
+    count = build_sqlite_catalog(path, itertools.chain(DATA["movies"], DATA["series"]), [])
+    assert count == 2
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT id, data FROM content ORDER BY position").fetchall()
+        episodes = conn.execute("SELECT id FROM episodes").fetchall()
+    finally:
+        conn.close()
+    assert [(r[0], json.loads(r[1])["title"]) for r in rows] == [("ts-leo", "Leo"), ("ts-kayal", "Kayal")]
+    assert episodes == [("ts-kayal:2025-12-16",)]
+
+
+def test_shipped_snapshot_behind_the_store_is_not_served(tmp_path, monkeypatch):
+    from api import catalog_data
+    from api.catalog_snapshot import SNAPSHOT_FILENAME
+    from api.record_store import RecordStore, RECORD_STORE_DIRNAME
+
+    store = RecordStore(str(tmp_path / RECORD_STORE_DIRNAME))
+    store.save(DATA)
+    catalog_data.write_store_snapshot(store, str(tmp_path / SNAPSHOT_FILENAME))
+    monkeypatch.setattr(catalog_data, "find_data_file",
+                        lambda name: str(tmp_path / name) if (tmp_path / name).exists() else None)
+    monkeypatch.setattr(catalog_data.tempfile, "gettempdir", lambda: str(tmp_path / "tmp"))
+
+    shipped = catalog_data.load_catalog()
+    assert shipped.path == str(tmp_path / SNAPSHOT_FILENAME)
+    assert shipped.store_seq == 1
+    shipped.close()
+
+    store.save(dict(DATA, movies=[]))
+    derived = catalog_data.load_catalog()
+    try:
+        assert derived.path.startswith(str(tmp_path / "tmp"))
+        assert derived.store_seq == 2
+        assert derived.get("tt15654328") is None
+    finally:
+        derived.close()
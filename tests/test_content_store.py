@@ -0,0 +1,52 @@
+from api import content_store
+from api.storage_backends import StorageBackend
+
+
+class RecordingBackend(StorageBackend):
+    """Accepts writes and records the content generation seen while each one runs"""
+
+    writable = True
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.generations_during_write = []
+
+    def _write(self, content_id):
+        self.generations_during_write.append(content_store.content_generation(content_id))
+        return not self.fail
+
+    def add_torrent(self, torrent_data):
+        return self._write(torrent_data["content_id"])
+
+    def add_episode(self, episode_data):
+        return self._write(episode_data["content_id"])
+
+
+def test_write_bumps_generation(monkeypatch):
+    monkeypatch.setattr(content_store, "get_backend", lambda: RecordingBackend())
+    before = content_store.content_generation("tt_write_bump")
+
+    assert content_store.add_torrent({"content_id": "tt_write_bump", "info_hash": "c" * 40})
+
+    assert content_store.content_generation("tt_write_bump") == before + 1
+
+
+def test_generation_bumps_after_the_write(monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(content_store, "get_backend", lambda: backend)
+    before = content_store.content_generation("tt_write_order")
+
+    assert content_store.add_torrent({"content_id": "tt_write_order", "info_hash": "a" * 40})
+    assert content_store.add_episode({"content_id": "tt_write_order", "id": "tt_write_order:1:1"})
+
+    assert backend.generations_during_write == [before, before + 1]
+    assert content_store.content_generation("tt_write_order") == before + 2
+
+
+def test_failed_write_leaves_generation_alone(monkeypatch):
+    monkeypatch.setattr(content_store, "get_backend", lambda: RecordingBackend(fail=True))
+    before = content_store.content_generation("tt_write_failed")
+
+    assert not content_store.add_torrent({"content_id": "tt_write_failed", "info_hash": "b" * 40})
+
+    assert content_store.content_generation("tt_write_failed") == before
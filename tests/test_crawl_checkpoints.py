@@ -0,0 +1,18 @@
+from api.crawl_checkpoints import CrawlCheckpoints
+
+
+def test_unchanged_crawl_saves_identical_file(tmp_path):
+    path = tmp_path / "crawl_checkpoints.json"
+    checkpoints = CrawlCheckpoints(str(path))
+    checkpoints.record_newest("sun-tv", ["https://example.test/a", "https://example.test/b"], "2025-12-17")
+    checkpoints.record_backfill("sun-tv", 3, True)
+    checkpoints.save()
+    first = path.read_bytes()
+
+    again = CrawlCheckpoints.load(str(path))
+    again.record_newest("sun-tv", ["https://example.test/a", "https://example.test/b"], "2025-12-17")
+    again.record_backfill("sun-tv", 3, True)
+    again.save()
+
+    assert path.read_bytes() == first
+    assert again.backfill_page("sun-tv") == 4
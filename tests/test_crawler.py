@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+
+from api.crawler import Crawler
+
+
+def test_fetch_retries_retryable_status():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, text="<html>ok</html>")
+
+    async def run():
+        async with Crawler(retries=3, backoff=0) as crawler:
+            await crawler._client.aclose()
+            crawler._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await crawler.fetch("http://crawler-retry.test/page"), crawler.stats
+
+    html, stats = asyncio.run(run())
+    assert html == "<html>ok</html>"
+    assert len(calls) == 3
+    assert stats.retries == 2
+    assert stats.errors == 0
+
+
+def test_fetch_gives_up_after_retries():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run():
+        async with Crawler(retries=2, backoff=0) as crawler:
+            await crawler._client.aclose()
+            crawler._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return await crawler.fetch("http://crawler-giveup.test/page"), crawler.stats
+
+    html, stats = asyncio.run(run())
+    assert html is None
+    assert stats.retries == 2
+    assert stats.errors == 1
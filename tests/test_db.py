@@ -0,0 +1,27 @@
+from api import db
+
+
+def test_init_db_retries_after_backoff(monkeypatch, tmp_path):
+    path = tmp_path / "missing" / "tamilstream.db"
+    monkeypatch.setattr(db, "DATABASE_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(db, "engine", None)
+    monkeypatch.setattr(db, "SessionLocal", None)
+    monkeypatch.setattr(db, "_init_result", None)
+    monkeypatch.setattr(db, "_init_failures", 0)
+    monkeypatch.setattr(db, "_init_retry_at", 0.0)
+
+    assert db.init_db() is False
+    path.parent.mkdir()
+    # Within the backoff the failure is reused
+    assert db.init_db() is False
+    assert db._init_failures == 1
+
+    monkeypatch.setattr(db, "_init_retry_at", 0.0)
+    try:
+        assert db.init_db() is True
+        session = db.get_db()
+        assert session is not None
+        session.close()
+        assert db._init_failures == 0
+    finally:
+        db.engine.dispose()
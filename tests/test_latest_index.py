@@ -0,0 +1,69 @@
+from api import content_store
+from api.latest_index import LatestIndex
+from api.storage_backends import StorageBackend
+
+
+class ShowsBackend(StorageBackend):
+    writable = True
+
+    def __init__(self, shows):
+        self.shows = {show["id"]: show for show in shows}
+        self.episodes = {show["id"]: [] for show in shows}
+        self.on_write = None
+
+    def get_all_content(self, content_type=None):
+        return [s for s in self.shows.values() if not content_type or s["type"] == content_type]
+
+    def get_content_by_id(self, content_id):
+        return self.shows.get(content_id)
+
+    def get_episodes_for_content(self, content_id):
+        return sorted(self.episodes.get(content_id, []), key=lambda e: e["episode_date"])
+
+    def add_episode(self, episode_data):
+        if self.on_write:
+            # A request served while the write is still in progress
+            self.on_write()
+        self.episodes[episode_data["content_id"]].append(episode_data)
+        return True
+
+
+def show(show_id, channel):
+    return {"id": show_id, "type": "series", "title": show_id.title(), "channel": channel}
+
+
+def names(metas):
+    return [m["name"] for m in metas]
+
+
+def test_written_episode_moves_show_to_the_top(monkeypatch):
+    backend = ShowsBackend([show("anna", "Sun TV"), show("dhanam", "Vijay TV")])
+    monkeypatch.setattr(content_store, "get_backend", lambda: backend)
+    backend.add_episode({"content_id": "anna", "episode_date": "2025-12-17", "title": "Anna 17-12"})
+    backend.add_episode({"content_id": "dhanam", "episode_date": "2025-12-16", "title": "Dhanam 16-12"})
+    index = LatestIndex()
+    assert names(index.page()[0]) == ["Anna", "Dhanam"]
+    backend.on_write = index.sync
+
+    content_store.add_episode({"content_id": "dhanam", "episode_date": "2025-12-18", "title": "Dhanam 18-12"})
+
+    metas, _ = index.page()
+    assert names(metas) == ["Dhanam", "Anna"]
+    assert metas[0]["releaseInfo"] == "2025-12-18"
+    assert names(index.page(channel="Vijay TV")[0]) == ["Dhanam"]
+    assert index.stats["rescans"] == 1
+
+
+def test_cursor_continues_after_last_show(monkeypatch):
+    backend = ShowsBackend([show(f"show{i}", "Sun TV") for i in range(5)])
+    monkeypatch.setattr(content_store, "get_backend", lambda: backend)
+    for i in range(5):
+        backend.add_episode({"content_id": f"show{i}", "episode_date": f"2025-12-1{i}"})
+    index = LatestIndex()
+
+    first, cursor = index.page(limit=2)
+    second, cursor = index.page(cursor=cursor, limit=2)
+    third, cursor = index.page(cursor=cursor, limit=2)
+
+    assert names(first + second + third) == ["Show4", "Show3", "Show2", "Show1", "Show0"]
+    assert cursor is None
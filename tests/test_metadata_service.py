@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+
+from api import metadata_service
+from api.swr_cache import SwrCache
+
+FOUND = {"Response": "True", "Title": "Leo", "Year": "2023", "Poster": "https://example.test/leo.jpg"}
+
+
+def lookup_twice(monkeypatch, responses):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(metadata_service, "get_http_client", lambda: client)
+    monkeypatch.setattr(metadata_service, "TMDB_API_KEY", "")
+    monkeypatch.setattr(metadata_service, "metadata_cache",
+                        SwrCache("metadata_test", ttl=86400, negative_ttl=3600))
+
+    async def run():
+        try:
+            return [await metadata_service.get_poster_for_imdb("tt15654328") for _ in range(2)]
+        finally:
+            await client.aclose()
+    return asyncio.run(run()), len(requests)
+
+
+def test_upstream_error_is_not_cached(monkeypatch):
+    posters, calls = lookup_twice(monkeypatch, [httpx.Response(503), httpx.Response(200, json=FOUND)])
+    assert posters == [None, FOUND["Poster"]]
+    assert calls == 2
+
+
+def test_quota_error_is_not_cached(monkeypatch):
+    quota = {"Response": "False", "Error": "Request limit reached!"}
+    posters, calls = lookup_twice(monkeypatch, [httpx.Response(200, json=quota), httpx.Response(200, json=FOUND)])
+    assert posters == [None, FOUND["Poster"]]
+    assert calls == 2
+
+
+def test_missing_title_is_cached(monkeypatch):
+    missing = {"Response": "False", "Error": "Incorrect IMDb ID."}
+    posters, calls = lookup_twice(monkeypatch, [httpx.Response(200, json=missing), httpx.Response(200, json=FOUND)])
+    assert posters == [None, None]
+    assert calls == 1
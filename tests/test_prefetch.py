@@ -0,0 +1,54 @@
+import asyncio
+
+from api import stremio_routes
+from api.models import UserConfig
+from api.prefetch import Prefetcher
+
+
+def schedule_next(monkeypatch, config):
+    prefetcher = Prefetcher(per_user=2, ttl=60)
+    monkeypatch.setattr(stremio_routes, "prefetcher", prefetcher)
+
+    async def build_streams(raw_id, user_config, resolve_links=False):
+        return []
+
+    monkeypatch.setattr(stremio_routes, "build_streams", build_streams)
+
+    async def run():
+        stremio_routes.prefetch_next_episode("series", "tt1234567:1:1", config, UserConfig())
+        await prefetcher.shutdown()
+    asyncio.run(run())
+    return prefetcher.stats["scheduled"]
+
+
+def test_prefetch_is_keyed_by_config(monkeypatch):
+    assert schedule_next(monkeypatch, "eyJ0b3Jib3hfYXBpX2tleSI6IiJ9") == 1
+
+
+def test_anonymous_requests_are_not_prefetched(monkeypatch):
+    assert schedule_next(monkeypatch, None) == 0
+
+
+def test_repeated_request_keeps_the_running_prefetch(monkeypatch):
+    prefetcher = Prefetcher(per_user=2, ttl=60)
+    monkeypatch.setattr(stremio_routes, "prefetcher", prefetcher)
+    built = []
+
+    async def build_streams(raw_id, user_config, resolve_links=True):
+        built.append(raw_id)
+        await asyncio.sleep(0.05)
+        return [{"title": raw_id}]
+
+    monkeypatch.setattr(stremio_routes, "build_streams", build_streams)
+    config = "eyJ0b3Jib3hfYXBpX2tleSI6IiJ9"
+
+    async def run():
+        await stremio_routes.handle_stream("series", "tt1234567:1:1.json", config)
+        await stremio_routes.handle_stream("series", "tt1234567:1:1.json", config)
+        # The request for N+1 joins the prefetch's single-flight computation
+        await stremio_routes.handle_stream("series", "tt1234567:1:2.json", config)
+        await prefetcher.shutdown()
+    asyncio.run(run())
+
+    assert prefetcher.stats["cancelled"] == 0
+    assert built.count("tt1234567:1:2") == 1
@@ -0,0 +1,56 @@
+import pytest
+
+from api.release_parser import parse_release
+
+
+@pytest.mark.parametrize("name, resolution", [
+    ("Leo (2023) Tamil Full HD 1080p WEB-DL", "1080p"),
+    ("Leo 2023 Tamil Full HD WEB-DL", "1080p"),
+    ("Leo.2023.Tamil.Full.HD.x264", "1080p"),
+    ("Leo 2023 Tamil FullHD AAC", "1080p"),
+    ("Leo 2023 Tamil HD HDRip", "720p"),
+    ("Leo 2023 Tamil HD 1080p HDRip", "1080p"),
+])
+def test_resolution(name, resolution):
+    assert parse_release(name).resolution == resolution
+
+
+@pytest.mark.parametrize("name, title, year", [
+    ("2.0 (2018) Tamil 1080p WEB-DL", "2.0", 2018),
+    ("1917 (2019) English 720p BluRay", "1917", 2019),
+    ("English Vinglish (2012) Tamil HDRip", "English Vinglish", 2012),
+    ("Leo.2023.Tamil.1080p.WEB-DL.x264.DD5.1", "Leo", 2023),
+])
+def test_leading_tokens_stay_in_title(name, title, year):
+    release = parse_release(name)
+    assert release.title == title
+    assert release.year == year
+
+
+@pytest.mark.parametrize("name, title, seasons, episodes", [
+    ("Show.S01.E05.Tamil.720p.HDTV", "Show", (1,), (5,)),
+    ("Show S01 E05 Tamil 720p", "Show", (1,), (5,)),
+    ("Show S01E05 Tamil 720p", "Show", (1,), (5,)),
+    ("Kayal S01E101-E105 Tamil 720p HDTV", "Kayal", (1,), (101, 102, 103, 104, 105)),
+    ("Show S01-S02 Tamil 1080p", "Show", (1, 2), ()),
+    ("Show S02 Tamil 1080p", "Show", (2,), ()),
+    ("Anbe Vaa E05 720p", "Anbe Vaa", (), (5,)),
+    ("Anbe.Vaa.E05-07.Tamil.HDTV", "Anbe Vaa", (), (5, 6, 7)),
+])
+def test_season_episode(name, title, seasons, episodes):
+    release = parse_release(name)
+    assert release.title == title
+    assert release.seasons == seasons
+    assert release.episodes == episodes
+
+
+@pytest.mark.parametrize("name, quality", [
+    ("Leo (2023) Tamil HDRip 700MB", "HD"),
+    ("Leo 2023 Tamil WEB-DL x264", "HD"),
+    ("Leo 2023 Tamil DVDRip XviD", "SD"),
+    ("Leo 2023 Tamil 1080p HDRip", "1080p"),
+    ("Leo 2023 Tamil HDCAM", "HDCAM"),
+    ("Leo 2023 Tamil x264", "Unknown"),
+])
+def test_quality(name, quality):
+    assert parse_release(name).quality == quality
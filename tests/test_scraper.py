@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+
+from api import scraper
+from api.scraper import RssSource
+
+FEED = """<?xml version="1.0"?>
+<rss version="2.0" xmlns:torrent="http://xmlns.ezrss.it/0.1/">
+  <channel>
+    <item>
+      <title>Leo 2023 Tamil 1080p WEB-DL</title>
+      <link>magnet:?xt=urn:btih:aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa</link>
+      <torrent:contentLength>2147483648</torrent:contentLength>
+      <torrent:seeds>42</torrent:seeds>
+      <torrent:peers>7</torrent:peers>
+    </item>
+    <item>
+      <title>Jailer 2023 Tamil 720p</title>
+      <enclosure url="magnet:?xt=urn:btih:bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb" length="1048576"/>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def collect(source):
+    async def run():
+        return [entry async for entry in source.entries()]
+    return asyncio.run(run())
+
+
+def stub_client(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scraper, "get_http_client", lambda: client)
+
+
+def test_rss_source_reads_feed(monkeypatch):
+    stub_client(monkeypatch, lambda request: httpx.Response(200, text=FEED))
+
+    entries = collect(RssSource("http://rss-feed.test/feed"))
+
+    assert [e["title"] for e in entries] == ["Leo 2023 Tamil 1080p WEB-DL", "Jailer 2023 Tamil 720p"]
+    assert entries[0]["magnet"].startswith("magnet:?xt=urn:btih:aaaa")
+    assert entries[0]["size"] == "2048 MB"
+    assert (entries[0]["seeders"], entries[0]["leechers"]) == (42, 7)
+    assert entries[1]["magnet"].startswith("magnet:?xt=urn:btih:bbbb")
+    assert entries[1]["source"] == "rss-feed.test"
+
+
+def test_rss_source_yields_nothing_on_error_status(monkeypatch):
+    stub_client(monkeypatch, lambda request: httpx.Response(404))
+
+    assert collect(RssSource("http://rss-missing.test/feed")) == []
+
+
+class ListSource(scraper.TorrentSource):
+    def __init__(self, entries):
+        self._entries = entries
+
+    async def entries(self):
+        for entry in self._entries:
+            yield entry
+
+
+def test_pipeline_counts_only_new_content(monkeypatch):
+    stored_content = {}
+    stored_torrents = {}
+
+    def upsert_batch(contents, torrents):
+        stored_content.update((c["id"], c) for c in contents)
+        stored_torrents.update((t["info_hash"], t) for t in torrents)
+        return {"content": len(contents), "torrents": len(torrents)}
+
+    monkeypatch.setattr(scraper, "upsert_batch", upsert_batch)
+    monkeypatch.setattr(scraper, "get_content_by_id", stored_content.get)
+    monkeypatch.setattr(scraper, "get_title_index", lambda: None)
+    entries = [{"title": "Leo 2023 Tamil 1080p WEB-DL",
+                "magnet": "magnet:?xt=urn:btih:aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"}]
+
+    first = asyncio.run(scraper.IngestPipeline(scraper.TamilContentScraper(), [ListSource(entries)]).run())
+    second = asyncio.run(scraper.IngestPipeline(scraper.TamilContentScraper(), [ListSource(entries)]).run())
+
+    assert (first["new_content"], first["upserted_torrents"]) == (1, 1)
+    assert (second["new_content"], second["upserted_torrents"]) == (0, 1)
+
+
+def test_pipeline_on_read_only_backend_skips_instead_of_failing(monkeypatch):
+    class ReadOnly:
+        writable = False
+
+    monkeypatch.setattr(scraper, "get_backend", lambda: ReadOnly())
+    monkeypatch.setattr(scraper, "upsert_batch", lambda contents, torrents: {"content": 0, "torrents": 0})
+    monkeypatch.setattr(scraper, "get_content_by_id", lambda content_id: None)
+    monkeypatch.setattr(scraper, "get_title_index", lambda: None)
+    entries = [{"title": "Leo 2023 Tamil 1080p WEB-DL",
+                "magnet": "magnet:?xt=urn:btih:aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"}]
+
+    stats = asyncio.run(scraper.IngestPipeline(scraper.TamilContentScraper(), [ListSource(entries)]).run())
+
+    assert (stats["skipped"], stats["errors"]) == (1, 0)
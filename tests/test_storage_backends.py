@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from api import storage_backends
+from api.record_store import RecordStore, RECORD_STORE_DIRNAME
+from api.storage_backends import SQLITE_CATALOG_FILENAME, build_store_sqlite_catalog
+
+DATA = {
+    "movies": [{"id": "ts-leo", "imdb_id": "tt15654328", "type": "movie", "title": "Leo"}],
+    "series": [{"id": "ts-kayal", "type": "series", "title": "Kayal", "episodes": []}],
+}
+
+
+def test_shipped_sqlite_catalog_is_used_until_the_store_moves_on(tmp_path, monkeypatch):
+    store = RecordStore(str(tmp_path / RECORD_STORE_DIRNAME))
+    store.save(DATA)
+    assert build_store_sqlite_catalog(store, str(tmp_path / SQLITE_CATALOG_FILENAME)) == 2
+    monkeypatch.setattr(storage_backends.settings, "sqlite_catalog_path", "")
+    monkeypatch.setattr(storage_backends, "find_data_file",
+                        lambda name: str(tmp_path / name) if (tmp_path / name).exists() else None)
+
+    assert storage_backends._sqlite_path() == str(tmp_path / SQLITE_CATALOG_FILENAME)
+    assert storage_backends.SQLiteBackend(storage_backends._sqlite_path()).get_content_count() == 2
+
+    store.save(dict(DATA, movies=[]))
+    assert storage_backends._sqlite_path() is None
+
+
+def test_backend_switches_to_postgres_once_it_connects(monkeypatch):
+    class FakePostgres(storage_backends.StorageBackend):
+        name = "postgres"
+
+    available = []
+    monkeypatch.setattr(storage_backends.settings, "storage_backend", "auto")
+    monkeypatch.setattr(storage_backends, "_backend", None)
+    monkeypatch.setattr(storage_backends, "_postgres_pending", False)
+    monkeypatch.setattr(storage_backends, "_postgres_configured", lambda: True)
+    monkeypatch.setattr(storage_backends, "_postgres_available", lambda: bool(available))
+    monkeypatch.setattr(storage_backends, "_sqlite_path", lambda: None)
+    monkeypatch.setattr(storage_backends, "PostgresBackend", FakePostgres)
+
+    assert storage_backends.get_backend().name == "memory"
+    assert storage_backends.get_backend().name == "memory"
+    available.append(True)
+    assert storage_backends.get_backend().name == "postgres"
+    assert not storage_backends._postgres_pending
+
+
+def test_backend_without_database_is_not_retried(monkeypatch):
+    calls = []
+    monkeypatch.setattr(storage_backends.settings, "storage_backend", "auto")
+    monkeypatch.setattr(storage_backends, "_backend", None)
+    monkeypatch.setattr(storage_backends, "_postgres_pending", False)
+    monkeypatch.setattr(storage_backends, "_postgres_configured", lambda: False)
+    monkeypatch.setattr(storage_backends, "_postgres_available", lambda: calls.append(1) or False)
+    monkeypatch.setattr(storage_backends, "_sqlite_path", lambda: None)
+
+    storage_backends.get_backend()
+    storage_backends.get_backend()
+    assert len(calls) == 1
+
+
+def test_sqlite_backend_stats_once_per_interval_and_survives_removal(tmp_path, monkeypatch):
+    store = RecordStore(str(tmp_path / RECORD_STORE_DIRNAME))
+    store.save(DATA)
+    path = str(tmp_path / SQLITE_CATALOG_FILENAME)
+    build_store_sqlite_catalog(store, path)
+    backend = storage_backends.SQLiteBackend(path, check_interval=60)
+
+    stats = []
+    real_stat = storage_backends.os.stat
+    monkeypatch.setattr(storage_backends.os, "stat", lambda p: stats.append(p) or real_stat(p))
+    assert backend.get_content_count() == 2
+    assert backend.get_content_count() == 2
+    assert len(stats) == 1
+
+    storage_backends.os.remove(path)
+    backend._checked_at = float("-inf")
+    assert backend.get_content_count() == 2
+
+    missing = storage_backends.SQLiteBackend(path)
+    with pytest.raises(sqlite3.OperationalError):
+        missing.get_content_count()
@@ -0,0 +1,47 @@
+import asyncio
+
+from api import stremio_routes
+from api.models import UserConfig
+
+INFO_HASH = "d" * 40
+
+
+class FakeTorBox:
+    async def check_cache(self, info_hash):
+        return True
+
+    async def get_torrent_list(self):
+        return [{"hash": INFO_HASH, "id": 7, "files": [
+            {"id": 0, "name": "Kayal.S01E01.mkv", "size": 500},
+            {"id": 1, "name": "Kayal.S01E02.mkv", "size": 500},
+        ]}]
+
+    async def get_download_link(self, torrent_id, file_id):
+        return None
+
+
+def test_learned_files_stay_out_of_the_shared_skeleton(monkeypatch):
+    torrent = {"info_hash": INFO_HASH, "content_id": "tt_learn", "magnet": f"magnet:?xt=urn:btih:{INFO_HASH}"}
+    stream = {"name": "TamilStream", "title": "TamilStream | HD", "infoHash": INFO_HASH,
+              "behaviorHints": {"bingeGroup": "tamilstream-HD", "notWebReady": True}}
+    skeleton = {"streams": [], "torrents": [(torrent, stream)], "episode_info": {"season": 1, "episode": 2},
+                "anonymous": [stream]}
+    stored = []
+
+    async def get_stream_skeleton(raw_id):
+        return skeleton
+
+    monkeypatch.setattr(stremio_routes, "get_stream_skeleton", get_stream_skeleton)
+    monkeypatch.setattr(stremio_routes, "create_torbox_service", lambda key: FakeTorBox())
+    monkeypatch.setattr(stremio_routes, "get_torrent_files", lambda info_hash: None)
+    monkeypatch.setattr(stremio_routes, "set_torrent_files", lambda *args: stored.append(args) or True)
+    monkeypatch.setattr(stremio_routes, "learned_files",
+                        stremio_routes.SwrCache("learned_files_test", ttl=60, max_entries=8))
+    before = stremio_routes.content_generation("tt_learn")
+
+    streams = asyncio.run(stremio_routes.build_streams("tt_learn:1:2", UserConfig(torbox_api_key="key")))
+
+    assert streams[0]["fileIdx"] == 1
+    assert "files" not in torrent and "fileIdx" not in stream
+    assert stremio_routes.content_generation("tt_learn") == before
+    assert len(stored) == 1
@@ -0,0 +1,45 @@
+import itertools
+
+from api.tamildhool_scraper import aggregate_shows, merge_series, series_posts
+
+SITE = "https://www.tamildhool.tech/sun-tv-serial"
+
+
+def post(show, day):
+    return {"title": f"{show.title()} {day}-12-2025", "url": f"{SITE}/{show}/{show}-{day}-12-2025/",
+            "poster": f"{show}-{day}.jpg", "channel": "Sun TV", "type": "series"}
+
+
+def test_merge_series_matches_full_aggregation():
+    stored = aggregate_shows([post("anna", 10), post("anna", 11), post("kayal", 12), post("moondru-mudichu", 9)])
+    crawled = [post("anna", 14), post("ilakkiya", 13), post("anna", 11)]
+    looked_up = []
+
+    def get_stored(content_id):
+        looked_up.append(content_id)
+        return next((s for s in stored if s["id"] == content_id), None)
+
+    merged = list(merge_series(crawled, ((s["id"], s["latest_episode_date"]) for s in stored), get_stored))
+
+    assert merged == aggregate_shows(itertools.chain(crawled, series_posts(stored)))
+    assert [s["id"] for s in merged] == ["td_anna", "td_ilakkiya", "td_kayal", "td_moondru-mudichu"]
+    assert len(merged[0]["episodes"]) == 3
+    # Untouched shows are read back once, when they are written out
+    assert looked_up.count("td_kayal") == 1
+
+
+def test_episode_pages_wait_no_longer_than_the_configured_max(monkeypatch):
+    from api import tamildhool_scraper
+
+    waits = []
+
+    class Guard:
+        def attempt_sync(self, max_wait=None):
+            waits.append(max_wait)
+            raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(tamildhool_scraper, "get_http_cache", lambda: None)
+    monkeypatch.setattr(tamildhool_scraper, "upstream_guard", lambda url: Guard())
+    assert tamildhool_scraper.scrape_episode_details(f"{SITE}/anna/anna-10-12-2025/") is None
+    assert tamildhool_scraper.fetch_page(SITE, max_wait=float("inf")) is None
+    assert waits == [None, float("inf")]